@@ -8,6 +8,7 @@
  * 2) 캘린더 빈시간 [YYYY-MM-DD|오늘|내일]
  * 3) 캘린더 추가 (YYYY-MM-DD|오늘|내일) HH:MM 제목
  * 4) 캘린더 삭제 <EVENT_ID>
+ * 5) 캘린더 날짜삭제 (YYYY-MM-DD|오늘|내일|금요일) [확인]   확인 없이 보내면 지울 일정만 보여 줍니다.
  *
  * FastAPI 서버에 그대로 메시지를 전달하고, 서버가 자연어 파싱 및 Google Calendar API 연동을 처리합니다.
  * 학생은 FASTAPI_WEBHOOK_URL, TARGET_ROOMS만 자신의 환경에 맞게 수정하면 바로 사용 가능합니다.
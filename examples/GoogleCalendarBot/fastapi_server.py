@@ -9,7 +9,7 @@ Google Calendar MCP 연동 FastAPI 서버 (완전 실용 버전)
 - OAuth 2.0 인증 관리
 
 설치 필요 패키지:
-pip install fastapi uvicorn google-auth google-auth-oauthlib google-auth-httplib2 google-api-python-client python-dotenv
+pip install fastapi uvicorn google-auth google-auth-oauthlib google-auth-httplib2 google-api-python-client python-dotenv httpx
 
 사용법:
 1. Google Cloud Console에서 Calendar API 활성화
@@ -19,59 +19,62 @@ pip install fastapi uvicorn google-auth google-auth-oauthlib google-auth-httplib
 """
 
 import os
+import sys
 import json
 import pickle
-from datetime import datetime, timedelta
+import re
+from datetime import date, datetime, time, timedelta
 from typing import Dict, List, Optional, Any
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import APIRouter, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 import logging
 from pathlib import Path
 
-# Google Calendar API
-from google.auth.transport.requests import Request as GoogleRequest
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-
 # 환경 변수 로드
 from dotenv import load_dotenv
 load_dotenv()
 
+# 공용 모듈(fastapi/calendar_core) 경로 등록
+sys.path.append(str(Path(__file__).resolve().parents[2] / "fastapi"))
+from calendar_core.commands import CommandRouter
+from calendar_core.credentials import CredentialManager, write_pickle_atomic
+from calendar_core.dates import get_zone, parse_date, parse_datetime
+from calendar_core.factory import create_calendar_client, uses_google_credentials
+from calendar_core.free_slots import find_free_slots, format_slot
+from calendar_core.health import HealthMonitor, install_health, wait_synced
+from calendar_core.log_pipeline import setup_logging
+from calendar_core.metrics import install_metrics
+from calendar_core.profiling import install_profiling
+from calendar_core.push import PushChannelManager, create_push_router
+from calendar_core.range_reader import iter_events, ndjson_line, stream_lines
+from calendar_core.startup import StartupReport, install_startup_report
+from calendar_core.tracing import install_tracing, span
+from calendar_core.traffic import install_traffic_recorder
+
 # ====== 설정 ======
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 CREDENTIALS_FILE = 'credentials.json'  # Google Cloud Console에서 다운로드한 파일
 TOKEN_FILE = 'token.pickle'  # OAuth 토큰 저장 파일
+SEOUL_TZ = get_zone('Asia/Seoul')
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('calendar_server.log'),
-        logging.StreamHandler()
-    ]
-)
+# 로깅 설정 (큐에 넣기만 하고 JSON 파일 쓰기/회전은 백그라운드 스레드가 담당)
+# 통합 서버(fastapi/main.py)에서 불러오면 이미 설정된 calendar_app.log 를 그대로 씁니다. (파일 이름은 무시됨)
+log_pipeline = setup_logging('calendar_server.log')
 logger = logging.getLogger(__name__)
 
-# FastAPI 앱 생성
-app = FastAPI(
-    title="Google Calendar MCP Server",
-    description="메신저봇과 연동되는 Google Calendar API 서버",
-    version="1.0.0"
-)
-
-# CORS 설정 (메신저봇에서 호출할 수 있도록)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# 라우터가 쓰는 공유 자원 (setup 이 연결: 단독 실행은 create_app, 통합 서버는 fastapi/main.py)
+credentials = None
+calendar_client = None
+health = None
+push_manager = None
+tracer = None
+traffic_log = None
+
+# /api/* 엔드포인트 (/, /webhook 은 create_app 이 붙임)
+router = APIRouter()
 
 # ====== 데이터 모델 ======
 
@@ -80,7 +83,7 @@ class EventRequest(BaseModel):
     title: Optional[str] = None
     datetime: Optional[str] = None
     description: Optional[str] = None
-    period: Optional[str] = "today"  # today, tomorrow, week
+    period: Optional[str] = "today"  # today, tomorrow, week, month, quarter
     event_id: Optional[str] = None
     date: Optional[str] = None
 
@@ -94,8 +97,8 @@ class CalendarEvent(BaseModel):
 
 # ====== Google Calendar 인증 ======
 
-def get_calendar_service():
-    """Google Calendar API 서비스 객체 반환"""
+def load_credentials():
+    """OAuth 인증 정보 로드 (CredentialManager 가 처음 한 번만 호출)"""
     creds = None
     
     # 기존 토큰 파일 확인
@@ -103,142 +106,59 @@ def get_calendar_service():
         with open(TOKEN_FILE, 'rb') as token:
             creds = pickle.load(token)
     
-    # 토큰이 없거나 유효하지 않은 경우 새로 인증
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                creds.refresh(GoogleRequest())
-                logger.info("Google OAuth 토큰 갱신 완료")
-            except Exception as e:
-                logger.error(f"토큰 갱신 실패: {e}")
-                creds = None
-        
-        if not creds:
-            if not os.path.exists(CREDENTIALS_FILE):
-                raise FileNotFoundError(
-                    f"{CREDENTIALS_FILE} 파일이 없습니다. "
-                    "Google Cloud Console에서 OAuth 2.0 클라이언트 ID를 다운로드하세요."
-                )
-            
-            flow = InstalledAppFlow.from_client_secrets_file(
-                CREDENTIALS_FILE, SCOPES)
-            creds = flow.run_local_server(port=0)
-            logger.info("Google OAuth 새 인증 완료")
-        
-        # 토큰 저장
-        with open(TOKEN_FILE, 'wb') as token:
-            pickle.dump(creds, token)
+    # 갱신할 수 없는 토큰이면 새로 인증 (만료된 토큰 갱신은 CredentialManager 가 백그라운드에서)
+    if not creds or not (creds.valid or creds.refresh_token):
+        if not os.path.exists(CREDENTIALS_FILE):
+            raise FileNotFoundError(
+                f"{CREDENTIALS_FILE} 파일이 없습니다. "
+                "Google Cloud Console에서 OAuth 2.0 클라이언트 ID를 다운로드하세요."
+            )
+        
+        from google_auth_oauthlib.flow import InstalledAppFlow
+        
+        flow = InstalledAppFlow.from_client_secrets_file(
+            CREDENTIALS_FILE, SCOPES)
+        creds = flow.run_local_server(port=0)
+        logger.info("Google OAuth 새 인증 완료")
+        save_token(creds)
     
-    service = build('calendar', 'v3', credentials=creds)
-    return service
+    return creds
+
+def save_token(creds):
+    """토큰 저장 (임시 파일에 쓰고 바꿔서, 쓰는 도중 종료돼도 token.pickle 이 깨지지 않음)"""
+    write_pickle_atomic(TOKEN_FILE, creds)
+
+def setup(client, credential_manager, health_monitor, push, trace=None, traffic=None) -> APIRouter:
+    """라우터가 쓸 캘린더 클라이언트와 공유 자원을 연결하고 router 를 돌려줍니다."""
+    global calendar_client, credentials, health, push_manager, tracer, traffic_log
+    calendar_client = client
+    credentials = credential_manager
+    health = health_monitor
+    push_manager = push
+    tracer = trace
+    traffic_log = traffic
+    return router
+
+def oauth_token_missing() -> bool:
+    # 토큰이 없으면 브라우저 인증이 필요하므로 백그라운드에서는 Google 을 부르지 않습니다.
+    return uses_google_credentials() and not os.path.exists(TOKEN_FILE)
+
+async def warmup():
+    """토큰 → 클라이언트 → 첫 동기화 (startup 훅을 막지 않고 백그라운드에서)"""
+    if oauth_token_missing():
+        raise RuntimeError("OAuth 토큰이 없습니다. 첫 API 호출 시 인증이 필요합니다.")
+    if uses_google_credentials():
+        await credentials.start()
+    await calendar_client.start()
+    await wait_synced(calendar_client)
+
+async def probe_calendar():
+    if oauth_token_missing():
+        raise RuntimeError("OAuth 토큰이 없습니다.")
+    return await calendar_client.get_calendar('primary')
 
 # ====== 유틸리티 함수 ======
 
-def parse_korean_date(date_str: str) -> datetime:
-    """한글 날짜를 datetime 객체로 변환"""
-    today = datetime.now()
-    
-    if date_str in ["오늘", "today"]:
-        return today
-    elif date_str in ["내일", "tomorrow"]:
-        return today + timedelta(days=1)
-    elif date_str in ["모레"]:
-        return today + timedelta(days=2)
-    else:
-        try:
-            # YYYY-MM-DD 형식 파싱
-            return datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
-            # 다른 형식 시도
-            try:
-                return datetime.strptime(date_str, "%m/%d")
-            except ValueError:
-                return today
-
-def parse_relative_date(date_str: str) -> datetime:
-    """상대적 날짜 문자열을 datetime 객체로 변환 (코덱스 피드백 반영)"""
-    today = datetime.now()
-    
-    # 자연어 날짜 처리 강화
-    if date_str in ["오늘", "today"]:
-        return today
-    elif date_str in ["내일", "tomorrow"]:
-        return today + timedelta(days=1)
-    elif date_str in ["모레", "day_after_tomorrow"]:
-        return today + timedelta(days=2)
-    elif date_str in ["이번주", "this_week"]:
-        return today  # 주간 조회의 시작점
-    elif date_str in ["다음주", "next_week"]:
-        return today + timedelta(weeks=1)
-    else:
-        try:
-            # YYYY-MM-DD 형식 파싱
-            return datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
-            # MM-DD 형식 시도
-            try:
-                this_year = today.year
-                parsed = datetime.strptime(f"{this_year}-{date_str}", "%Y-%m-%d")
-                return parsed
-            except ValueError:
-                # M/D 형식 시도
-                try:
-                    return datetime.strptime(f"{today.year}/{date_str}", "%Y/%m/%d")
-                except ValueError:
-                    logger.warning(f"날짜 파싱 실패, 기본값 사용: {date_str}")
-                    return today
-
-def parse_datetime_string(datetime_str: str) -> datetime:
-    """날짜/시간 문자열을 datetime 객체로 변환 (자연어 처리 강화)"""
-    today = datetime.now()
-    
-    # "내일 3시" / "내일 오후 3시" 형식 처리
-    if "내일" in datetime_str:
-        tomorrow = today + timedelta(days=1)
-        if "시" in datetime_str:
-            # 시간 추출 (숫자만)
-            hour_match = re.search(r'(\d{1,2})', datetime_str)
-            if hour_match:
-                hour = int(hour_match.group(1))
-                # 오후 처리
-                if "오후" in datetime_str and hour != 12:
-                    hour += 12
-                elif "오전" in datetime_str and hour == 12:
-                    hour = 0
-                return tomorrow.replace(hour=hour, minute=0, second=0, microsecond=0)
-        return tomorrow
-    
-    # "오늘 3시" / "오늘 오후 3시" 형식 처리
-    elif "오늘" in datetime_str:
-        if "시" in datetime_str:
-            hour_match = re.search(r'(\d{1,2})', datetime_str)
-            if hour_match:
-                hour = int(hour_match.group(1))
-                # 오후 처리
-                if "오후" in datetime_str and hour != 12:
-                    hour += 12
-                elif "오전" in datetime_str and hour == 12:
-                    hour = 0
-                return today.replace(hour=hour, minute=0, second=0, microsecond=0)
-        return today
-    
-    # "YYYY-MM-DD HH:MM" 형식 처리
-    try:
-        return datetime.strptime(datetime_str, "%Y-%m-%d %H:%M")
-    except ValueError:
-        pass
-    
-    # "HH:MM" 형식 처리 (오늘 날짜에)
-    try:
-        time_only = datetime.strptime(datetime_str, "%H:%M").time()
-        return datetime.combine(today.date(), time_only)
-    except ValueError:
-        pass
-    
-    # 기본값: 1시간 후
-    logger.warning(f"시간 파싱 실패, 기본값 사용: {datetime_str}")
-    return today + timedelta(hours=1)
-
 def format_event_time(dt_str: str) -> str:
     """ISO 형식 시간을 한글 형식으로 변환"""
     try:
@@ -247,133 +167,92 @@ def format_event_time(dt_str: str) -> str:
     except:
         return dt_str
 
-def list_free_slots(target_date: datetime, working_hours_start: int = 9, working_hours_end: int = 19) -> List[str]:
+async def list_free_slots(target_date: date, working_hours_start: int = 9, working_hours_end: int = 19) -> List[str]:
     """특정 날짜의 빈 시간대 계산 (코덱스 피드백 반영 - FreeBusy API 활용)"""
     try:
-        service = get_calendar_service()
-        
-        # 해당 날짜의 시작과 끝 시간 설정
-        day_start = target_date.replace(hour=working_hours_start, minute=0, second=0, microsecond=0)
-        day_end = target_date.replace(hour=working_hours_end, minute=0, second=0, microsecond=0)
-        
-        # Google Calendar FreeBusy API 호출
-        freebusy_request = {
-            "timeMin": day_start.isoformat() + 'Z',
-            "timeMax": day_end.isoformat() + 'Z',
-            "items": [{"id": "primary"}],
-            "timeZone": "Asia/Seoul"
-        }
-        
-        freebusy_result = service.freebusy().query(body=freebusy_request).execute()
-        busy_times = freebusy_result.get('calendars', {}).get('primary', {}).get('busy', [])
-        
-        # 바쁜 시간대를 datetime 객체로 변환
-        busy_intervals = []
-        for busy in busy_times:
-            start = datetime.fromisoformat(busy['start'].replace('Z', '+00:00'))
-            end = datetime.fromisoformat(busy['end'].replace('Z', '+00:00'))
-            busy_intervals.append((start, end))
-        
-        # 바쁜 시간대 정렬
-        busy_intervals.sort(key=lambda x: x[0])
-        
-        # 빈 시간대 계산
-        free_slots = []
-        current_time = day_start
-        
-        for busy_start, busy_end in busy_intervals:
-            # 현재 시간과 다음 바쁜 시간 사이에 여유가 있으면 추가
-            if current_time < busy_start:
-                free_slots.append(f"{current_time.strftime('%H:%M')} - {busy_start.strftime('%H:%M')}")
-            current_time = max(current_time, busy_end)
-        
-        # 마지막 바쁜 시간 이후에 여유가 있으면 추가
-        if current_time < day_end:
-            free_slots.append(f"{current_time.strftime('%H:%M')} - {day_end.strftime('%H:%M')}")
+        # FreeBusy 조회 + 빈 시간 계산 (시간대는 Asia/Seoul 기준으로 맞춰 줍니다)
+        free_days = await find_free_slots(
+            calendar_client,
+            ["primary"],
+            target_date,
+            time_zone="Asia/Seoul",
+            work_start=time(working_hours_start),
+            work_end=time(working_hours_end),
+        )
+        free_slots = [format_slot(start, end, SEOUL_TZ, sep=" - ") for start, end in free_days[0][1]]
         
         # 빈 시간이 없으면 안내 메시지
         if not free_slots:
             return [f"{working_hours_start}:00 - {working_hours_end}:00 시간대가 모두 사용 중입니다."]
         
-        logger.info(f"빈 시간 조회 완료: {target_date.strftime('%Y-%m-%d')} ({len(free_slots)}개 구간)")
+        logger.info("빈 시간 조회 완료: %s (%s개 구간)", target_date, len(free_slots))
         return free_slots
         
     except Exception as e:
-        logger.error(f"빈 시간 조회 실패: {e}")
+        logger.error("빈 시간 조회 실패: %s", e)
         return [f"빈 시간 조회 중 오류 발생: {str(e)}"]
 
 # ====== Calendar API 함수들 ======
 
-def get_events_from_calendar(period: str = "today") -> List[CalendarEvent]:
+def get_period_range(period: str) -> tuple:
+    """조회 기간 (시작, 끝) - today, tomorrow, week, month, quarter"""
+    start_time = datetime.now(SEOUL_TZ).replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == "tomorrow":
+        start_time += timedelta(days=1)
+        end_time = start_time + timedelta(days=1)
+    elif period == "week":
+        end_time = start_time + timedelta(days=7)
+    elif period == "month":
+        end_time = start_time + timedelta(days=31)
+    elif period == "quarter":
+        end_time = start_time + timedelta(days=92)
+    else:
+        end_time = start_time + timedelta(days=1)
+    return start_time, end_time
+
+def to_calendar_event(event: Dict[str, Any]) -> CalendarEvent:
+    """Google 일정 dict → CalendarEvent"""
+    start = event['start'].get('dateTime', event['start'].get('date'))
+    end = event['end'].get('dateTime', event['end'].get('date'))
+    return CalendarEvent(
+        id=event['id'],
+        title=event.get('summary', '제목 없음'),
+        start_time=format_event_time(start),
+        end_time=format_event_time(end) if end else None,
+        description=event.get('description', ''),
+        location=event.get('location', '')
+    )
+
+def iter_period_events(period: str = "today"):
+    """기간 일정을 페이지를 따라가며 하나씩 읽습니다 (nextPageToken 처리)"""
+    start_time, end_time = get_period_range(period)
+    return iter_events(calendar_client, 'primary', start_time.isoformat(), end_time.isoformat())
+
+async def get_events_from_calendar(period: str = "today") -> List[CalendarEvent]:
     """Google Calendar에서 일정 조회"""
     try:
-        service = get_calendar_service()
-        
-        # 시간 범위 설정
-        now = datetime.now()
-        if period == "today":
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = start_time + timedelta(days=1)
-        elif period == "tomorrow":
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-            end_time = start_time + timedelta(days=1)
-        elif period == "week":
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = start_time + timedelta(days=7)
-        else:
-            start_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
-            end_time = start_time + timedelta(days=1)
-        
-        # Google Calendar API 호출
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=start_time.isoformat() + 'Z',
-            timeMax=end_time.isoformat() + 'Z',
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
-        events = events_result.get('items', [])
-        
-        # CalendarEvent 객체로 변환
-        calendar_events = []
-        for event in events:
-            start = event['start'].get('dateTime', event['start'].get('date'))
-            end = event['end'].get('dateTime', event['end'].get('date'))
-            
-            calendar_event = CalendarEvent(
-                id=event['id'],
-                title=event.get('summary', '제목 없음'),
-                start_time=format_event_time(start),
-                end_time=format_event_time(end) if end else None,
-                description=event.get('description', ''),
-                location=event.get('location', '')
-            )
-            calendar_events.append(calendar_event)
+        calendar_events = [to_calendar_event(event) async for event in iter_period_events(period)]
         
-        logger.info(f"일정 조회 완료: {len(calendar_events)}개")
+        logger.info("일정 조회 완료: %s개", len(calendar_events))
         return calendar_events
         
     except Exception as e:
-        logger.error(f"일정 조회 실패: {e}")
+        logger.error("일정 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=f"일정 조회 실패: {str(e)}")
 
-def add_event_to_calendar(title: str, datetime_str: str, description: str = "") -> Dict[str, Any]:
+async def add_event_to_calendar(title: str, datetime_str: str, description: str = "") -> Dict[str, Any]:
     """Google Calendar에 새 일정 추가"""
     try:
-        service = get_calendar_service()
-        
         # 날짜/시간 파싱
-        start_datetime = parse_datetime_string(datetime_str)
+        start_datetime = parse_datetime(datetime_str, tz_name='Asia/Seoul')
         end_datetime = start_datetime + timedelta(hours=1)  # 기본 1시간 이벤트
         
         # 충돌 검사
-        existing_events = service.events().list(
-            calendarId='primary',
-            timeMin=start_datetime.isoformat() + 'Z',
-            timeMax=end_datetime.isoformat() + 'Z',
-            singleEvents=True
-        ).execute().get('items', [])
+        existing_events = (await calendar_client.list_events(
+            'primary',
+            time_min=start_datetime.isoformat(),
+            time_max=end_datetime.isoformat()
+        )).get('items', [])
         
         warning_message = None
         if existing_events:
@@ -395,9 +274,9 @@ def add_event_to_calendar(title: str, datetime_str: str, description: str = "")
         }
         
         # Calendar에 이벤트 추가
-        created_event = service.events().insert(calendarId='primary', body=event).execute()
+        created_event = await calendar_client.insert_event('primary', event)
         
-        logger.info(f"일정 추가 완료: {title}")
+        logger.info("일정 추가 완료: %s", title)
         
         result = {
             "success": True,
@@ -411,18 +290,18 @@ def add_event_to_calendar(title: str, datetime_str: str, description: str = "")
         return result
         
     except Exception as e:
-        logger.error(f"일정 추가 실패: {e}")
+        logger.error("일정 추가 실패: %s", e)
         return {
             "success": False,
             "error": str(e),
             "message": "일정 추가에 실패했습니다."
         }
 
-def delete_event_from_calendar(event_number: str) -> Dict[str, Any]:
+async def delete_event_from_calendar(event_number: str) -> Dict[str, Any]:
     """일정 삭제 (번호로)"""
     try:
         # 먼저 오늘 일정 조회해서 번호에 해당하는 이벤트 찾기
-        events = get_events_from_calendar("today")
+        events = await get_events_from_calendar("today")
         
         try:
             index = int(event_number) - 1  # 1부터 시작하는 번호를 0부터 시작하는 인덱스로 변환
@@ -433,12 +312,11 @@ def delete_event_from_calendar(event_number: str) -> Dict[str, Any]:
                 }
             
             event_to_delete = events[index]
-            service = get_calendar_service()
             
             # Google Calendar에서 삭제
-            service.events().delete(calendarId='primary', eventId=event_to_delete.id).execute()
+            await calendar_client.delete_event('primary', event_to_delete.id)
             
-            logger.info(f"일정 삭제 완료: {event_to_delete.title}")
+            logger.info("일정 삭제 완료: %s", event_to_delete.title)
             
             return {
                 "success": True,
@@ -452,20 +330,20 @@ def delete_event_from_calendar(event_number: str) -> Dict[str, Any]:
             }
             
     except Exception as e:
-        logger.error(f"일정 삭제 실패: {e}")
+        logger.error("일정 삭제 실패: %s", e)
         return {
             "success": False,
             "error": str(e),
             "message": "일정 삭제에 실패했습니다."
         }
 
-def check_free_time(date_str: str) -> Dict[str, Any]:
+async def check_free_time(date_str: str) -> Dict[str, Any]:
     """특정 날짜의 빈 시간 조회 (코덱스 피드백 반영 - FreeBusy API 활용)"""
     try:
-        target_date = parse_relative_date(date_str)
+        target_date = parse_date(date_str, tz_name='Asia/Seoul')
         
         # 빈 시간대 계산
-        free_slots = list_free_slots(target_date)
+        free_slots = await list_free_slots(target_date)
         
         # 날짜 포맷팅
         date_formatted = target_date.strftime("%Y-%m-%d (%A)")
@@ -484,11 +362,11 @@ def check_free_time(date_str: str) -> Dict[str, Any]:
                       "\n".join([f"⭕ {slot}" for slot in free_slots])
         }
         
-        logger.info(f"빈 시간 조회 성공: {date_str} → {len(free_slots)}개 구간")
+        logger.info("빈 시간 조회 성공: %s → %s개 구간", date_str, len(free_slots))
         return response
         
     except Exception as e:
-        logger.error(f"빈 시간 조회 실패: {e}")
+        logger.error("빈 시간 조회 실패: %s", e)
         return {
             "success": False,
             "error": str(e),
@@ -497,7 +375,6 @@ def check_free_time(date_str: str) -> Dict[str, Any]:
 
 # ====== FastAPI 엔드포인트들 ======
 
-@app.get("/")
 async def root():
     """서버 상태 확인"""
     return {
@@ -506,41 +383,46 @@ async def root():
         "version": "1.0.0"
     }
 
-@app.get("/api/health")
+@router.get("/api/health")
 async def health_check():
-    """헬스체크 엔드포인트"""
-    try:
-        # Google Calendar API 연결 테스트
-        service = get_calendar_service()
-        calendar = service.calendars().get(calendarId='primary').execute()
-        
-        return {
-            "success": True,
-            "status": "ok",
-            "timestamp": datetime.now().isoformat(),
-            "calendar_connected": True,
-            "calendar_name": calendar.get('summary', 'Primary Calendar')
-        }
-    except Exception as e:
-        logger.error(f"헬스체크 실패: {e}")
+    """헬스체크 엔드포인트 (Google 을 부르지 않고 백그라운드 확인 결과를 돌려줌)"""
+    check = health.last_check or {}
+    if not health.ready:
         return JSONResponse(
             status_code=503,
             content={
                 "success": False,
                 "status": "error",
-                "error": str(e),
-                "calendar_connected": False
+                "error": health.warmup_error or check.get("error") or "준비 중입니다.",
+                "calendar_connected": False,
+                "health": health.stats()
             }
         )
+    return {
+        "success": True,
+        "status": "ok",
+        "timestamp": datetime.now().isoformat(),
+        "calendar_connected": True,
+        "calendar_name": check.get("calendar_name") or 'Primary Calendar',
+        "calendar_checked_at": check.get("checked_at"),
+        "client": calendar_client.stats(),
+        "credentials": credentials.stats(),
+        "health": health.stats(),
+        "push": push_manager.stats(),
+        "commands": commands.stats(),
+        "traffic": traffic_log.stats() if traffic_log else {"enabled": False},
+        "tracing": tracer.stats() if tracer else {"enabled": False},
+        "logging": log_pipeline.stats()
+    }
 
-@app.post("/api/calendar/events")
+@router.post("/api/calendar/events")
 async def handle_calendar_events(request: EventRequest):
     """캘린더 이벤트 처리 (조회, 추가, 삭제)"""
     try:
         action = request.action.lower()
         
         if action == "get_events":
-            events = get_events_from_calendar(request.period or "today")
+            events = await get_events_from_calendar(request.period or "today")
             return {
                 "success": True,
                 "events": [event.dict() for event in events],
@@ -551,7 +433,7 @@ async def handle_calendar_events(request: EventRequest):
             if not request.title or not request.datetime:
                 raise HTTPException(status_code=400, detail="제목과 시간이 필요합니다.")
             
-            result = add_event_to_calendar(
+            result = await add_event_to_calendar(
                 request.title, 
                 request.datetime, 
                 request.description or ""
@@ -562,14 +444,14 @@ async def handle_calendar_events(request: EventRequest):
             if not request.event_id:
                 raise HTTPException(status_code=400, detail="삭제할 일정 번호가 필요합니다.")
             
-            result = delete_event_from_calendar(request.event_id)
+            result = await delete_event_from_calendar(request.event_id)
             return result
         
         else:
             raise HTTPException(status_code=400, detail="지원하지 않는 액션입니다.")
             
     except Exception as e:
-        logger.error(f"이벤트 처리 실패: {e}")
+        logger.error("이벤트 처리 실패: %s", e)
         return JSONResponse(
             status_code=500,
             content={
@@ -579,18 +461,27 @@ async def handle_calendar_events(request: EventRequest):
             }
         )
 
-@app.post("/api/calendar/free-busy")
+@router.get("/api/calendar/events/stream")
+async def stream_calendar_events(period: str = "week"):
+    """기간 일정 스트리밍 (JSON Lines, 한 달/분기처럼 큰 기간용)"""
+    events = iter_period_events(period)
+    return StreamingResponse(
+        stream_lines(events, lambda event: ndjson_line(to_calendar_event(event).dict())),
+        media_type="application/x-ndjson"
+    )
+
+@router.post("/api/calendar/free-busy")
 async def handle_free_busy(request: EventRequest):
     """빈 시간 조회"""
     try:
         if not request.date:
             request.date = "오늘"
         
-        result = check_free_time(request.date)
+        result = await check_free_time(request.date)
         return result
         
     except Exception as e:
-        logger.error(f"빈시간 조회 실패: {e}")
+        logger.error("빈시간 조회 실패: %s", e)
         return JSONResponse(
             status_code=500,
             content={
@@ -600,7 +491,44 @@ async def handle_free_busy(request: EventRequest):
             }
         )
 
-@app.post("/webhook")
+# ====== 메신저봇 명령어 ======
+
+commands = CommandRouter("oauth")
+DATE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})')
+
+@commands.command("일정 보여줘", keywords=("일정", "보여줘"))
+async def show_today_command(msg: str, match) -> str:
+    events = await get_events_from_calendar("today")
+    with span("format_events", count=len(events)):
+        if events:
+            response = "📅 오늘 일정:\n\n"
+            for i, event in enumerate(events, 1):
+                response += f"{i}. {event.title} ({event.start_time})\n"
+            return response
+        else:
+            return "📅 오늘 일정이 없습니다."
+
+# 빈시간 조회 명령어 처리
+@commands.command("빈시간", keywords=("빈시간",))
+async def free_time_command(msg: str, match) -> str:
+    date_str = "오늘"  # 기본값
+    if "내일" in msg:
+        date_str = "내일"
+    elif "모레" in msg:
+        date_str = "모레"
+    # YYYY-MM-DD 형식 날짜 추출
+    date_match = DATE_PATTERN.search(msg)
+    if date_match:
+        date_str = date_match.group(1)
+    
+    result = await check_free_time(date_str)
+    return result.get("message", "빈시간 조회에 실패했습니다.")
+
+# 일정 추가 명령어 처리 (간단한 형태)
+@commands.command("일정 추가", keywords=("일정 추가",))
+async def add_event_command(msg: str, match) -> str:
+    return "일정 추가 기능은 아직 웹훅에서 지원하지 않습니다. /api/calendar/events 엔드포인트를 사용해주세요."
+
 async def webhook_handler(request: Request):
     """메신저봇 웹훅 엔드포인트 (레거시 지원)"""
     try:
@@ -609,73 +537,117 @@ async def webhook_handler(request: Request):
         sender = data.get("sender", "")
         room = data.get("room", "")
         
-        logger.info(f"웹훅 수신 - 방: {room}, 발신자: {sender}, 메시지: {msg}")
+        logger.info("웹훅 수신 - 방: %s, 발신자: %s, 메시지: %s", room, sender, msg,
+                    extra={"sampled": True, "room": room, "sender": sender})
         
         # 자연어 명령어 처리 (코덱스 피드백 반영)
-        if "일정" in msg and "보여줘" in msg:
-            events = get_events_from_calendar("today")
-            if events:
-                response = "📅 오늘 일정:\n\n"
-                for i, event in enumerate(events, 1):
-                    response += f"{i}. {event.title} ({event.start_time})\n"
-                return response
-            else:
-                return "📅 오늘 일정이 없습니다."
-        
-        # 빈시간 조회 명령어 처리
-        elif "빈시간" in msg:
-            date_str = "오늘"  # 기본값
-            if "내일" in msg:
-                date_str = "내일"
-            elif "모레" in msg:
-                date_str = "모레"
-            # YYYY-MM-DD 형식 날짜 추출
-            import re
-            date_match = re.search(r'(\d{4}-\d{2}-\d{2})', msg)
-            if date_match:
-                date_str = date_match.group(1)
-            
-            result = check_free_time(date_str)
-            return result.get("message", "빈시간 조회에 실패했습니다.")
-        
-        # 일정 추가 명령어 처리 (간단한 형태)
-        elif "일정 추가" in msg:
-            return "일정 추가 기능은 아직 웹훅에서 지원하지 않습니다. /api/calendar/events 엔드포인트를 사용해주세요."
+        response = await commands.dispatch(msg)
+        if response is not None:
+            return response
         
         return "📅 사용 가능한 명령어:\n• '일정 보여줘' - 오늘 일정 조회\n• '빈시간 오늘/내일' - 빈 시간 확인"
         
     except Exception as e:
-        logger.error(f"웹훅 처리 실패: {e}")
+        logger.error("웹훅 처리 실패: %s", e)
         return "서버 오류가 발생했습니다."
 
-# ====== 서버 시작 ======
-
-@app.on_event("startup")
-async def startup_event():
-    """서버 시작 시 초기화"""
-    logger.info("Google Calendar MCP 서버 시작됨")
-    
-    # 토큰 파일 확인
-    if not os.path.exists(TOKEN_FILE):
-        logger.warning("OAuth 토큰이 없습니다. 첫 API 호출 시 인증이 필요합니다.")
-    
-    # credentials.json 파일 확인
-    if not os.path.exists(CREDENTIALS_FILE):
-        logger.error(f"{CREDENTIALS_FILE} 파일이 없습니다!")
-        logger.error("Google Cloud Console에서 OAuth 2.0 클라이언트 ID를 다운로드하여 "
-                    f"이 파일명으로 저장해주세요.")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """서버 종료 시 정리"""
-    logger.info("Google Calendar MCP 서버 종료됨")
+# ====== 서버 구성 ======
+
+def create_app() -> FastAPI:
+    """단독 실행용 앱: 공유 자원을 만들어 router 에 연결합니다."""
+    # 여기까지가 import 단계 (Google OAuth 라이브러리는 처음 인증할 때 import)
+    startup_report = StartupReport()
+    # 토큰은 한 번만 읽고, 만료 전에 백그라운드에서 갱신해 token.pickle 에 저장
+    credential_manager = CredentialManager(load_credentials, persist=save_token)
+    # 프로세스 전체에서 공유하는 캘린더 클라이언트 (요청마다 token.pickle 을 읽지 않음)
+    client = create_calendar_client(credential_manager, sync_calendars=['primary'])
+    # 봇 밖에서 바뀐 일정을 알려 주는 Google 푸시 알림 (CALENDAR_PUSH_ADDRESS 설정 시)
+    push = PushChannelManager(client, ['primary'])
+    # 캘린더 연결은 백그라운드에서 주기적으로 확인하고, 헬스체크는 마지막 결과만 읽음
+    monitor = HealthMonitor(warmup, probe_calendar, report=startup_report)
+
+    # FastAPI 앱 생성
+    app = FastAPI(
+        title="Google Calendar MCP Server",
+        description="메신저봇과 연동되는 Google Calendar API 서버",
+        version="1.0.0"
+    )
+    # CORS 설정 (메신저봇에서 호출할 수 있도록)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    # CALENDAR_TRAFFIC_LOG 가 있으면 웹훅 요청을 기록 (재생: python -m calendar_core.traffic)
+    traffic = install_traffic_recorder(app)
+    app.include_router(create_push_router(push))
+    # GET /metrics (Prometheus)
+    install_metrics(app, client)
+    # CALENDAR_TRACE_FILE 가 있으면 샘플된 요청의 구간별 시간을 기록
+    trace = install_tracing(app)
+    # CALENDAR_ADMIN_TOKEN 이 있으면 X-Profile 헤더로 요청 하나를 프로파일링 (/admin/profiles)
+    install_profiling(app)
+    # GET /startup - 프로세스 시작부터 준비 완료까지 단계별 시간
+    install_startup_report(app, startup_report)
+    # GET /api/health/live, /api/health/ready
+    install_health(app, monitor, prefix="/api/health")
+    app.get("/")(root)
+    app.post("/webhook")(webhook_handler)
+    app.include_router(setup(client, credential_manager, monitor, push, trace, traffic))
+
+    @app.on_event("startup")
+    async def startup_event():
+        """서버 시작 시 초기화"""
+        logger.info("Google Calendar MCP 서버 시작됨")
+        
+        # 토큰 파일 확인
+        if not os.path.exists(TOKEN_FILE):
+            logger.warning("OAuth 토큰이 없습니다. 첫 API 호출 시 인증이 필요합니다.")
+        
+        # credentials.json 파일 확인
+        if not os.path.exists(CREDENTIALS_FILE):
+            logger.error("%s 파일이 없습니다!", CREDENTIALS_FILE)
+            logger.error("Google Cloud Console에서 OAuth 2.0 클라이언트 ID를 다운로드하여 "
+                        f"이 파일명으로 저장해주세요.")
+        
+        # 클라이언트 준비 + 첫 동기화 + 연결 확인은 백그라운드에서 (끝나면 /api/health/ready 가 200)
+        # 토큰은 한 번만 로드/갱신하고, 브라우저 인증은 첫 요청에서
+        health.start()
+        
+        # 푸시 알림 채널 등록/갱신 시작
+        push_manager.start()
+        startup_report.mark("serving")
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """서버 종료 시 정리"""
+        await health.stop()
+        await push_manager.stop()
+        await credentials.stop()
+        await calendar_client.close()
+        logger.info("Google Calendar MCP 서버 종료됨")
+
+    # 앱/라우터 구성 끝 (여기부터 startup 훅)
+    startup_report.mark("module")
+    return app
+
+def __getattr__(name: str):
+    # uvicorn fastapi_server:app 이 app 을 찾을 때 처음 한 번만 만듭니다.
+    # (fastapi/main.py 는 router 와 setup 만 쓰므로 단독 실행용 자원을 만들지 않음)
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     # 포트는 환경변수 또는 기본값 9000 사용
     port = int(os.getenv("PORT", 9000))
     
-    logger.info(f"서버 시작: 포트 {port}")
-    logger.info("API 문서: http://localhost:{port}/docs")
+    logger.info("서버 시작: 포트 %s", port)
+    logger.info("API 문서: http://localhost:%s/docs", port)
     
     uvicorn.run(
         "fastapi_server:app",  # 이 파일명이 fastapi_server.py라고 가정
@@ -689,7 +661,7 @@ if __name__ == "__main__":
 ====== 설치 및 실행 가이드 ======
 
 1. 필요 패키지 설치:
-   pip install fastapi uvicorn google-auth google-auth-oauthlib google-auth-httplib2 google-api-python-client python-dotenv
+   pip install fastapi uvicorn google-auth google-auth-oauthlib google-auth-httplib2 google-api-python-client python-dotenv httpx
 
 2. Google Cloud Console 설정:
    - Calendar API 활성화
@@ -721,8 +693,10 @@ if __name__ == "__main__":
 
 ====== 주요 API 엔드포인트 ======
 
-- GET /api/health : 서버 상태 확인
+- GET /api/health : 서버 상태 확인 (백그라운드 연결 확인 결과, Google 호출 없음)
+- GET /api/health/live, /api/health/ready : 로드밸런서용 생존/준비 확인
 - POST /api/calendar/events : 일정 CRUD
+- GET /api/calendar/events/stream?period=week|month|quarter : 기간 일정 스트리밍 (JSON Lines)
 - POST /api/calendar/free-busy : 빈시간 조회
 - POST /webhook : 메신저봇 웹훅 (레거시)
 
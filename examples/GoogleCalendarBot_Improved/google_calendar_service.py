@@ -9,7 +9,7 @@ Google Calendar 서비스 계정 기반 FastAPI 서버 (개선된 버전)
 - uvicorn 한 줄로 서버 시작
 
 설치:
-pip install fastapi uvicorn google-api-python-client google-auth python-dotenv
+pip install fastapi uvicorn google-api-python-client google-auth python-dotenv httpx
 
 사용법:
 1. .env 파일에 서비스 계정 정보 설정
@@ -17,26 +17,38 @@ pip install fastapi uvicorn google-api-python-client google-auth python-dotenv
 """
 
 import os
+import sys
 import json
-import re
-from datetime import datetime, timedelta
+from pathlib import Path
+from datetime import datetime, time, timedelta
 from typing import Dict, Any, Optional, List
 import uvicorn
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import APIRouter, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import logging
 
-# Google Calendar API (서비스 계정 방식)
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
-
 # 환경 변수
 from dotenv import load_dotenv
 load_dotenv()
 
+# 공용 모듈(fastapi/calendar_core) 경로 등록
+sys.path.append(str(Path(__file__).resolve().parents[2] / "fastapi"))
+from calendar_core.async_client import CalendarAPIError
+from calendar_core.commands import CommandRouter, CommandUsageError
+from calendar_core.credentials import CredentialManager
+from calendar_core.dates import get_zone, parse_date, parse_datetime
+from calendar_core.factory import create_calendar_client, uses_google_credentials
+from calendar_core.health import HealthMonitor, install_health, wait_synced
+from calendar_core.log_pipeline import setup_logging
+from calendar_core.metrics import install_metrics
+from calendar_core.profiling import install_profiling
+from calendar_core.push import PushChannelManager, create_push_router
+from calendar_core.startup import StartupReport, install_startup_report
+from calendar_core.tracing import install_tracing, span
+from calendar_core.traffic import install_traffic_recorder
+
 # ====== 설정 ======
 
 # 환경 변수에서 설정 로드
@@ -47,31 +59,21 @@ CALENDAR_TIMEZONE = os.getenv("CALENDAR_TIMEZONE", "Asia/Seoul")
 # Google Calendar API 스코프
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('calendar_service.log'),
-        logging.StreamHandler()
-    ]
-)
+# 로깅 설정 (큐에 넣기만 하고 JSON 파일 쓰기/회전은 백그라운드 스레드가 담당)
+# 통합 서버(fastapi/main.py)에서 불러오면 이미 설정된 calendar_app.log 를 그대로 씁니다. (파일 이름은 무시됨)
+log_pipeline = setup_logging('calendar_service.log')
 logger = logging.getLogger(__name__)
 
-# FastAPI 앱
-app = FastAPI(
-    title="Google Calendar Service (코덱스 방식)",
-    description="서비스 계정 기반 Google Calendar API 서버",
-    version="2.0.0"
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# 라우터가 쓰는 공유 자원 (setup 이 연결: 단독 실행은 create_app, 통합 서버는 fastapi/main.py)
+credentials = None
+calendar_client = None
+health = None
+push_manager = None
+tracer = None
+traffic_log = None
+
+# /health 같은 이 서버만의 엔드포인트 (/, /webhook 은 create_app 이 붙임)
+router = APIRouter()
 
 # ====== 데이터 모델 ======
 
@@ -83,12 +85,15 @@ class WebhookRequest(BaseModel):
 
 # ====== Google Calendar 서비스 초기화 ======
 
-def get_calendar_service():
-    """서비스 계정을 사용하여 Google Calendar 서비스 객체 반환"""
+def load_credentials():
+    """서비스 계정 인증 정보 로드 (클라이언트 풀이 처음 한 번만 호출)"""
     try:
         if not GOOGLE_SERVICE_ACCOUNT_JSON:
             raise ValueError("GOOGLE_SERVICE_ACCOUNT_JSON 환경변수가 설정되지 않았습니다.")
         
+        # Google Calendar API (서비스 계정 방식)
+        from google.oauth2 import service_account
+        
         # 서비스 계정 JSON 파싱
         if os.path.isfile(GOOGLE_SERVICE_ACCOUNT_JSON):
             # 파일 경로인 경우
@@ -102,79 +107,59 @@ def get_calendar_service():
                 service_account_info, scopes=SCOPES
             )
         
-        service = build('calendar', 'v3', credentials=credentials)
-        logger.info("Google Calendar 서비스 연결 성공")
-        return service
+        logger.info("Google Calendar 서비스 계정 인증 정보 로드 성공")
+        return credentials
         
     except Exception as e:
-        logger.error(f"Google Calendar 서비스 연결 실패: {e}")
+        logger.error("Google Calendar 인증 정보 로드 실패: %s", e)
         raise
 
-# ====== 명령어 파싱 함수들 ======
+def setup(client, credential_manager, health_monitor, push, trace=None, traffic=None) -> APIRouter:
+    """라우터가 쓸 캘린더 클라이언트와 공유 자원을 연결하고 router 를 돌려줍니다."""
+    global calendar_client, credentials, health, push_manager, tracer, traffic_log
+    calendar_client = client
+    credentials = credential_manager
+    health = health_monitor
+    push_manager = push
+    tracer = trace
+    traffic_log = traffic
+    return router
+
+async def warmup():
+    """인증 정보 → 클라이언트 → 첫 동기화 (startup 훅을 막지 않고 백그라운드에서)"""
+    if uses_google_credentials():
+        await credentials.start()
+    await calendar_client.start()
+    await wait_synced(calendar_client)
+
+async def probe_calendar():
+    return await calendar_client.get_calendar(GOOGLE_CALENDAR_ID)
 
-def parse_date(date_str: str) -> str:
-    """날짜 문자열을 ISO 형식으로 변환"""
-    try:
-        # YYYY-MM-DD 형식 확인
-        if re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-            return date_str
-        
-        # 상대적 날짜 처리
-        today = datetime.now()
-        if date_str == "오늘":
-            return today.strftime("%Y-%m-%d")
-        elif date_str == "내일":
-            return (today + timedelta(days=1)).strftime("%Y-%m-%d")
-        elif date_str == "모레":
-            return (today + timedelta(days=2)).strftime("%Y-%m-%d")
-        
-        return date_str  # 기본값
-        
-    except Exception as e:
-        logger.error(f"날짜 파싱 실패: {e}")
-        return datetime.now().strftime("%Y-%m-%d")
+# ====== 명령어 파싱 함수들 ======
 
-def parse_datetime(date_str: str, time_str: str) -> datetime:
-    """날짜와 시간을 datetime 객체로 변환"""
-    try:
-        date = parse_date(date_str)
-        
-        # 시간 파싱 (HH:MM 형식)
-        if ':' in time_str:
-            hour, minute = map(int, time_str.split(':'))
-        else:
-            # 시간만 있는 경우 (예: "14")
-            hour = int(time_str.replace('시', ''))
-            minute = 0
-        
-        dt = datetime.strptime(f"{date} {hour:02d}:{minute:02d}", "%Y-%m-%d %H:%M")
-        return dt
-        
-    except Exception as e:
-        logger.error(f"날짜/시간 파싱 실패: {e}")
-        # 기본값: 1시간 후
-        return datetime.now() + timedelta(hours=1)
+def parse_event_datetime(date_str: str, time_str: str) -> datetime:
+    """날짜와 시간을 시간대가 붙은 datetime 으로 변환 ("14" 처럼 시만 있으면 14시)"""
+    if time_str.isdigit():
+        time_str += "시"
+    return parse_datetime(f"{date_str} {time_str}", tz_name=CALENDAR_TIMEZONE)
 
 # ====== Calendar API 함수들 ======
 
-def get_events_for_date(date_str: str) -> List[Dict[str, Any]]:
+async def get_events_for_date(date_str: str) -> List[Dict[str, Any]]:
     """특정 날짜의 일정 조회"""
     try:
-        service = get_calendar_service()
-        
         # 날짜 범위 설정
-        target_date = parse_date(date_str)
-        start_datetime = datetime.strptime(target_date, "%Y-%m-%d")
+        target_date = parse_date(date_str, tz_name=CALENDAR_TIMEZONE)
+        start_datetime = datetime.combine(target_date, time.min, tzinfo=get_zone(CALENDAR_TIMEZONE))
         end_datetime = start_datetime + timedelta(days=1)
         
         # Google Calendar API 호출
-        events_result = service.events().list(
-            calendarId=GOOGLE_CALENDAR_ID,
-            timeMin=start_datetime.isoformat() + 'Z',
-            timeMax=end_datetime.isoformat() + 'Z',
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
+        events_result = await calendar_client.list_events(
+            GOOGLE_CALENDAR_ID,
+            time_min=start_datetime.isoformat(),
+            time_max=end_datetime.isoformat(),
+            order_by='startTime'
+        )
         
         events = events_result.get('items', [])
         
@@ -202,33 +187,25 @@ def get_events_for_date(date_str: str) -> List[Dict[str, Any]]:
             }
             event_list.append(event_info)
         
-        logger.info(f"일정 조회 성공: {len(event_list)}개 ({date_str})")
+        logger.info("일정 조회 성공: %s개 (%s)", len(event_list), date_str)
         return event_list
         
-    except HttpError as e:
-        logger.error(f"Google API 에러: {e}")
+    except CalendarAPIError as e:
+        logger.error("Google API 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"Google Calendar API 에러: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"일정 조회 실패: {e}")
+        logger.error("일정 조회 실패: %s", e)
         raise HTTPException(status_code=500, detail=f"일정 조회 실패: {e}")
 
-def add_event(date_str: str, time_str: str, title: str) -> Dict[str, Any]:
+async def add_event(date_str: str, time_str: str, title: str) -> Dict[str, Any]:
     """새 일정 추가"""
     try:
-        service = get_calendar_service()
-        
         # 날짜/시간 파싱
-        start_datetime = parse_datetime(date_str, time_str)
+        start_datetime = parse_event_datetime(date_str, time_str)
         end_datetime = start_datetime + timedelta(hours=1)  # 기본 1시간
         
-        # 충돌 검사
-        existing_events = service.events().list(
-            calendarId=GOOGLE_CALENDAR_ID,
-            timeMin=start_datetime.isoformat() + 'Z',
-            timeMax=end_datetime.isoformat() + 'Z',
-            singleEvents=True
-        ).execute().get('items', [])
-        
         # 이벤트 생성
         event = {
             'summary': title,
@@ -242,10 +219,14 @@ def add_event(date_str: str, time_str: str, title: str) -> Dict[str, Any]:
             },
         }
         
-        created_event = service.events().insert(
-            calendarId=GOOGLE_CALENDAR_ID, 
-            body=event
-        ).execute()
+        # 충돌 검사
+        existing_events = (await calendar_client.list_events(
+            GOOGLE_CALENDAR_ID,
+            time_min=start_datetime.isoformat(),
+            time_max=end_datetime.isoformat()
+        )).get('items', [])
+        
+        created_event = await calendar_client.insert_event(GOOGLE_CALENDAR_ID, event)
         
         result = {
             'event_id': created_event['id'],
@@ -254,120 +235,111 @@ def add_event(date_str: str, time_str: str, title: str) -> Dict[str, Any]:
             'conflict_count': len(existing_events)
         }
         
-        logger.info(f"일정 추가 성공: {title} at {start_datetime}")
+        logger.info("일정 추가 성공: %s at %s", title, start_datetime)
         return result
         
-    except HttpError as e:
-        logger.error(f"Google API 에러: {e}")
+    except CalendarAPIError as e:
+        logger.error("Google API 에러: %s", e)
         raise HTTPException(status_code=500, detail=f"Google Calendar API 에러: {e}")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"일정 추가 실패: {e}")
+        logger.error("일정 추가 실패: %s", e)
         raise HTTPException(status_code=500, detail=f"일정 추가 실패: {e}")
 
-def delete_event(event_id: str) -> bool:
+async def delete_event(event_id: str) -> bool:
     """일정 삭제"""
     try:
-        service = get_calendar_service()
-        
         # 이벤트 삭제
-        service.events().delete(
-            calendarId=GOOGLE_CALENDAR_ID,
-            eventId=event_id
-        ).execute()
+        await calendar_client.delete_event(GOOGLE_CALENDAR_ID, event_id)
         
-        logger.info(f"일정 삭제 성공: {event_id}")
+        logger.info("일정 삭제 성공: %s", event_id)
         return True
         
-    except HttpError as e:
-        if e.resp.status == 404:
-            logger.warning(f"삭제할 일정을 찾을 수 없음: {event_id}")
+    except CalendarAPIError as e:
+        if e.status == 404:
+            logger.warning("삭제할 일정을 찾을 수 없음: %s", event_id)
             raise HTTPException(status_code=404, detail="삭제할 일정을 찾을 수 없습니다.")
         else:
-            logger.error(f"Google API 에러: {e}")
+            logger.error("Google API 에러: %s", e)
             raise HTTPException(status_code=500, detail=f"Google Calendar API 에러: {e}")
     except Exception as e:
-        logger.error(f"일정 삭제 실패: {e}")
+        logger.error("일정 삭제 실패: %s", e)
         raise HTTPException(status_code=500, detail=f"일정 삭제 실패: {e}")
 
 # ====== 명령어 처리 함수 ======
 
-def process_calendar_command(command: str) -> str:
+commands = CommandRouter("service")
+
+# 1. 캘린더 조회 [YYYY-MM-DD]
+@commands.command("조회", prefix="캘린더 조회", pattern=r"(.+)", usage="캘린더 조회 2024-01-15")
+async def show_events_command(command: str, match) -> str:
+    date_str = match.group(1).strip()
+    events = await get_events_for_date(date_str)
+    
+    with span("format_events", count=len(events)):
+        if events:
+            response = f"📅 {date_str} 일정:\n\n"
+            for i, event in enumerate(events, 1):
+                response += f"{i}. {event['title']} ({event['start_time']})\n"
+                if event['location']:
+                    response += f"   📍 {event['location']}\n"
+                if event['description']:
+                    response += f"   📝 {event['description'][:50]}...\n"
+                response += f"   🔗 ID: {event['id']}\n\n"
+            return response.strip()
+        else:
+            return f"📅 {date_str}에는 일정이 없습니다."
+
+# 2. 캘린더 추가 YYYY-MM-DD HH:MM 제목
+@commands.command("추가", prefix="캘린더 추가", pattern=r"(\S+)\s+(\S+)\s+(.+)", usage="캘린더 추가 2024-01-15 14:00 회의 제목")
+async def add_event_command(command: str, match) -> str:
+    date_str, time_str, title = match.group(1), match.group(2), match.group(3)
+    
+    result = await add_event(date_str, time_str, title)
+    
+    with span("format_response"):
+        response = f"✅ 일정이 추가되었습니다!\n\n"
+        response += f"📌 제목: {result['title']}\n"
+        response += f"🕐 시간: {result['datetime']}\n"
+        response += f"🔗 ID: {result['event_id']}\n"
+        
+        if result['conflict_count'] > 0:
+            response += f"\n⚠️ {result['conflict_count']}개의 기존 일정과 시간이 겹칩니다."
+    
+    return response
+
+# 3. 캘린더 삭제 <EVENT_ID>
+@commands.command("삭제", prefix="캘린더 삭제", pattern=r"(.+)", usage="캘린더 삭제 <event_id>")
+async def delete_event_command(command: str, match) -> str:
+    event_id = match.group(1).strip()
+    await delete_event(event_id)
+    return f"✅ 일정이 삭제되었습니다. (ID: {event_id})"
+
+# 4. 헬스체크
+@commands.command("health_check", prefix="health_check", pattern=r"\Z", usage="health_check")
+async def health_check_command(command: str, match) -> str:
+    calendar_info = await calendar_client.get_calendar(GOOGLE_CALENDAR_ID)
+    return f"✅ 서버 정상 작동 중\n📅 연결된 캘린더: {calendar_info.get('summary', 'Primary')}"
+
+async def process_calendar_command(command: str) -> str:
     """캘린더 명령어 처리 (코덱스 방식의 핵심)"""
     try:
-        command = command.strip()
-        
-        # 1. 캘린더 조회 [YYYY-MM-DD]
-        if command.startswith("캘린더 조회"):
-            match = re.match(r'캘린더 조회\s+(.+)', command)
-            if match:
-                date_str = match.group(1).strip()
-                events = get_events_for_date(date_str)
-                
-                if events:
-                    response = f"📅 {date_str} 일정:\n\n"
-                    for i, event in enumerate(events, 1):
-                        response += f"{i}. {event['title']} ({event['start_time']})\n"
-                        if event['location']:
-                            response += f"   📍 {event['location']}\n"
-                        if event['description']:
-                            response += f"   📝 {event['description'][:50]}...\n"
-                        response += f"   🔗 ID: {event['id']}\n\n"
-                    return response.strip()
-                else:
-                    return f"📅 {date_str}에는 일정이 없습니다."
-            else:
-                return "❌ 사용법: 캘린더 조회 2024-01-15"
-        
-        # 2. 캘린더 추가 YYYY-MM-DD HH:MM 제목
-        elif command.startswith("캘린더 추가"):
-            match = re.match(r'캘린더 추가\s+(\S+)\s+(\S+)\s+(.+)', command)
-            if match:
-                date_str = match.group(1)
-                time_str = match.group(2)
-                title = match.group(3)
-                
-                result = add_event(date_str, time_str, title)
-                
-                response = f"✅ 일정이 추가되었습니다!\n\n"
-                response += f"📌 제목: {result['title']}\n"
-                response += f"🕐 시간: {result['datetime']}\n"
-                response += f"🔗 ID: {result['event_id']}\n"
-                
-                if result['conflict_count'] > 0:
-                    response += f"\n⚠️ {result['conflict_count']}개의 기존 일정과 시간이 겹칩니다."
-                
-                return response
-            else:
-                return "❌ 사용법: 캘린더 추가 2024-01-15 14:00 회의 제목"
-        
-        # 3. 캘린더 삭제 <EVENT_ID>
-        elif command.startswith("캘린더 삭제"):
-            match = re.match(r'캘린더 삭제\s+(.+)', command)
-            if match:
-                event_id = match.group(1).strip()
-                delete_event(event_id)
-                return f"✅ 일정이 삭제되었습니다. (ID: {event_id})"
-            else:
-                return "❌ 사용법: 캘린더 삭제 <event_id>"
-        
-        # 4. 헬스체크
-        elif command == "health_check":
-            service = get_calendar_service()
-            calendar_info = service.calendars().get(calendarId=GOOGLE_CALENDAR_ID).execute()
-            return f"✅ 서버 정상 작동 중\n📅 연결된 캘린더: {calendar_info.get('summary', 'Primary')}"
-        
-        else:
+        response = await commands.dispatch(command.strip())
+        if response is None:
             return "❌ 알 수 없는 명령어입니다.\n사용법: '캘린더 도움말' 입력"
+        return response
             
+    except CommandUsageError as e:
+        return f"❌ 사용법: {e.usage}"
     except HTTPException as e:
         return f"❌ {e.detail}"
     except Exception as e:
-        logger.error(f"명령어 처리 실패: {e}")
+        logger.error("명령어 처리 실패: %s", e)
         return f"❌ 서버 오류: {str(e)}"
 
 # ====== FastAPI 엔드포인트 ======
 
-@app.get("/")
 async def root():
     """서버 상태 확인"""
     return {
@@ -378,7 +350,6 @@ async def root():
         "timezone": CALENDAR_TIMEZONE
     }
 
-@app.post("/webhook")
 async def webhook_handler(request: WebhookRequest):
     """메신저봇 웹훅 처리 (코덱스 방식의 핵심)"""
     try:
@@ -386,76 +357,140 @@ async def webhook_handler(request: WebhookRequest):
         room = request.room
         author = request.author
         
-        logger.info(f"명령어 수신 - 방: {room}, 사용자: {author}, 명령: {command}")
+        logger.info("명령어 수신 - 방: %s, 사용자: %s, 명령: %s", room, author, command,
+                    extra={"sampled": True, "room": room, "author": author})
         
         # 명령어 처리
-        response = process_calendar_command(command)
+        response = await process_calendar_command(command)
         
         # 응답 반환 (메신저봇에서 직접 사용할 수 있는 문자열)
         return response
         
     except Exception as e:
-        logger.error(f"웹훅 처리 실패: {e}")
+        logger.error("웹훅 처리 실패: %s", e)
         return f"❌ 서버 오류: {str(e)}"
 
-@app.get("/health")
+@router.get("/health")
 async def health_check():
-    """헬스체크"""
-    try:
-        service = get_calendar_service()
-        calendar_info = service.calendars().get(calendarId=GOOGLE_CALENDAR_ID).execute()
-        
-        return {
-            "status": "healthy",
-            "timestamp": datetime.now().isoformat(),
-            "calendar_connected": True,
-            "calendar_name": calendar_info.get('summary', 'Unknown'),
-            "service_account": True
-        }
-    except Exception as e:
+    """헬스체크 (Google 을 부르지 않고 백그라운드 확인 결과를 돌려줌)"""
+    check = health.last_check or {}
+    if not health.ready:
         return JSONResponse(
             status_code=503,
             content={
                 "status": "error",
-                "error": str(e),
-                "calendar_connected": False
+                "error": health.warmup_error or check.get("error") or "준비 중입니다.",
+                "calendar_connected": False,
+                "health": health.stats()
             }
         )
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "calendar_connected": True,
+        "calendar_name": check.get("calendar_name") or 'Unknown',
+        "calendar_checked_at": check.get("checked_at"),
+        "service_account": True,
+        "client": calendar_client.stats(),
+        "credentials": credentials.stats(),
+        "health": health.stats(),
+        "push": push_manager.stats(),
+        "commands": commands.stats(),
+        "traffic": traffic_log.stats() if traffic_log else {"enabled": False},
+        "tracing": tracer.stats() if tracer else {"enabled": False},
+        "logging": log_pipeline.stats()
+    }
 
-# ====== 서버 시작 ======
-
-@app.on_event("startup")
-async def startup_event():
-    """서버 시작 시 설정 검증"""
-    logger.info("Google Calendar 서비스 서버 시작됨")
-    
-    # 필수 환경변수 확인
-    if not GOOGLE_SERVICE_ACCOUNT_JSON:
-        logger.error("GOOGLE_SERVICE_ACCOUNT_JSON 환경변수가 설정되지 않았습니다!")
-        return
-    
-    if not GOOGLE_CALENDAR_ID:
-        logger.error("GOOGLE_CALENDAR_ID 환경변수가 설정되지 않았습니다!")
-        return
-    
-    # Google Calendar 연결 테스트
-    try:
-        service = get_calendar_service()
-        calendar_info = service.calendars().get(calendarId=GOOGLE_CALENDAR_ID).execute()
-        logger.info(f"Google Calendar 연결 성공: {calendar_info.get('summary', 'Unknown')}")
-    except Exception as e:
-        logger.error(f"Google Calendar 연결 실패: {e}")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """서버 종료"""
-    logger.info("Google Calendar 서비스 서버 종료됨")
+# ====== 서버 구성 ======
+
+def create_app() -> FastAPI:
+    """단독 실행용 앱: 공유 자원을 만들어 router 에 연결합니다."""
+    # 여기까지가 import 단계 (google.oauth2 는 인증 정보를 처음 로드할 때 import)
+    startup_report = StartupReport()
+    # 서비스 계정 키는 한 번만 읽고, 토큰은 만료 전에 백그라운드에서 갱신
+    credential_manager = CredentialManager(load_credentials)
+    # 프로세스 전체에서 공유하는 캘린더 클라이언트 (CALENDAR_CLIENT_MODE=async|threads)
+    client = create_calendar_client(credential_manager, sync_calendars=[GOOGLE_CALENDAR_ID])
+    # 봇 밖에서 바뀐 일정을 알려 주는 Google 푸시 알림 (CALENDAR_PUSH_ADDRESS 설정 시)
+    push = PushChannelManager(client, [GOOGLE_CALENDAR_ID])
+    # 캘린더 연결은 백그라운드에서 주기적으로 확인하고, 헬스체크는 마지막 결과만 읽음
+    monitor = HealthMonitor(warmup, probe_calendar, report=startup_report)
+
+    app = FastAPI(
+        title="Google Calendar Service (코덱스 방식)",
+        description="서비스 계정 기반 Google Calendar API 서버",
+        version="2.0.0"
+    )
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    # CALENDAR_TRAFFIC_LOG 가 있으면 웹훅 요청을 기록 (재생: python -m calendar_core.traffic)
+    traffic = install_traffic_recorder(app)
+    app.include_router(create_push_router(push))
+    # GET /metrics (Prometheus)
+    install_metrics(app, client)
+    # CALENDAR_TRACE_FILE 가 있으면 샘플된 요청의 구간별 시간을 기록
+    trace = install_tracing(app)
+    # CALENDAR_ADMIN_TOKEN 이 있으면 X-Profile 헤더로 요청 하나를 프로파일링 (/admin/profiles)
+    install_profiling(app)
+    # GET /startup - 프로세스 시작부터 준비 완료까지 단계별 시간
+    install_startup_report(app, startup_report)
+    # GET /health/live, /health/ready
+    install_health(app, monitor)
+    app.get("/")(root)
+    app.post("/webhook")(webhook_handler)
+    app.include_router(setup(client, credential_manager, monitor, push, trace, traffic))
+
+    @app.on_event("startup")
+    async def startup_event():
+        """서버 시작 시 설정 검증"""
+        logger.info("Google Calendar 서비스 서버 시작됨")
+        
+        # 필수 환경변수 확인
+        if uses_google_credentials() and not GOOGLE_SERVICE_ACCOUNT_JSON:
+            logger.error("GOOGLE_SERVICE_ACCOUNT_JSON 환경변수가 설정되지 않았습니다!")
+        
+        if not GOOGLE_CALENDAR_ID:
+            logger.error("GOOGLE_CALENDAR_ID 환경변수가 설정되지 않았습니다!")
+        
+        # 클라이언트 준비 + 첫 동기화 + 연결 확인은 백그라운드에서 (끝나면 /health/ready 가 200)
+        health.start()
+        
+        # 푸시 알림 채널 등록/갱신 시작
+        push_manager.start()
+        startup_report.mark("serving")
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """서버 종료"""
+        await health.stop()
+        await push_manager.stop()
+        await credentials.stop()
+        await calendar_client.close()
+        logger.info("Google Calendar 서비스 서버 종료됨")
+
+    # 앱/라우터 구성 끝 (여기부터 startup 훅)
+    startup_report.mark("module")
+    return app
+
+def __getattr__(name: str):
+    # uvicorn google_calendar_service:app 이 app 을 찾을 때 처음 한 번만 만듭니다.
+    # (fastapi/main.py 는 router 와 setup 만 쓰므로 단독 실행용 자원을 만들지 않음)
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 9000))
     
-    logger.info(f"서버 시작 - 포트: {port}")
-    logger.info("API 문서: http://localhost:{port}/docs")
+    logger.info("서버 시작 - 포트: %s", port)
+    logger.info("API 문서: http://localhost:%s/docs", port)
     
     uvicorn.run(
         "google_calendar_service:app",
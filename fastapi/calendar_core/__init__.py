@@ -0,0 +1,9 @@
+"""
+캘린더 서버 공용 모듈
+---------------------
+fastapi/google_calendar_webhook.py, examples/GoogleCalendarBot_Improved/google_calendar_service.py,
+examples/GoogleCalendarBot/fastapi_server.py 세 서버가 함께 사용하는 구성 요소입니다.
+
+예제 폴더의 서버는 이 폴더(fastapi/)를 sys.path 에 추가한 뒤
+`from calendar_core.client import CalendarClientPool` 처럼 가져옵니다.
+"""
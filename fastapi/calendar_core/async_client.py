@@ -0,0 +1,256 @@
+"""
+asyncio 기반 Google Calendar 클라이언트
+--------------------------------------
+googleapiclient 의 .execute() 는 이벤트 루프를 막기 때문에,
+async def 엔드포인트에서는 이 클라이언트로 Calendar REST API 를 직접 호출합니다.
+
+- httpx.AsyncClient 하나를 프로세스 전체에서 공유합니다. (keep-alive 연결 재사용)
+- 인증 정보는 처음 한 번만 로드하고, 만료됐을 때만 스레드에서 토큰을 갱신합니다.
+- 응답은 googleapiclient 와 같은 dict 모양 그대로 돌려줍니다.
+
+지원하는 호출: events.list / events.insert / events.delete / events.watch / channels.stop /
+              freebusy.query / calendars.get / 배치 요청(batch)
+"""
+
+import asyncio
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import quote, urlparse
+
+import httpx
+
+from calendar_core.batch import CALENDAR_BATCH_URL, BatchOperation, BatchResult, chunked, decode_batch, encode_batch
+from calendar_core.tracing import span
+
+CALENDAR_API_BASE = "https://www.googleapis.com/calendar/v3"
+DEFAULT_MAX_CONNECTIONS = int(os.getenv("CALENDAR_MAX_CONNECTIONS", "100"))
+DEFAULT_HTTP_TIMEOUT = float(os.getenv("CALENDAR_HTTP_TIMEOUT", "30"))
+
+
+class CalendarAPIError(Exception):
+    """Calendar API 가 4xx/5xx 로 응답했을 때 발생합니다."""
+
+    def __init__(self, status: int, message: str, reason: Optional[str] = None):
+        super().__init__(f"[{status}] {message}")
+        self.status = status
+        self.message = message
+        self.reason = reason
+
+
+def _error_from_response(response: httpx.Response) -> CalendarAPIError:
+    try:
+        error = response.json().get("error", {})
+    except ValueError:
+        return CalendarAPIError(response.status_code, response.text or response.reason_phrase)
+    reasons = error.get("errors") or [{}]
+    return CalendarAPIError(
+        response.status_code,
+        error.get("message", response.reason_phrase),
+        reasons[0].get("reason"),
+    )
+
+
+class AsyncCalendarClient:
+    """이벤트 루프를 막지 않는 Calendar API 클라이언트"""
+
+    def __init__(
+        self,
+        credentials_factory: Callable[[], Any],
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        timeout: float = DEFAULT_HTTP_TIMEOUT,
+        base_url: str = CALENDAR_API_BASE,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        batch_url: str = CALENDAR_BATCH_URL,
+    ):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.base_url = base_url
+        self.batch_url = batch_url
+        self._credentials_factory = credentials_factory
+        self._credentials = None
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._auth_lock: Optional[asyncio.Lock] = None
+        self._requests = 0
+        self._errors = 0
+        self._in_flight = 0
+        self._token_refreshes = 0
+        self._batches = 0
+
+    # ---------- 연결 / 인증 ----------
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        if self._auth_lock is None:
+            self._auth_lock = asyncio.Lock()
+        async with self._auth_lock:
+            with span("auth.credentials"):
+                if self._credentials is None:
+                    self._credentials = await asyncio.to_thread(self._credentials_factory)
+                credentials = self._credentials
+                if not credentials.valid:
+                    # 평소에는 CredentialManager 가 미리 갱신하므로 여기까지 오지 않습니다.
+                    from google.auth.transport.requests import Request as GoogleAuthRequest
+
+                    await asyncio.to_thread(credentials.refresh, GoogleAuthRequest())
+                    self._token_refreshes += 1
+        headers: Dict[str, str] = {}
+        credentials.apply(headers)
+        return headers
+
+    async def start(self) -> None:
+        """HTTP 클라이언트와 인증 정보를 미리 준비합니다."""
+        self._http()
+        await self._auth_headers()
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        headers = await self._auth_headers()
+        if params:
+            params = {key: value for key, value in params.items() if value is not None}
+        self._requests += 1
+        self._in_flight += 1
+        try:
+            with span("google.http", method=method, path=path) as current:
+                response = await self._http().request(method, path, params=params, json=body, headers=headers)
+                current.set(status=response.status_code)
+        finally:
+            self._in_flight -= 1
+        if response.status_code >= 400:
+            self._errors += 1
+            raise _error_from_response(response)
+        if response.status_code == 204 or not response.content:
+            return {}
+        return response.json()
+
+    # ---------- Calendar API ----------
+
+    async def list_events(
+        self,
+        calendar_id: str,
+        time_min: Optional[str] = None,
+        time_max: Optional[str] = None,
+        single_events: bool = True,
+        order_by: Optional[str] = None,
+        page_token: Optional[str] = None,
+        sync_token: Optional[str] = None,
+        max_results: Optional[int] = None,
+        show_deleted: Optional[bool] = None,
+        fields: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """events.list 한 페이지 (응답 dict 그대로)"""
+        return await self._request(
+            "GET",
+            f"/calendars/{quote(calendar_id, safe='')}/events",
+            params={
+                "timeMin": time_min,
+                "timeMax": time_max,
+                "singleEvents": single_events,
+                "orderBy": order_by,
+                "pageToken": page_token,
+                "syncToken": sync_token,
+                "maxResults": max_results,
+                "showDeleted": show_deleted,
+                "fields": fields,
+            },
+        )
+
+    async def insert_event(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._request("POST", f"/calendars/{quote(calendar_id, safe='')}/events", body=body)
+
+    async def delete_event(self, calendar_id: str, event_id: str) -> None:
+        await self._request(
+            "DELETE", f"/calendars/{quote(calendar_id, safe='')}/events/{quote(event_id, safe='')}"
+        )
+
+    async def freebusy(
+        self,
+        time_min: str,
+        time_max: str,
+        calendar_ids: List[str],
+        time_zone: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        body: Dict[str, Any] = {
+            "timeMin": time_min,
+            "timeMax": time_max,
+            "items": [{"id": calendar_id} for calendar_id in calendar_ids],
+        }
+        if time_zone:
+            body["timeZone"] = time_zone
+        return await self._request("POST", "/freeBusy", body=body)
+
+    async def get_calendar(self, calendar_id: str) -> Dict[str, Any]:
+        return await self._request("GET", f"/calendars/{quote(calendar_id, safe='')}")
+
+    async def watch_events(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._request("POST", f"/calendars/{quote(calendar_id, safe='')}/events/watch", body=body)
+
+    async def stop_channel(self, channel_id: str, resource_id: str) -> None:
+        await self._request("POST", "/channels/stop", body={"id": channel_id, "resourceId": resource_id})
+
+    async def batch(self, operations: List[BatchOperation]) -> List[BatchResult]:
+        """여러 작업을 배치 요청(최대 50개씩)으로 보냅니다. 결과는 operations 순서 그대로."""
+        results: List[BatchResult] = []
+        path_prefix = urlparse(self.base_url).path
+        for chunk in chunked(operations):
+            content_type, content = encode_batch(chunk, path_prefix)
+            headers = await self._auth_headers()
+            headers["Content-Type"] = content_type
+            self._requests += 1
+            self._batches += 1
+            self._in_flight += 1
+            try:
+                with span("google.batch", size=len(chunk)) as current:
+                    response = await self._http().post(self.batch_url, content=content, headers=headers)
+                    current.set(status=response.status_code)
+            finally:
+                self._in_flight -= 1
+            if response.status_code >= 400:
+                self._errors += 1
+                raise _error_from_response(response)
+            parts = decode_batch(response.headers.get("content-type", ""), response.content)
+            for index, operation in enumerate(chunk):
+                status, body = parts.get(index, (500, b"batch response missing"))
+                if status >= 400:
+                    self._errors += 1
+                    results.append(BatchResult(operation, error=_error_from_response(httpx.Response(status, content=body))))
+                else:
+                    results.append(BatchResult(operation, response=json.loads(body) if body else {}))
+        return results
+
+    def notify_changed(self, calendar_id: str) -> None:
+        """외부 변경 알림 (저장해 둔 데이터가 없으므로 할 일 없음)"""
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "async",
+            "max_connections": self.max_connections,
+            "requests": self._requests,
+            "batches": self._batches,
+            "errors": self._errors,
+            "in_flight": self._in_flight,
+            "token_refreshes": self._token_refreshes,
+        }
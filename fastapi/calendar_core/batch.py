@@ -0,0 +1,113 @@
+"""
+Calendar 배치 요청
+------------------
+여러 개의 events.insert / events.delete / events.get 을 HTTP 요청 한 번(multipart/mixed)으로 보냅니다.
+Google 은 배치 하나에 최대 50개 요청을 받으므로, 그보다 많으면 50개씩 나눠 차례로 보냅니다.
+
+결과는 보낸 순서대로 BatchResult 목록으로 돌려주고,
+개별 요청이 실패해도 전체가 실패하지 않고 해당 항목의 error 에 CalendarAPIError 가 들어갑니다.
+
+사용 예:
+    results = await calendar_client.batch([
+        BatchOperation.insert("primary", body1),
+        BatchOperation.delete("primary", "event-id"),
+    ])
+    for result in results:
+        if result.ok: ...
+"""
+
+import email
+import json
+import uuid
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+MAX_BATCH_SIZE = 50
+CALENDAR_BATCH_URL = "https://www.googleapis.com/batch/calendar/v3"
+
+
+class BatchOperation:
+    __slots__ = ("method", "calendar_id", "event_id", "body")
+
+    def __init__(self, method: str, calendar_id: str, event_id: Optional[str] = None, body: Optional[Dict[str, Any]] = None):
+        self.method = method
+        self.calendar_id = calendar_id
+        self.event_id = event_id
+        self.body = body
+
+    @classmethod
+    def insert(cls, calendar_id: str, body: Dict[str, Any]) -> "BatchOperation":
+        return cls("insert", calendar_id, body=body)
+
+    @classmethod
+    def delete(cls, calendar_id: str, event_id: str) -> "BatchOperation":
+        return cls("delete", calendar_id, event_id=event_id)
+
+    @classmethod
+    def get(cls, calendar_id: str, event_id: str) -> "BatchOperation":
+        return cls("get", calendar_id, event_id=event_id)
+
+    def http_request(self) -> Tuple[str, str]:
+        """(HTTP 메서드, /calendar/v3 아래 경로)"""
+        events_path = f"/calendars/{quote(self.calendar_id, safe='')}/events"
+        if self.method == "insert":
+            return "POST", events_path
+        if self.method == "delete":
+            return "DELETE", f"{events_path}/{quote(self.event_id, safe='')}"
+        if self.method == "get":
+            return "GET", f"{events_path}/{quote(self.event_id, safe='')}"
+        raise ValueError(f"지원하지 않는 배치 작업입니다: {self.method}")
+
+
+class BatchResult:
+    __slots__ = ("operation", "response", "error")
+
+    def __init__(self, operation: BatchOperation, response: Optional[Dict[str, Any]] = None, error: Optional[Exception] = None):
+        self.operation = operation
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def chunked(operations: List[BatchOperation], size: int = MAX_BATCH_SIZE) -> Iterator[List[BatchOperation]]:
+    for index in range(0, len(operations), size):
+        yield operations[index:index + size]
+
+
+def encode_batch(operations: List[BatchOperation], path_prefix: str = "/calendar/v3") -> Tuple[str, bytes]:
+    """(Content-Type 헤더, multipart/mixed 본문)"""
+    boundary = f"batch_{uuid.uuid4().hex}"
+    lines: List[str] = []
+    for index, operation in enumerate(operations):
+        method, path = operation.http_request()
+        lines += [
+            f"--{boundary}",
+            "Content-Type: application/http",
+            f"Content-ID: <item{index}>",
+            "",
+            f"{method} {path_prefix}{path} HTTP/1.1",
+        ]
+        if operation.body is not None:
+            lines += ["Content-Type: application/json; charset=UTF-8", "", json.dumps(operation.body, ensure_ascii=False)]
+        else:
+            lines.append("")
+        lines.append("")
+    lines.append(f"--{boundary}--")
+    return f"multipart/mixed; boundary={boundary}", "\r\n".join(lines).encode("utf-8")
+
+
+def decode_batch(content_type: str, content: bytes) -> Dict[int, Tuple[int, bytes]]:
+    """배치 응답을 {요청 순번: (HTTP 상태, 본문)} 으로 풉니다."""
+    message = email.message_from_bytes(b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n" + content)
+    parts: Dict[int, Tuple[int, bytes]] = {}
+    for position, part in enumerate(message.get_payload() or []):
+        content_id = (part.get("Content-ID") or "").strip("<>")
+        index = int(content_id.rsplit("item", 1)[-1]) if "item" in content_id else position
+        payload = part.get_payload(decode=True) or b""
+        head, _, body = payload.replace(b"\r\n", b"\n").partition(b"\n\n")
+        status = int(head.split(b"\n", 1)[0].split()[1])
+        parts[index] = (status, body.strip())
+    return parts
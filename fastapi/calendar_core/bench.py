@@ -0,0 +1,403 @@
+"""
+웹훅 지연 시간 벤치마크
+----------------------
+세 서버의 핫 패스를 같은 조건에서 재는 도구입니다.
+서버를 띄우지 않고 httpx ASGI 클라이언트로 앱을 직접 호출하고,
+Google Calendar 대신 가짜 백엔드(CALENDAR_CLIENT_MODE=fake)를 씁니다.
+
+시나리오:
+  calendar_webhook  fastapi/google_calendar_webhook.py          POST /calendar/webhook
+  webhook           examples/GoogleCalendarBot/fastapi_server.py POST /webhook
+  service_webhook   examples/GoogleCalendarBot_Improved/...      POST /webhook
+  api_events        examples/GoogleCalendarBot/fastapi_server.py POST /api/calendar/events
+
+메신저 시나리오는 단톡방처럼 잡담이 대부분이고 조회/빈시간/추가/삭제가 섞여 들어옵니다.
+시나리오마다 처리량(req/s), p50/p95/p99 지연(ms), 메모리를 재서 JSON 으로 저장하고,
+--compare 로 이전 결과와 비교할 수 있습니다.
+
+사용 예 (fastapi/ 에서):
+  python -m calendar_core.bench --requests 2000 --concurrency 20 --output bench.json
+  python -m calendar_core.bench --latency-ms 80 --scenario calendar_webhook
+  python -m calendar_core.bench --compare bench_old.json --output bench_new.json
+
+날짜 파서 마이크로 벤치마크 (캐시 / 캐시 없음 / 예전 strptime 방식, ns/op):
+  python -m calendar_core.bench --dates
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = Path(__file__).resolve().parents[2]
+
+CHATTER = [
+    "ㅋㅋㅋㅋ 오늘 점심 뭐 먹지",
+    "내일 몇 시에 모여요?",
+    "과제 다 했어??",
+    "이번주 일정 너무 많다ㅠㅠ",
+    "넵 알겠습니다!",
+    "사진 올렸어요",
+    "회의록 공유 부탁드려요",
+    "ㅇㅇ",
+    "캘린더 앱 뭐 써?",
+    "다들 주말에 뭐해요",
+]
+
+
+class Scenario:
+    __slots__ = ("name", "module_path", "path", "mix")
+
+    def __init__(self, name: str, module_path: str, path: str, mix: List[Tuple[float, Callable[["Context"], Dict[str, Any]]]]):
+        self.name = name
+        self.module_path = module_path
+        self.path = path
+        self.mix = mix
+
+
+class Context:
+    """요청 본문을 만들 때 쓰는 상태 (오늘 날짜, 삭제할 일정 ID)"""
+
+    def __init__(self, rng: random.Random, today: date, event_ids: List[str]):
+        self.rng = rng
+        self.today = today
+        self.event_ids = event_ids
+
+    def day(self, span: int = 7) -> str:
+        return (self.today + timedelta(days=self.rng.randrange(span))).isoformat()
+
+    def hour(self) -> str:
+        return f"{self.rng.randrange(9, 19):02d}:{self.rng.choice(('00', '30'))}"
+
+    def event_id(self) -> str:
+        # 준비한 ID 를 다 쓰면 없는 ID 로 삭제를 시도합니다. (404 경로)
+        return self.event_ids.pop() if self.event_ids else f"missing{self.rng.randrange(10 ** 6)}"
+
+    def chatter(self) -> str:
+        return self.rng.choice(CHATTER)
+
+
+def _calendar_message(message: str) -> Dict[str, Any]:
+    return {"room": "벤치방", "sender": "bench", "message": message}
+
+
+def _legacy_message(message: str) -> Dict[str, Any]:
+    return {"room": "벤치방", "sender": "bench", "msg": message}
+
+
+def _service_message(command: str) -> Dict[str, Any]:
+    return {"room": "벤치방", "author": "bench", "command": command, "timestamp": datetime.now().isoformat()}
+
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("calendar_webhook", "fastapi/google_calendar_webhook.py", "/calendar/webhook", [
+            (0.60, lambda c: _calendar_message(c.chatter())),
+            (0.15, lambda c: _calendar_message(c.rng.choice(("캘린더 조회", "캘린더 조회 내일", "캘린더 조회 이번주")))),
+            (0.10, lambda c: _calendar_message(f"캘린더 빈시간 {c.rng.choice(('오늘', '내일', c.day()))}")),
+            (0.10, lambda c: _calendar_message(f"캘린더 추가 {c.day()} {c.hour()} 벤치 회의")),
+            (0.05, lambda c: _calendar_message(f"캘린더 삭제 {c.event_id()}")),
+        ]),
+        Scenario("webhook", "examples/GoogleCalendarBot/fastapi_server.py", "/webhook", [
+            (0.65, lambda c: _legacy_message(c.chatter())),
+            (0.15, lambda c: _legacy_message("오늘 일정 보여줘")),
+            (0.15, lambda c: _legacy_message(f"빈시간 {c.rng.choice(('오늘', '내일', c.day()))}")),
+            (0.05, lambda c: _legacy_message("일정 추가 내일 3시 회의")),
+        ]),
+        Scenario("service_webhook", "examples/GoogleCalendarBot_Improved/google_calendar_service.py", "/webhook", [
+            (0.60, lambda c: _service_message(c.chatter())),
+            (0.20, lambda c: _service_message(f"캘린더 조회 {c.day()}")),
+            (0.12, lambda c: _service_message(f"캘린더 추가 {c.day()} {c.hour()} 벤치 회의")),
+            (0.08, lambda c: _service_message(f"캘린더 삭제 {c.event_id()}")),
+        ]),
+        Scenario("api_events", "examples/GoogleCalendarBot/fastapi_server.py", "/api/calendar/events", [
+            (0.70, lambda c: {"action": "get_events", "period": c.rng.choice(("today", "tomorrow", "week", "month"))}),
+            (0.20, lambda c: {"action": "add_event", "title": "벤치 회의", "datetime": f"{c.day()} {c.hour()}"}),
+            (0.10, lambda c: {"action": "delete_event", "event_id": c.event_id()}),
+        ]),
+    )
+}
+
+
+def load_app_module(relative_path: str) -> Any:
+    """서버 모듈을 파일 경로로 불러옵니다. (같은 파일은 한 번만)"""
+    name = "bench_" + Path(relative_path).stem
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, ROOT / relative_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    # 서버 모듈은 app 을 처음 찾을 때 단독 실행용 앱과 캘린더 클라이언트를 만듭니다.
+    getattr(module, "app")
+    return module
+
+
+def base_client(client: Any) -> Any:
+    """캐시/복제본 래퍼를 벗겨 가장 안쪽 클라이언트를 돌려줍니다."""
+    while hasattr(client, "client"):
+        client = client.client
+    return client
+
+
+async def seed_events(client: Any, calendar_id: str, today: date, days: int, per_day: int, rng: random.Random) -> List[str]:
+    """오늘부터 days 일 동안 하루 per_day 개씩 일정을 넣고 ID 목록을 돌려줍니다."""
+    ids = []
+    for offset in range(days):
+        day = today + timedelta(days=offset)
+        for _ in range(per_day):
+            start = datetime(day.year, day.month, day.day, rng.randrange(8, 20), rng.choice((0, 30)))
+            end = start + timedelta(minutes=rng.choice((30, 60, 90)))
+            event = await client.insert_event(calendar_id, {
+                "summary": f"기존 일정 {len(ids)}",
+                "start": {"dateTime": start.isoformat(), "timeZone": "Asia/Seoul"},
+                "end": {"dateTime": end.isoformat(), "timeZone": "Asia/Seoul"},
+            })
+            ids.append(event["id"])
+    rng.shuffle(ids)
+    return ids
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """nearest-rank 백분위수"""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def _max_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+async def prepare_app(relative_path: str, args: argparse.Namespace, prepared: Dict[str, Any]) -> Tuple[Any, List[str]]:
+    """서버 모듈을 불러와 일정을 채우고 클라이언트를 시작합니다. (시나리오끼리 같은 서버는 공유)"""
+    if relative_path not in prepared:
+        from calendar_core.dates import current_date
+
+        module = load_app_module(relative_path)
+        backend = base_client(module.calendar_client)
+        # 준비 단계에는 지연/오류를 넣지 않습니다.
+        latency, error_rate = backend.latency, backend.error_rate
+        backend.latency = backend.error_rate = 0
+        event_ids = await seed_events(
+            backend, "primary", current_date(), args.seed_days, args.events_per_day, random.Random(args.seed)
+        )
+        backend.latency, backend.error_rate = latency, error_rate
+        await module.calendar_client.start()
+        prepared[relative_path] = (module, event_ids)
+    return prepared[relative_path]
+
+
+async def run_scenario(scenario: Scenario, args: argparse.Namespace, prepared: Dict[str, Any]) -> Dict[str, Any]:
+    import httpx
+    from calendar_core.dates import current_date
+
+    module, event_ids = await prepare_app(scenario.module_path, args, prepared)
+    calendar_client = module.calendar_client
+    rng = random.Random(args.seed)
+    context = Context(rng, current_date(), event_ids)
+    weights = [weight for weight, _ in scenario.mix]
+    builders = [builder for _, builder in scenario.mix]
+
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    transport = httpx.ASGITransport(app=module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        async def worker(count: int, record: bool) -> None:
+            for _ in range(count):
+                payload = rng.choices(builders, weights)[0](context)
+                started = time.perf_counter()
+                response = await http.post(scenario.path, json=payload)
+                elapsed = time.perf_counter() - started
+                if record:
+                    latencies.append(elapsed)
+                    statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+        async def run(total: int, record: bool) -> float:
+            per_worker, extra = divmod(total, args.concurrency)
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                worker(per_worker + (1 if i < extra else 0), record) for i in range(args.concurrency)
+            ))
+            return time.perf_counter() - started
+
+        await run(args.warmup, record=False)
+        rss_before = _max_rss_kb()
+        if args.trace_memory:
+            tracemalloc.start()
+        wall = await run(args.requests, record=True)
+        heap_peak = None
+        if args.trace_memory:
+            heap_peak = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+        rss_after = _max_rss_kb()
+
+    ordered = sorted(latencies)
+    result = {
+        "path": scenario.path,
+        "requests": len(latencies),
+        "concurrency": args.concurrency,
+        "wall_seconds": round(wall, 4),
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "latency_ms": {
+            "mean": round(sum(ordered) / len(ordered) * 1000, 3) if ordered else 0.0,
+            "p50": round(percentile(ordered, 0.50) * 1000, 3),
+            "p95": round(percentile(ordered, 0.95) * 1000, 3),
+            "p99": round(percentile(ordered, 0.99) * 1000, 3),
+            "max": round(ordered[-1] * 1000, 3) if ordered else 0.0,
+        },
+        "status_codes": statuses,
+        "memory_kb": {"max_rss": rss_after, "max_rss_growth": (rss_after - rss_before) if rss_after is not None else None},
+        "backend": base_client(calendar_client).stats(),
+    }
+    if heap_peak is not None:
+        result["memory_kb"]["python_heap_peak"] = heap_peak
+    return result
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any]) -> None:
+    """두 결과 파일의 처리량/지연을 시나리오별로 비교해 출력합니다."""
+    print(f"\n비교: {previous['meta'].get('revision')} → {current['meta'].get('revision')}")
+    print(f"{'scenario':<18}{'metric':<10}{'before':>12}{'after':>12}{'change':>10}")
+    for name, after in current["scenarios"].items():
+        before = previous.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        rows = [("rps", before["throughput_rps"], after["throughput_rps"])]
+        rows += [(key, before["latency_ms"][key], after["latency_ms"][key]) for key in ("p50", "p95", "p99")]
+        for metric, old, new in rows:
+            change = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+            print(f"{name:<18}{metric:<10}{old:>12}{new:>12}{change:>10}")
+
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(f"{'scenario':<18}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'rss KB':>12}  status")
+    for name, result in results.items():
+        latency = result["latency_ms"]
+        print(
+            f"{name:<18}{result['throughput_rps']:>10}{latency['p50']:>10}{latency['p95']:>10}"
+            f"{latency['p99']:>10}{str(result['memory_kb']['max_rss']):>12}  {result['status_codes']}"
+        )
+
+
+# ---------- 날짜 파서 마이크로 벤치마크 (--dates) ----------
+
+DATE_SAMPLES = ["오늘", "내일 오후 3시", "2024-01-15 14:00", "다음주 금요일 10:30", "1/15", "이번주"]
+
+
+def legacy_parse(expr: str) -> datetime:
+    """비교용: 예전 서버들이 쓰던 strptime 연쇄 방식 (모르는 표현은 지금 시각)"""
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d", "%m/%d", "%H:%M"):
+        try:
+            return datetime.strptime(expr, fmt)
+        except ValueError:
+            pass
+    return datetime.now()
+
+
+def bench_dates(runs: int = 20000) -> None:
+    import timeit
+
+    from calendar_core import dates
+
+    print(f"{'expression':<22}{'cached':>12}{'uncached':>12}{'strptime':>12}   (ns/op)")
+    for sample in DATE_SAMPLES:
+        today = dates.current_date()
+        if dates._TIME.search(sample) is not None:
+            parse = dates.parse_datetime
+            raw = lambda: dates._datetime.__wrapped__(sample, today, dates.DEFAULT_TIMEZONE)
+        else:
+            parse = dates.parse_date_range
+            raw = lambda: dates._date_range.__wrapped__(sample, today)
+        cached = timeit.timeit(lambda: parse(sample), number=runs)
+        uncached = timeit.timeit(raw, number=runs)
+        legacy = timeit.timeit(lambda: legacy_parse(sample), number=runs)
+        print(f"{sample:<22}{cached / runs * 1e9:>12.0f}{uncached / runs * 1e9:>12.0f}{legacy / runs * 1e9:>12.0f}")
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    results = {}
+    prepared: Dict[str, Any] = {}
+    try:
+        for name in args.scenario or list(SCENARIOS):
+            results[name] = await run_scenario(SCENARIOS[name], args, prepared)
+    finally:
+        for module, _ in prepared.values():
+            await module.calendar_client.close()
+    return {
+        "meta": {
+            "revision": _git_revision(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "options": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "scenarios": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="웹훅/API 지연 시간 벤치마크 (가짜 백엔드)")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), help="여러 번 지정 가능 (기본: 전체)")
+    parser.add_argument("--requests", type=int, default=1000, help="시나리오별 측정 요청 수")
+    parser.add_argument("--warmup", type=int, default=100, help="측정 전에 버릴 요청 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시 요청 수")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="가짜 백엔드 호출마다 넣을 지연")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="가짜 백엔드 오류 주입 확률")
+    parser.add_argument("--seed-days", type=int, default=30, help="미리 넣어 둘 일정의 기간(일)")
+    parser.add_argument("--events-per-day", type=int, default=8, help="하루에 미리 넣어 둘 일정 수")
+    parser.add_argument("--seed", type=int, default=42, help="메시지 순서를 고정하는 난수 시드")
+    parser.add_argument("--log-level", default="WARNING", help="서버 로그 수준 (INFO 면 로그 비용까지 잽니다)")
+    parser.add_argument("--trace-memory", action="store_true", help="tracemalloc 으로 파이썬 힙 최고치 측정 (느려짐)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 (없으면 표만 출력)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON 파일")
+    parser.add_argument("--dates", action="store_true", help="웹훅 대신 날짜 파서 마이크로 벤치마크만 실행")
+    args = parser.parse_args()
+    if args.dates:
+        bench_dates()
+        sys.exit(0)
+
+    # 서버 모듈을 불러오기 전에 가짜 백엔드를 고릅니다. (factory 가 import 시점에 읽음)
+    os.environ["CALENDAR_CLIENT_MODE"] = "fake"
+    os.environ["CALENDAR_FAKE_LATENCY_MS"] = str(args.latency_ms)
+    os.environ["CALENDAR_FAKE_ERROR_RATE"] = str(args.error_rate)
+    os.environ.setdefault("GOOGLE_SERVICE_ACCOUNT_JSON", "{}")  # 설정 검증 통과용 (fake 모드에서는 쓰지 않음)
+    logging.disable(getattr(logging, args.log_level.upper()) - 1)
+
+    report = asyncio.run(main(args))
+    print_table(report["scenarios"])
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"\n결과 저장: {args.output}")
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text(encoding="utf-8")), report)
@@ -0,0 +1,184 @@
+"""
+Google Calendar 클라이언트 풀
+-----------------------------
+요청마다 인증 정보를 다시 읽고 build("calendar", "v3") 를 호출하던 방식을 대신합니다.
+
+- 인증 정보는 처음 한 번만 로드해서 모든 서비스 객체가 공유합니다.
+- 서비스 객체는 각자 전용 httplib2.Http 를 가지므로 keep-alive 연결이 유지됩니다.
+- httplib2.Http 는 스레드 안전하지 않기 때문에 서비스 객체는 한 번에 한 곳에서만 빌려 씁니다.
+- discovery 문서는 네트워크 대신 googleapiclient 에 들어 있는 정적 문서(또는 CALENDAR_DISCOVERY_FILE)를
+  프로세스에서 한 번만 읽어 모든 서비스 객체가 같이 씁니다.
+- googleapiclient / httplib2 는 threads 모드에서 처음 서비스 객체를 만들 때 import 합니다. (서버 시작 시간 단축)
+
+사용 예:
+    calendar_pool = CalendarClientPool(load_credentials, size=4)
+    calendar_pool.start()
+
+    with calendar_pool.service() as service:
+        service.events().list(calendarId="primary").execute()
+"""
+
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from calendar_core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.getenv("CALENDAR_POOL_SIZE", "4"))
+DEFAULT_HTTP_TIMEOUT = float(os.getenv("CALENDAR_HTTP_TIMEOUT", "30"))
+DEFAULT_ACQUIRE_TIMEOUT = float(os.getenv("CALENDAR_POOL_ACQUIRE_TIMEOUT", "10"))
+DEFAULT_DISCOVERY_FILE = os.getenv("CALENDAR_DISCOVERY_FILE")
+
+
+@functools.lru_cache(maxsize=None)
+def load_discovery_document(path: Optional[str] = DEFAULT_DISCOVERY_FILE) -> Dict[str, Any]:
+    """Calendar v3 discovery 문서 (path 가 없으면 googleapiclient 에 들어 있는 정적 문서)"""
+    if path is None:
+        from googleapiclient import discovery_cache
+        path = os.path.join(os.path.dirname(discovery_cache.__file__), "documents", "calendar.v3.json")
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class PoolExhaustedError(RuntimeError):
+    """대기 시간 안에 빌릴 수 있는 서비스 객체가 없을 때 발생합니다."""
+
+
+class CalendarClientPool:
+    """스레드 안전한 Google Calendar 서비스 객체 풀"""
+
+    def __init__(
+        self,
+        credentials_factory: Callable[[], Any],
+        size: int = DEFAULT_POOL_SIZE,
+        http_timeout: float = DEFAULT_HTTP_TIMEOUT,
+        acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT,
+    ):
+        if size < 1:
+            raise ValueError("풀 크기는 1 이상이어야 합니다.")
+        self.size = size
+        self.http_timeout = http_timeout
+        self.acquire_timeout = acquire_timeout
+        self._credentials_factory = credentials_factory
+        self._credentials = None
+        self._idle: "queue.LifoQueue[Any]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use = 0
+        self._checkouts = 0
+        self._reuses = 0
+        self._waits = 0
+
+    @property
+    def credentials(self) -> Any:
+        """인증 정보 (처음 접근할 때 한 번만 로드)"""
+        with self._lock:
+            if self._credentials is None:
+                self._credentials = self._credentials_factory()
+            return self._credentials
+
+    def _build_service(self) -> Any:
+        import httplib2
+        from google_auth_httplib2 import AuthorizedHttp
+        from googleapiclient.discovery import build_from_document
+
+        http = AuthorizedHttp(self.credentials, http=httplib2.Http(timeout=self.http_timeout))
+        return build_from_document(load_discovery_document(), http=http)
+
+    def _reserve_slot(self) -> bool:
+        with self._lock:
+            if self._created >= self.size:
+                return False
+            self._created += 1
+            return True
+
+    def _release_slot(self) -> None:
+        with self._lock:
+            self._created -= 1
+
+    def _create_service(self) -> Any:
+        try:
+            return self._build_service()
+        except Exception:
+            self._release_slot()
+            raise
+
+    def start(self) -> None:
+        """남은 슬롯만큼 서비스 객체를 미리 만들어 둡니다."""
+        built = 0
+        while self._reserve_slot():
+            self._idle.put(self._create_service())
+            built += 1
+        if built:
+            logger.info(f"Google Calendar 클라이언트 풀 준비 완료: {built}개 생성")
+
+    def _acquire(self) -> Any:
+        reused = True
+        try:
+            service = self._idle.get_nowait()
+        except queue.Empty:
+            if self._reserve_slot():
+                service = self._create_service()
+                reused = False
+            else:
+                with self._lock:
+                    self._waits += 1
+                try:
+                    service = self._idle.get(timeout=self.acquire_timeout)
+                except queue.Empty:
+                    raise PoolExhaustedError(
+                        f"{self.acquire_timeout}초 안에 Google Calendar 클라이언트를 얻지 못했습니다."
+                    )
+        with self._lock:
+            self._in_use += 1
+            self._checkouts += 1
+            if reused:
+                self._reuses += 1
+        return service
+
+    def _release(self, service: Any) -> None:
+        with self._lock:
+            self._in_use -= 1
+        self._idle.put(service)
+
+    @contextmanager
+    def service(self) -> Iterator[Any]:
+        """서비스 객체를 빌려 쓰고 끝나면 풀에 돌려줍니다."""
+        with span("client_pool.acquire"):
+            service = self._acquire()
+        try:
+            yield service
+        finally:
+            self._release(service)
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 크기와 재사용 카운터"""
+        with self._lock:
+            return {
+                "size": self.size,
+                "created": self._created,
+                "idle": self._idle.qsize(),
+                "in_use": self._in_use,
+                "checkouts": self._checkouts,
+                "reuses": self._reuses,
+                "waits": self._waits,
+            }
+
+    def close(self) -> None:
+        """놀고 있는 서비스 객체의 HTTP 연결을 닫습니다."""
+        while True:
+            try:
+                service = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                service.close()
+            finally:
+                self._release_slot()
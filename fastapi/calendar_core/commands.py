@@ -0,0 +1,203 @@
+"""
+명령어 라우터
+-------------
+세 서버가 공통으로 쓰는 메신저 명령어 분기기입니다.
+startswith / "일정" in msg 를 줄줄이 검사하던 if-elif 대신, 명령어를 표에 등록해 두고
+등록된 모든 키워드를 Aho-Corasick 오토마톤 하나로 한 번에 찾습니다.
+
+- 메시지를 한 번 훑는 것(O(len(msg)))으로 키워드 위치를 모두 알 수 있어서,
+  단톡방 잡담처럼 명령어가 아닌 메시지는 정규식을 하나도 돌리지 않고 바로 걸러집니다.
+- 인자 문법(정규식)은 등록할 때 한 번만 컴파일합니다.
+- 여러 명령어가 동시에 맞으면 먼저 등록한 것이 이깁니다. (기존 if-elif 순서 그대로)
+
+사용 예:
+    router = CommandRouter("webhook")
+
+    @router.command("조회", prefix="캘린더 조회", pattern=r"(\\S+)", usage="캘린더 조회 2024-01-15")
+    async def show(message, match):
+        ...
+
+    reply = await router.dispatch(message)   # 명령어가 아니면 None
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+
+from calendar_core.metrics import COMMAND_DURATION, COMMAND_REQUESTS
+from calendar_core.tracing import span
+
+Handler = Callable[[str, Optional["re.Match"]], Awaitable[Any]]
+
+
+class CommandUsageError(ValueError):
+    """명령어는 맞지만 인자가 문법에 맞지 않을 때 발생합니다. (메시지는 사용법)"""
+
+    def __init__(self, usage: str):
+        super().__init__(f"사용법: {usage}")
+        self.usage = usage
+
+
+class KeywordMatcher:
+    """Aho-Corasick 오토마톤 - 여러 키워드의 첫 등장 위치를 O(len(text)) 에 찾습니다."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[str, ...]] = [()]
+        for keyword in dict.fromkeys(keywords):
+            self._add(keyword)
+        self._build()
+
+    def _add(self, keyword: str) -> None:
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] += (keyword,)
+
+    def _build(self) -> None:
+        # 루트 바로 아래 상태의 실패 링크는 루트(0) 입니다.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def find(self, text: str) -> Dict[str, int]:
+        """{키워드: 처음 나타난 시작 위치}"""
+        found: Dict[str, int] = {}
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword in out[state]:
+                if keyword not in found:
+                    found[keyword] = position - len(keyword) + 1
+        return found
+
+
+class Command:
+    __slots__ = ("name", "prefix", "keywords", "pattern", "usage", "handler")
+
+    def __init__(
+        self,
+        name: str,
+        handler: Handler,
+        prefix: Optional[str] = None,
+        keywords: Tuple[str, ...] = (),
+        pattern: Optional[str] = None,
+        usage: Optional[str] = None,
+    ):
+        self.name = name
+        self.handler = handler
+        self.prefix = prefix
+        self.keywords = keywords
+        self.pattern: Optional[Pattern[str]] = re.compile(pattern, re.DOTALL) if pattern is not None else None
+        self.usage = usage or prefix or name
+
+    def matches(self, message: str, found: Dict[str, int]) -> bool:
+        if self.prefix is not None and found.get(self.prefix) != 0:
+            return False
+        return all(keyword in found for keyword in self.keywords)
+
+    def arguments(self, message: str) -> str:
+        """문법을 적용할 부분 (prefix 명령어는 prefix 뒤, 키워드 명령어는 메시지 전체)"""
+        return message[len(self.prefix):].strip() if self.prefix is not None else message
+
+
+class CommandRouter:
+    """명령어 표 + 키워드 오토마톤. name 은 여러 서버의 라우터를 통계에서 구분하는 이름입니다."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._commands: List[Command] = []
+        self._matcher: Optional[KeywordMatcher] = None
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+        self._unmatched = 0
+
+    def add(self, command: Command) -> None:
+        self._commands.append(command)
+        self._counts[command.name] = 0
+        self._matcher = None
+
+    def command(
+        self,
+        name: str,
+        prefix: Optional[str] = None,
+        keywords: Iterable[str] = (),
+        pattern: Optional[str] = None,
+        usage: Optional[str] = None,
+    ) -> Callable[[Handler], Handler]:
+        """핸들러 등록 데코레이터. handler(message, match) 로 호출됩니다. (pattern 이 없으면 match 는 None)"""
+        def register(handler: Handler) -> Handler:
+            self.add(Command(name, handler, prefix, tuple(keywords), pattern, usage))
+            return handler
+        return register
+
+    def _compiled(self) -> KeywordMatcher:
+        if self._matcher is None:
+            keywords: List[str] = []
+            for command in self._commands:
+                if command.prefix is not None:
+                    keywords.append(command.prefix)
+                keywords.extend(command.keywords)
+            self._matcher = KeywordMatcher(keywords)
+        return self._matcher
+
+    def match(self, message: str) -> Optional[Tuple[Command, Optional["re.Match"]]]:
+        """(명령어, 인자 match) 또는 명령어가 아니면 None. 문법이 틀리면 CommandUsageError."""
+        found = self._compiled().find(message)
+        command = next((c for c in self._commands if found and c.matches(message, found)), None)
+        if command is None:
+            with self._lock:
+                self._unmatched += 1
+            COMMAND_REQUESTS.inc(self.name, "none", "unmatched")
+            return None
+        with self._lock:
+            self._counts[command.name] += 1
+        if command.pattern is None:
+            return command, None
+        match = command.pattern.match(command.arguments(message))
+        if match is None:
+            COMMAND_REQUESTS.inc(self.name, command.name, "usage")
+            raise CommandUsageError(command.usage)
+        return command, match
+
+    async def dispatch(self, message: str) -> Optional[Any]:
+        """맞는 명령어의 핸들러 결과, 명령어가 아니면 None"""
+        with span("command.match"):
+            matched = self.match(message)
+        if matched is None:
+            return None
+        command, match = matched
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            with span("command.dispatch", command=command.name):
+                result = await command.handler(message, match)
+            outcome = "ok"
+            return result
+        finally:
+            COMMAND_DURATION.observe(time.perf_counter() - started, self.name, command.name)
+            COMMAND_REQUESTS.inc(self.name, command.name, outcome)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"router": self.name, "commands": dict(self._counts), "unmatched": self._unmatched}
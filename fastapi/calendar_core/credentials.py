@@ -0,0 +1,166 @@
+"""
+인증 정보 관리
+-------------
+토큰 갱신을 요청 처리 경로 밖으로 빼내는 관리자입니다.
+
+- 인증 정보(token.pickle / 서비스 계정 키)는 프로세스에서 한 번만 읽습니다.
+- 백그라운드 작업이 토큰 만료 CALENDAR_TOKEN_REFRESH_MARGIN 초 전에 스레드에서 미리 갱신합니다.
+  인증 정보 객체는 그 자리에서 갱신되므로, 같은 객체를 쓰는 클라이언트(async / threads)는
+  항상 유효한 토큰을 보게 되고 채팅 요청이 토큰 발급을 기다리지 않습니다.
+- 갱신한 토큰은 persist 콜백으로 저장합니다. write_pickle_atomic 은 임시 파일에 쓴 뒤
+  os.replace 로 바꿔서, 쓰는 도중 종료돼도 token.pickle 이 깨지지 않습니다.
+- 갱신이 실패하면 점점 간격을 늘려 다시 시도합니다. (그동안 토큰이 만료되면 클라이언트가 직접 갱신)
+
+사용 예:
+    credentials = CredentialManager(load_credentials, persist=save_token)
+    calendar_client = create_calendar_client(credentials, ...)   # credentials() 는 같은 객체를 돌려줌
+
+    @app.on_event("startup")
+    async def startup():
+        await credentials.start()
+
+환경 변수:
+  CALENDAR_TOKEN_REFRESH_MARGIN=300   만료 몇 초 전에 갱신할지
+"""
+
+import asyncio
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_MARGIN = float(os.getenv("CALENDAR_TOKEN_REFRESH_MARGIN", "300"))
+# 만료 시각이 없는 인증 정보는 이 간격으로 확인만 합니다.
+NO_EXPIRY_CHECK_INTERVAL = 3600.0
+MAX_RETRY_DELAY = 300.0
+
+
+def write_pickle_atomic(path: str, value: Any) -> None:
+    """같은 폴더의 임시 파일에 쓴 뒤 os.replace 로 바꿉니다."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _seconds_until(expiry: Optional[datetime]) -> Optional[float]:
+    if expiry is None:
+        return None
+    # google-auth 의 expiry 는 timezone 없는 UTC 입니다.
+    if expiry.tzinfo is None:
+        expiry = expiry.replace(tzinfo=timezone.utc)
+    return (expiry - datetime.now(timezone.utc)).total_seconds()
+
+
+class CredentialManager:
+    """한 번 로드하고 백그라운드에서 미리 갱신하는 인증 정보 관리자 (credentials_factory 로 그대로 씀)"""
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        persist: Optional[Callable[[Any], None]] = None,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+    ):
+        self.loader = loader
+        self.persist = persist
+        self.refresh_margin = refresh_margin
+        self._credentials = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._refreshes = 0
+        self._errors = 0
+        self._last_refreshed_at: Optional[float] = None
+        self._last_error: Optional[str] = None
+
+    def __call__(self) -> Any:
+        """인증 정보 (처음 한 번만 로드, 이후 같은 객체)"""
+        with self._lock:
+            if self._credentials is None:
+                self._credentials = self.loader()
+            return self._credentials
+
+    def refresh_in(self) -> float:
+        """다음 갱신까지 남은 시간(초). 0 이면 지금 갱신해야 합니다."""
+        credentials = self._credentials
+        if credentials is None or not getattr(credentials, "token", None):
+            return 0.0
+        remaining = _seconds_until(getattr(credentials, "expiry", None))
+        if remaining is None:
+            return NO_EXPIRY_CHECK_INTERVAL
+        return max(remaining - self.refresh_margin, 0.0)
+
+    def refresh(self) -> None:
+        """(스레드에서) 필요하면 로드/갱신하고 저장합니다."""
+        credentials = self()
+        if self.refresh_in() > 0:
+            return
+        from google.auth.transport.requests import Request as GoogleAuthRequest
+
+        credentials.refresh(GoogleAuthRequest())
+        self._refreshes += 1
+        self._last_refreshed_at = time.time()
+        if self.persist is not None:
+            try:
+                self.persist(credentials)
+            except OSError as e:
+                logger.warning("갱신한 토큰 저장 실패: %s", e)
+        logger.info("Google 토큰 갱신 완료 (만료까지 %.0f초)", _seconds_until(credentials.expiry) or 0)
+
+    async def _run(self) -> None:
+        # start() 가 방금 갱신했으면 다음 만료까지, 로드에 실패했으면 잠시 뒤 다시 시도
+        delay = self.refresh_in() if self._credentials is not None else 5.0
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await asyncio.to_thread(self.refresh)
+                delay = self.refresh_in()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._errors += 1
+                self._last_error = str(e)
+                delay = min(max(delay * 2, 5.0), MAX_RETRY_DELAY)
+                logger.error("Google 토큰 갱신 실패 (%.0f초 뒤 다시 시도): %s", delay, e)
+
+    async def start(self) -> None:
+        """인증 정보를 로드/갱신하고 백그라운드 갱신을 시작합니다. (처음 로드 실패는 그대로 올림)"""
+        try:
+            await asyncio.to_thread(self.refresh)
+        finally:
+            if self._task is None:
+                self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        credentials = self._credentials
+        remaining = _seconds_until(getattr(credentials, "expiry", None)) if credentials is not None else None
+        return {
+            "loaded": credentials is not None,
+            "valid": bool(credentials is not None and credentials.valid),
+            "expires_in": round(remaining, 1) if remaining is not None else None,
+            "refreshes": self._refreshes,
+            "errors": self._errors,
+            "last_error": self._last_error,
+            "last_refreshed_at": self._last_refreshed_at,
+        }
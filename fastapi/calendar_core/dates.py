@@ -0,0 +1,190 @@
+"""
+한국어 날짜/시간 표현 파서
+-------------------------
+세 서버가 제각각 갖고 있던 날짜 파서를 하나로 합친 모듈입니다.
+
+지원하는 표현:
+  날짜  오늘 / 내일 / 모레 / 글피, 이번주 / 다음주 / 이번달 / 다음달,
+        월~일(요일) / 이번주 금요일 / 다음주 월요일,
+        2024-01-15, 2024/01/15, 2024.01.15, 01-15, 1/15, 1월 15일
+  시간  14:00, 14시, 3시 30분, 3시반, 오전 9시, 오후 3시, 저녁 7시
+  날짜+시간  "내일 오후 3시", "2024-01-15 14:00", "금요일 10:00" (날짜가 없으면 오늘)
+
+- 정규식은 모듈을 읽을 때 한 번만 컴파일하고, ZoneInfo 도 시간대마다 한 번만 만듭니다.
+- 결과는 (표현, 오늘 날짜) 를 키로 메모이제이션하므로, 같은 표현을 다시 파싱하면 딕셔너리 조회 한 번입니다.
+  날짜가 바뀌면 키가 달라지므로 "내일" 이 어제 값을 돌려주는 일은 없습니다.
+- 알 수 없는 표현은 조용히 "지금" 으로 바꾸지 않고 ValueError 를 냅니다.
+
+마이크로 벤치마크 (예전 strptime 방식과 비교):
+  python -m calendar_core.bench --dates
+"""
+
+import os
+import re
+import time as _time_module
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from calendar_core.tracing import span
+
+DEFAULT_TIMEZONE = os.getenv("CALENDAR_TIMEZONE", "Asia/Seoul")
+CACHE_SIZE = 4096
+
+WEEKDAYS = "월화수목금토일"
+RELATIVE_DAYS = {
+    "오늘": 0, "today": 0,
+    "내일": 1, "tomorrow": 1,
+    "모레": 2, "day_after_tomorrow": 2,
+    "글피": 3,
+}
+WEEK_OFFSETS = {"": None, "이번주": 0, "다음주": 1, "다다음주": 2}
+
+_SPACES = re.compile(r"\s+")
+_FULL_DATE = re.compile(r"(\d{4})[-./](\d{1,2})[-./](\d{1,2})")
+_MONTH_DAY = re.compile(r"(\d{1,2})[-/](\d{1,2})|(\d{1,2})월\s*(\d{1,2})일")
+_WEEKDAY = re.compile(r"(?:(이번주|다음주|다다음주)\s*)?([월화수목금토일])(?:요일)?")
+_TIME = re.compile(
+    r"(?:(오전|오후|아침|저녁|밤)\s*)?(\d{1,2})(?::(\d{2})|\s*시(?:\s*(\d{1,2})\s*분|\s*(반))?)"
+)
+
+
+@lru_cache(maxsize=None)
+def get_zone(tz_name: str = DEFAULT_TIMEZONE) -> ZoneInfo:
+    """시간대 객체 (시간대 이름마다 한 번만 만듭니다)"""
+    return ZoneInfo(tz_name)
+
+
+_today: dict = {}  # 시간대 이름 -> (오늘 날짜, 다음 자정의 epoch 초)
+
+
+def current_date(tz_name: str = DEFAULT_TIMEZONE) -> date:
+    """시간대 기준 오늘 날짜 (자정이 지날 때까지 다시 계산하지 않습니다)"""
+    cached = _today.get(tz_name)
+    if cached is not None and _time_module.time() < cached[1]:
+        return cached[0]
+    now = datetime.now(get_zone(tz_name))
+    next_midnight = datetime.combine(now.date() + timedelta(days=1), time.min, tzinfo=now.tzinfo)
+    _today[tz_name] = (now.date(), next_midnight.timestamp())
+    return now.date()
+
+
+def _normalize(expr: str) -> str:
+    return _SPACES.sub(" ", expr.strip())
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _date_range(expr: str, today: date) -> Optional[Tuple[date, int]]:
+    expr = _normalize(expr)
+    if expr in RELATIVE_DAYS:
+        return today + timedelta(days=RELATIVE_DAYS[expr]), 1
+    monday = today - timedelta(days=today.weekday())
+    if expr in ("이번주", "this_week"):
+        return today, 7 - today.weekday()
+    if expr in ("다음주", "next_week"):
+        return monday + timedelta(days=7), 7
+    if expr in ("이번달", "다음달"):
+        first = today.replace(day=1)
+        next_first = (first + timedelta(days=32)).replace(day=1)
+        if expr == "이번달":
+            return today, (next_first - today).days
+        return next_first, ((next_first + timedelta(days=32)).replace(day=1) - next_first).days
+
+    try:
+        match = _FULL_DATE.fullmatch(expr)
+        if match:
+            return date(int(match.group(1)), int(match.group(2)), int(match.group(3))), 1
+        match = _MONTH_DAY.fullmatch(expr)
+        if match:
+            month, day = (match.group(1), match.group(2)) if match.group(1) else (match.group(3), match.group(4))
+            return date(today.year, int(month), int(day)), 1
+    except ValueError:
+        return None  # 2월 30일 같은 없는 날짜
+
+    match = _WEEKDAY.fullmatch(expr)
+    if match:
+        weekday = WEEKDAYS.index(match.group(2))
+        week_offset = WEEK_OFFSETS[match.group(1) or ""]
+        if week_offset is None:
+            # 요일만 있으면 오늘 이후 가장 가까운 그 요일
+            return today + timedelta(days=(weekday - today.weekday()) % 7), 1
+        return monday + timedelta(days=7 * week_offset + weekday), 1
+    return None
+
+
+def parse_date_range(expr: str, today: Optional[date] = None, tz_name: str = DEFAULT_TIMEZONE) -> Tuple[date, int]:
+    """(시작 날짜, 일수). 이번주는 오늘~일요일, 다음주는 월~일, 이번달은 오늘~월말."""
+    with span("dates.parse", expr=expr):
+        result = _date_range(expr, today or current_date(tz_name))
+    if result is None:
+        raise ValueError(f"날짜를 이해하지 못했습니다: {expr}")
+    return result
+
+
+def parse_date(expr: str, today: Optional[date] = None, tz_name: str = DEFAULT_TIMEZONE) -> date:
+    """날짜 하나 (기간 표현이면 시작 날짜)"""
+    return parse_date_range(expr, today, tz_name)[0]
+
+
+def _time_from_match(match: "re.Match") -> Optional[time]:
+    meridiem, hour, minute = match.group(1), int(match.group(2)), 0
+    if match.group(3):
+        minute = int(match.group(3))
+    elif match.group(4):
+        minute = int(match.group(4))
+    elif match.group(5):
+        minute = 30
+    if meridiem in ("오후", "저녁", "밤") and hour < 12:
+        hour += 12
+    elif meridiem in ("오전", "아침") and hour == 12:
+        hour = 0
+    if hour > 23 or minute > 59:
+        return None
+    return time(hour, minute)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _time(expr: str) -> Optional[time]:
+    match = _TIME.fullmatch(_normalize(expr))
+    return _time_from_match(match) if match else None
+
+
+def parse_time(expr: str) -> time:
+    """시간 하나 ("14:00", "오후 3시", "3시반" ...)"""
+    with span("dates.parse", expr=expr):
+        result = _time(expr)
+    if result is None:
+        raise ValueError(f"시간을 이해하지 못했습니다: {expr}")
+    return result
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _datetime(expr: str, today: date, tz_name: str) -> Optional[datetime]:
+    expr = _normalize(expr)
+    match = _TIME.search(expr)
+    if match is None:
+        return None
+    parsed_time = _time_from_match(match)
+    date_expr = (expr[:match.start()] + expr[match.end():]).strip()
+    parsed = _date_range(date_expr, today) if date_expr else (today, 1)
+    if parsed_time is None or parsed is None:
+        return None
+    return datetime.combine(parsed[0], parsed_time, tzinfo=get_zone(tz_name))
+
+
+def parse_datetime(expr: str, today: Optional[date] = None, tz_name: str = DEFAULT_TIMEZONE) -> datetime:
+    """날짜+시간 ("내일 오후 3시", "2024-01-15 14:00") → 시간대가 붙은 datetime"""
+    with span("dates.parse", expr=expr):
+        result = _datetime(expr, today or current_date(tz_name), tz_name)
+    if result is None:
+        raise ValueError(f"날짜/시간을 이해하지 못했습니다: {expr}")
+    return result
+
+
+def cache_info() -> dict:
+    return {
+        "date": _date_range.cache_info()._asdict(),
+        "time": _time.cache_info()._asdict(),
+        "datetime": _datetime.cache_info()._asdict(),
+    }
@@ -0,0 +1,299 @@
+"""
+일정 조회 캐시
+--------------
+단체방에서 "캘린더 조회" / "일정 보여줘" 가 같은 날짜로 여러 번 들어와도
+Google 에는 한 번만 묻도록 events.list 결과를 프로세스 안에 저장합니다.
+
+- 키: (calendar_id, timeMin, timeMax, 나머지 조회 옵션)
+- TTL 이 지나면 다시 조회하고, 항목 수가 max_entries 를 넘으면 가장 오래 안 쓴 것부터 버립니다. (LRU)
+- 일정 추가는 겹치는 시간 범위의 캐시를, 일정 삭제는 그 일정이 들어 있던 캐시를 지웁니다.
+- 같은 키를 동시에 조회하면 Google 호출은 하나만 나갑니다.
+
+CachingCalendarClient 는 다른 캘린더 클라이언트를 감싸서 같은 메서드를 그대로 제공합니다.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from calendar_core.batch import BatchOperation, BatchResult
+
+DEFAULT_TTL = float(os.getenv("CALENDAR_CACHE_TTL", "60"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("CALENDAR_CACHE_MAX_ENTRIES", "512"))
+
+_MIN_TIME = datetime.min.replace(tzinfo=timezone.utc)
+_MAX_TIME = datetime.max.replace(tzinfo=timezone.utc)
+
+
+def parse_api_time(value: Optional[str], tz_name: Optional[str] = None) -> Optional[datetime]:
+    """Calendar API 의 RFC3339 문자열을 timezone 이 있는 datetime 으로 변환"""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=ZoneInfo(tz_name) if tz_name else timezone.utc)
+    return parsed
+
+
+def event_bounds(event: Dict[str, Any]) -> Tuple[datetime, datetime]:
+    """일정의 [시작, 끝) 범위. 종일 일정은 시간대를 모르므로 앞뒤로 하루씩 넓게 잡습니다."""
+    bounds = []
+    for field in ("start", "end"):
+        moment = event.get(field, {})
+        if moment.get("dateTime"):
+            bounds.append(parse_api_time(moment["dateTime"], moment.get("timeZone")))
+        elif moment.get("date"):
+            day = datetime.fromisoformat(moment["date"]).replace(tzinfo=timezone.utc)
+            bounds.append(day - timedelta(days=1) if field == "start" else day + timedelta(days=1))
+        else:
+            bounds.append(_MIN_TIME if field == "start" else _MAX_TIME)
+    return bounds[0], bounds[1]
+
+
+class _Entry:
+    __slots__ = ("calendar_id", "start", "end", "event_ids", "value", "expires_at")
+
+    def __init__(self, calendar_id, start, end, value, expires_at):
+        self.calendar_id = calendar_id
+        self.start = start
+        self.end = end
+        self.value = value
+        self.expires_at = expires_at
+        self.event_ids = {item.get("id") for item in value.get("items", [])}
+
+
+class EventCache:
+    """TTL + LRU 캐시 (시간 범위 단위 무효화 지원)"""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, _Entry]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def generation(self, calendar_id: str) -> int:
+        """캘린더별 쓰기 횟수. 조회 도중 쓰기가 있었는지 확인할 때 씁니다."""
+        with self._lock:
+            return self._generations.get(calendar_id, 0)
+
+    def get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            if entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry.value
+
+    def put(
+        self,
+        key: tuple,
+        calendar_id: str,
+        time_min: Optional[str],
+        time_max: Optional[str],
+        value: Dict[str, Any],
+        generation: Optional[int] = None,
+    ) -> None:
+        entry = _Entry(
+            calendar_id,
+            parse_api_time(time_min) or _MIN_TIME,
+            parse_api_time(time_max) or _MAX_TIME,
+            value,
+            time.monotonic() + self.ttl,
+        )
+        with self._lock:
+            # 조회하는 사이에 같은 캘린더에 쓰기가 있었다면 저장하지 않습니다.
+            if generation is not None and generation != self._generations.get(calendar_id, 0):
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def _drop(self, calendar_id: str, matches) -> int:
+        with self._lock:
+            self._generations[calendar_id] = self._generations.get(calendar_id, 0) + 1
+            stale = [key for key, entry in self._entries.items() if entry.calendar_id == calendar_id and matches(entry)]
+            for key in stale:
+                del self._entries[key]
+            self._invalidations += len(stale)
+            return len(stale)
+
+    def invalidate_range(self, calendar_id: str, start: datetime, end: datetime) -> int:
+        """[start, end) 와 겹치는 캐시 항목을 지웁니다."""
+        return self._drop(calendar_id, lambda entry: entry.start < end and start < entry.end)
+
+    def invalidate_event(self, calendar_id: str, event_id: str) -> int:
+        """해당 일정이 들어 있는 캐시 항목을 지웁니다."""
+        return self._drop(calendar_id, lambda entry: event_id in entry.event_ids)
+
+    def invalidate_calendar(self, calendar_id: str) -> int:
+        return self._drop(calendar_id, lambda entry: True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+            }
+
+
+class CachingCalendarClient:
+    """events.list 를 캐시하고, 쓰기 호출에서 캐시를 무효화하는 클라이언트 래퍼"""
+
+    def __init__(self, client: Any, cache: Optional[EventCache] = None):
+        self.client = client
+        self.cache = cache or EventCache()
+        self._inflight: Dict[tuple, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._coalesced = 0
+
+    async def start(self) -> None:
+        await self.client.start()
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    async def list_events(
+        self,
+        calendar_id: str,
+        time_min: Optional[str] = None,
+        time_max: Optional[str] = None,
+        single_events: bool = True,
+        order_by: Optional[str] = None,
+        page_token: Optional[str] = None,
+        sync_token: Optional[str] = None,
+        max_results: Optional[int] = None,
+        show_deleted: Optional[bool] = None,
+        fields: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        kwargs = {
+            "time_min": time_min,
+            "time_max": time_max,
+            "single_events": single_events,
+            "order_by": order_by,
+            "page_token": page_token,
+            "sync_token": sync_token,
+            "max_results": max_results,
+            "show_deleted": show_deleted,
+            "fields": fields,
+        }
+        # 페이지 이어받기/증분 동기화 호출은 캐시하지 않습니다.
+        if page_token or sync_token:
+            return await self.client.list_events(calendar_id, **kwargs)
+
+        key = (calendar_id,) + tuple(kwargs.values())
+        while True:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            self._coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # 먼저 호출한 쪽만 취소되었으면 (pending 이 취소됨) 다시 시도하고, 내가 취소되었으면 그대로 전파
+                if not pending.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self.cache.generation(calendar_id)
+        try:
+            result = await self.client.list_events(calendar_id, **kwargs)
+        except asyncio.CancelledError:
+            # 취소는 기다리던 쪽에 넘기지 않습니다. (기다리던 쪽은 위 루프에서 다시 호출)
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # 기다리는 쪽이 없어도 경고가 남지 않도록
+            raise
+        else:
+            future.set_result(result)
+            self.cache.put(key, calendar_id, time_min, time_max, result, generation)
+            return result
+        finally:
+            del self._inflight[key]
+
+    async def insert_event(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return await self.client.insert_event(calendar_id, body)
+        finally:
+            start, end = event_bounds(body)
+            self.cache.invalidate_range(calendar_id, start, end)
+
+    async def delete_event(self, calendar_id: str, event_id: str) -> None:
+        try:
+            await self.client.delete_event(calendar_id, event_id)
+        finally:
+            self.cache.invalidate_event(calendar_id, event_id)
+
+    async def freebusy(
+        self,
+        time_min: str,
+        time_max: str,
+        calendar_ids: List[str],
+        time_zone: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        return await self.client.freebusy(time_min, time_max, calendar_ids, time_zone=time_zone)
+
+    async def batch(self, operations: List[BatchOperation]) -> List[BatchResult]:
+        try:
+            return await self.client.batch(operations)
+        finally:
+            for operation in operations:
+                if operation.method == "insert":
+                    start, end = event_bounds(operation.body)
+                    self.cache.invalidate_range(operation.calendar_id, start, end)
+                elif operation.method == "delete":
+                    self.cache.invalidate_event(operation.calendar_id, operation.event_id)
+
+    async def get_calendar(self, calendar_id: str) -> Dict[str, Any]:
+        return await self.client.get_calendar(calendar_id)
+
+    async def watch_events(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.client.watch_events(calendar_id, body)
+
+    async def stop_channel(self, channel_id: str, resource_id: str) -> None:
+        await self.client.stop_channel(channel_id, resource_id)
+
+    def notify_changed(self, calendar_id: str) -> None:
+        """봇 밖에서 캘린더가 바뀌었으면 해당 캘린더 캐시를 모두 버립니다."""
+        self.cache.invalidate_calendar(calendar_id)
+        self.client.notify_changed(calendar_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.client.stats(), "cache": {**self.cache.stats(), "coalesced": self._coalesced}}
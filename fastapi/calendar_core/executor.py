@@ -0,0 +1,124 @@
+"""
+크기가 정해진 스레드 풀 실행기
+------------------------------
+블로킹 함수(googleapiclient 의 .execute() 등)를 이벤트 루프 밖의 스레드에서 실행합니다.
+
+- 작업 스레드 수(max_workers)와 대기열 길이(max_queue)에 상한이 있습니다.
+- 호출마다 타임아웃이 걸려 있어서 느린 Google 응답이 요청을 무한히 붙잡지 않습니다.
+- 대기열 깊이, 대기 시간, 실행 시간을 stats() 로 확인할 수 있습니다.
+
+사용 예:
+    executor = BoundedExecutor(max_workers=8)
+    result = await executor.run(blocking_function, arg1, timeout=5)
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_MAX_WORKERS = int(os.getenv("CALENDAR_EXECUTOR_WORKERS", "8"))
+DEFAULT_MAX_QUEUE = int(os.getenv("CALENDAR_EXECUTOR_MAX_QUEUE", "200"))
+DEFAULT_CALL_TIMEOUT = float(os.getenv("CALENDAR_CALL_TIMEOUT", "15"))
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """대기열이 가득 차서 작업을 받을 수 없을 때 발생합니다."""
+
+
+class CallTimeoutError(TimeoutError):
+    """작업이 제한 시간 안에 끝나지 않았을 때 발생합니다."""
+
+
+class BoundedExecutor:
+    """대기열 상한과 호출별 타임아웃이 있는 스레드 풀"""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        timeout: Optional[float] = DEFAULT_CALL_TIMEOUT,
+        name: str = "calendar",
+    ):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+
+    def _wrap(self, fn: Callable[..., Any], args: tuple, kwargs: Dict[str, Any], submitted_at: float):
+        def task() -> Any:
+            started_at = time.perf_counter()
+            waited = started_at - submitted_at
+            with self._lock:
+                self._queued -= 1
+                self._active += 1
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._active -= 1
+                    self._completed += 1
+                    self._run_total += time.perf_counter() - started_at
+
+        return task
+
+    def _on_done(self, future: Future) -> None:
+        # 시작도 못 하고 취소된 작업은 대기열에서 빼 줍니다.
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        """fn(*args, **kwargs) 를 스레드 풀에서 실행하고 결과를 기다립니다."""
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._rejected += 1
+                raise ExecutorSaturatedError(f"실행 대기열이 가득 찼습니다. ({self.max_queue}개)")
+            self._queued += 1
+            self._submitted += 1
+        # 요청 추적(contextvars)이 작업 스레드에서도 이어지도록 현재 컨텍스트에서 실행합니다.
+        context = contextvars.copy_context()
+        future = self._pool.submit(context.run, self._wrap(fn, args, kwargs, time.perf_counter()))
+        future.add_done_callback(self._on_done)
+        limit = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), limit)
+        except asyncio.TimeoutError:
+            with self._lock:
+                self._timeouts += 1
+            raise CallTimeoutError(f"{getattr(fn, '__name__', 'call')} 호출이 {limit}초 안에 끝나지 않았습니다.")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "active": self._active,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "timeouts": self._timeouts,
+                "avg_wait_ms": round(self._wait_total / started * 1000, 3) if started else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 3),
+                "avg_run_ms": round(self._run_total / self._completed * 1000, 3) if self._completed else 0.0,
+            }
+
+    def shutdown(self, wait: bool = False) -> None:
+        self._pool.shutdown(wait=wait, cancel_futures=True)
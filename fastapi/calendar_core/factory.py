@@ -0,0 +1,71 @@
+"""
+캘린더 클라이언트 생성
+----------------------
+CALENDAR_CLIENT_MODE 환경변수로 실행 방식을 고릅니다.
+
+- async   (기본값) : AsyncCalendarClient - httpx 로 REST API 를 직접 호출
+- threads          : ThreadedCalendarClient - googleapiclient 를 크기가 정해진 스레드 풀에서 실행
+- fake             : FakeCalendarClient - 메모리 저장소 (Google 인증 없이 로컬 개발/부하 테스트)
+- sqlite           : FakeCalendarClient - CALENDAR_SQLITE_PATH 의 SQLite 저장소
+
+모든 클라이언트는 같은 async 메서드를 제공하므로 서버 코드는 모드와 상관없이 동일합니다.
+CALENDAR_CACHE_TTL 이 0보다 크면 (기본 60초) 일정 조회 캐시로 한 번 더 감쌉니다.
+CALENDAR_SYNC_ENABLED=1 (기본값) 이면 sync_calendars 에 넘긴 캘린더를 syncToken 으로
+동기화해 두고 조회/빈시간 요청을 메모리 복제본에서 답합니다.
+CALENDAR_MIRROR_DB (기본 calendar_mirror.db) 에 복제본과 syncToken 을 남겨 두어
+재시작 직후에도 로컬에서 답하고 변경분만 이어서 동기화합니다. (fake 모드 제외)
+CALENDAR_METRICS_ENABLED=1 (기본값) 이면 Google 호출마다 /metrics 지표를 기록합니다.
+"""
+
+import os
+from typing import Any, Callable, Iterable
+
+from calendar_core.async_client import AsyncCalendarClient
+from calendar_core.event_cache import DEFAULT_TTL, CachingCalendarClient, EventCache
+from calendar_core.metrics import METRICS_ENABLED, MeteredCalendarClient
+from calendar_core.mirror_store import DEFAULT_MIRROR_DB, MirrorStore
+from calendar_core.sync import CalendarMirror, MirroredCalendarClient
+
+CALENDAR_CLIENT_MODE = os.getenv("CALENDAR_CLIENT_MODE", "async")
+CALENDAR_SYNC_ENABLED = os.getenv("CALENDAR_SYNC_ENABLED", "1") == "1"
+
+
+def uses_google_credentials(mode: str = CALENDAR_CLIENT_MODE) -> bool:
+    """Google 인증 정보가 필요한 모드인지 (fake/sqlite 는 필요 없음)"""
+    return mode in ("async", "threads")
+
+
+def create_calendar_client(
+    credentials_factory: Callable[[], Any],
+    mode: str = CALENDAR_CLIENT_MODE,
+    sync_calendars: Iterable[str] = (),
+):
+    """설정된 모드의 캘린더 클라이언트를 만듭니다. (fake/sqlite 모드는 credentials_factory 를 쓰지 않습니다)"""
+    # 고른 모드의 모듈만 import 합니다. (googleapiclient 는 threads 모드에서만 필요)
+    if mode == "async":
+        base = AsyncCalendarClient(credentials_factory)
+    elif mode == "threads":
+        from calendar_core.client import CalendarClientPool
+        from calendar_core.executor import BoundedExecutor
+        from calendar_core.threaded_client import ThreadedCalendarClient
+
+        base = ThreadedCalendarClient(CalendarClientPool(credentials_factory), BoundedExecutor())
+    elif mode in ("fake", "sqlite"):
+        from calendar_core.fake_backend import FakeCalendarClient, SQLiteEventStore
+
+        base = FakeCalendarClient(SQLiteEventStore() if mode == "sqlite" else None)
+    else:
+        raise ValueError(f"지원하지 않는 CALENDAR_CLIENT_MODE 입니다: {mode}")
+    if METRICS_ENABLED:
+        # 캐시/복제본이 답한 요청은 빼고 실제로 나간 호출만 세도록 가장 안쪽을 감쌉니다.
+        base = MeteredCalendarClient(base)
+    client = base
+    if DEFAULT_TTL > 0:
+        client = CachingCalendarClient(client, EventCache())
+    if CALENDAR_SYNC_ENABLED and sync_calendars:
+        # 메모리 저장소(fake)는 재시작하면 비므로 그 복제본을 디스크에 남기면 안 됩니다.
+        store = MirrorStore(DEFAULT_MIRROR_DB) if DEFAULT_MIRROR_DB and mode != "fake" else None
+        # 동기화 호출은 캐시를 거치지 않도록 base 클라이언트를 씁니다.
+        mirrors = {calendar_id: CalendarMirror(base, calendar_id, store=store) for calendar_id in sync_calendars}
+        client = MirroredCalendarClient(client, mirrors, store)
+    return client
@@ -0,0 +1,364 @@
+"""
+가짜(로컬) Google Calendar 백엔드
+--------------------------------
+네트워크 없이 서버 전체를 돌려 보기 위한 Calendar API 대역입니다.
+AsyncCalendarClient 와 같은 메서드를 제공하므로 서버 코드는 그대로 두고
+CALENDAR_CLIENT_MODE 만 바꿔서 씁니다.
+
+- fake   : 메모리에만 저장 (MemoryEventStore)
+- sqlite : SQLite 파일에 저장 (SQLiteEventStore, 재시작해도 일정 유지)
+
+흉내 내는 동작:
+  events.list  - timeMin/timeMax 겹침 필터, orderBy=startTime(singleEvents 필요)/updated,
+                 maxResults + pageToken 페이지 나누기, showDeleted, syncToken 증분 조회
+                 (마지막 페이지에 nextSyncToken, 오래된 토큰은 410)
+  events.insert / events.delete / events.get(배치) / freebusy.query / calendars.get /
+  events.watch / channels.stop / 배치 요청
+
+부하 테스트용 설정 (환경 변수):
+  CALENDAR_FAKE_LATENCY_MS=0     호출마다 넣을 지연 (Google 왕복 시간 흉내)
+  CALENDAR_FAKE_ERROR_RATE=0     이 확률로 CALENDAR_FAKE_ERROR_STATUS 오류 발생
+  CALENDAR_FAKE_ERROR_STATUS=503
+  CALENDAR_SQLITE_PATH=calendar_fake.db   (sqlite 모드)
+"""
+
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from calendar_core.async_client import CalendarAPIError
+from calendar_core.batch import BatchOperation, BatchResult
+from calendar_core.event_cache import parse_api_time
+from calendar_core.free_slots import merge_intervals
+from calendar_core.interval_index import IntervalIndex
+from calendar_core.sync import _format_utc, event_range
+from calendar_core.tracing import span
+
+DEFAULT_LATENCY = float(os.getenv("CALENDAR_FAKE_LATENCY_MS", "0")) / 1000
+DEFAULT_ERROR_RATE = float(os.getenv("CALENDAR_FAKE_ERROR_RATE", "0"))
+DEFAULT_ERROR_STATUS = int(os.getenv("CALENDAR_FAKE_ERROR_STATUS", "503"))
+DEFAULT_SQLITE_PATH = os.getenv("CALENDAR_SQLITE_PATH", "calendar_fake.db")
+DEFAULT_TIME_ZONE = os.getenv("CALENDAR_TIMEZONE", "Asia/Seoul")
+# 이보다 오래된 변경 번호의 syncToken 은 만료(410)로 처리합니다.
+SYNC_TOKEN_RETENTION = 100000
+
+
+def _now_rfc3339() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+# ---------- 저장소 ----------
+
+
+class MemoryEventStore:
+    """메모리 저장소. 캘린더마다 {id: 일정} + 구간 인덱스"""
+
+    def __init__(self):
+        self._events: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._seq: Dict[str, Dict[str, int]] = {}
+        self._index: Dict[str, IntervalIndex] = {}
+        self._last_seq = 0
+
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def get(self, calendar_id: str, event_id: str) -> Optional[Dict[str, Any]]:
+        return self._events.get(calendar_id, {}).get(event_id)
+
+    def put(self, calendar_id: str, event: Dict[str, Any], span: Optional[Tuple[float, float]]) -> int:
+        """일정 저장(취소된 일정은 span=None 으로 기록만 남김). 변경 번호를 돌려줍니다."""
+        self._last_seq += 1
+        self._events.setdefault(calendar_id, {})[event["id"]] = event
+        self._seq.setdefault(calendar_id, {})[event["id"]] = self._last_seq
+        index = self._index.setdefault(calendar_id, IntervalIndex())
+        if span is None:
+            index.remove(event["id"])
+        else:
+            index.add(event["id"], span[0], span[1], event)
+        return self._last_seq
+
+    def overlapping(self, calendar_id: str, start: Optional[float], end: Optional[float]) -> List[Dict[str, Any]]:
+        """[start, end) 와 겹치는 (취소되지 않은) 일정, 시작 시간 순"""
+        index = self._index.get(calendar_id)
+        return index.overlapping(start, end) if index is not None else []
+
+    def changed_since(self, calendar_id: str, seq: int) -> List[Dict[str, Any]]:
+        """변경 번호가 seq 보다 큰 일정 (취소 포함), 변경 순"""
+        seqs = self._seq.get(calendar_id, {})
+        events = self._events.get(calendar_id, {})
+        return [events[event_id] for event_id, _ in sorted(
+            ((event_id, s) for event_id, s in seqs.items() if s > seq), key=lambda item: item[1]
+        )]
+
+    def count(self) -> int:
+        return sum(len(index) for index in self._index.values())
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteEventStore:
+    """SQLite 저장소. (calendar_id, start_ts) / (calendar_id, seq) 인덱스로 구간/증분 조회"""
+
+    def __init__(self, path: str = DEFAULT_SQLITE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " calendar_id TEXT NOT NULL, id TEXT NOT NULL, seq INTEGER NOT NULL,"
+            " start_ts REAL, end_ts REAL, body TEXT NOT NULL,"
+            " PRIMARY KEY (calendar_id, id))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS events_start ON events (calendar_id, start_ts)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS events_seq ON events (calendar_id, seq)")
+        self._last_seq = self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM events").fetchone()[0]
+
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def get(self, calendar_id: str, event_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body FROM events WHERE calendar_id = ? AND id = ?", (calendar_id, event_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, calendar_id: str, event: Dict[str, Any], span: Optional[Tuple[float, float]]) -> int:
+        with self._lock:
+            self._last_seq += 1
+            start, end = span if span is not None else (None, None)
+            self._db.execute(
+                "INSERT OR REPLACE INTO events (calendar_id, id, seq, start_ts, end_ts, body) VALUES (?, ?, ?, ?, ?, ?)",
+                (calendar_id, event["id"], self._last_seq, start, end, json.dumps(event, ensure_ascii=False)),
+            )
+            return self._last_seq
+
+    def overlapping(self, calendar_id: str, start: Optional[float], end: Optional[float]) -> List[Dict[str, Any]]:
+        query = "SELECT body FROM events WHERE calendar_id = ? AND start_ts IS NOT NULL"
+        params: List[Any] = [calendar_id]
+        if end is not None:
+            query += " AND start_ts < ?"
+            params.append(end)
+        if start is not None:
+            query += " AND end_ts > ?"
+            params.append(start)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY start_ts, id", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def changed_since(self, calendar_id: str, seq: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT body FROM events WHERE calendar_id = ? AND seq > ? ORDER BY seq", (calendar_id, seq)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM events WHERE start_ts IS NOT NULL").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+# ---------- 클라이언트 ----------
+
+
+class FakeCalendarClient:
+    """Calendar API 대역 (지연/오류 주입 가능)"""
+
+    def __init__(
+        self,
+        store: Optional[Any] = None,
+        latency: float = DEFAULT_LATENCY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+        error_status: int = DEFAULT_ERROR_STATUS,
+        time_zone: str = DEFAULT_TIME_ZONE,
+        seed: Optional[int] = None,
+    ):
+        self.store = store if store is not None else MemoryEventStore()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.time_zone = time_zone
+        self._random = random.Random(seed)
+        self._requests = 0
+        self._injected_errors = 0
+        self._calls: Dict[str, int] = {}
+
+    async def _call(self, method: str) -> None:
+        """호출마다 지연과 오류를 주입합니다."""
+        self._requests += 1
+        self._calls[method] = self._calls.get(method, 0) + 1
+        with span("fake.call", method=method):
+            if self.latency > 0:
+                await asyncio.sleep(self.latency)
+            if self.error_rate > 0 and self._random.random() < self.error_rate:
+                self._injected_errors += 1
+                raise CalendarAPIError(self.error_status, "injected error", "backendError")
+
+    def _span(self, event: Dict[str, Any]) -> Tuple[float, float]:
+        start, end = event_range(event, self.time_zone)
+        return start.timestamp(), end.timestamp()
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        self.store.close()
+
+    # ---------- Calendar API ----------
+
+    async def list_events(
+        self,
+        calendar_id: str,
+        time_min: Optional[str] = None,
+        time_max: Optional[str] = None,
+        single_events: bool = True,
+        order_by: Optional[str] = None,
+        page_token: Optional[str] = None,
+        sync_token: Optional[str] = None,
+        max_results: Optional[int] = None,
+        show_deleted: Optional[bool] = None,
+        fields: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        await self._call("events.list")
+        if order_by == "startTime" and not single_events:
+            raise CalendarAPIError(400, "The requested ordering is not available for the particular query.", "invalid")
+        if sync_token:
+            if time_min or time_max or order_by:
+                raise CalendarAPIError(400, "Sync token cannot be combined with these filters.", "invalid")
+            seq = int(sync_token)
+            if seq < self.store.last_seq() - SYNC_TOKEN_RETENTION:
+                raise CalendarAPIError(410, "Sync token is no longer valid, a full sync is required.", "fullSyncRequired")
+            items = self.store.changed_since(calendar_id, seq)
+        else:
+            start = parse_api_time(time_min).timestamp() if time_min else None
+            end = parse_api_time(time_max).timestamp() if time_max else None
+            items = self.store.overlapping(calendar_id, start, end)
+            if show_deleted:
+                items = items + [
+                    event for event in self.store.changed_since(calendar_id, 0) if event.get("status") == "cancelled"
+                ]
+            if order_by == "updated":
+                items = sorted(items, key=lambda event: event.get("updated", ""))
+
+        page: Dict[str, Any] = {"kind": "calendar#events", "timeZone": self.time_zone}
+        offset = int(page_token) if page_token else 0
+        if max_results and offset + max_results < len(items):
+            page["nextPageToken"] = str(offset + max_results)
+            items = items[offset:offset + max_results]
+        else:
+            items = items[offset:]
+            page["nextSyncToken"] = str(self.store.last_seq())
+        page["items"] = items
+        return page
+
+    def _insert(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        if "start" not in body or "end" not in body:
+            raise CalendarAPIError(400, "Missing end time.", "required")
+        event = dict(body)
+        event.setdefault("id", uuid.uuid4().hex)
+        event.update({"kind": "calendar#event", "status": "confirmed", "created": _now_rfc3339(), "updated": _now_rfc3339()})
+        seq = self.store.put(calendar_id, event, self._span(event))
+        event["etag"] = f'"{seq}"'
+        return event
+
+    def _delete(self, calendar_id: str, event_id: str) -> None:
+        event = self.store.get(calendar_id, event_id)
+        if event is None:
+            raise CalendarAPIError(404, "Not Found", "notFound")
+        if event.get("status") == "cancelled":
+            raise CalendarAPIError(410, "Resource has been deleted", "deleted")
+        tombstone = {"kind": "calendar#event", "id": event_id, "status": "cancelled", "updated": _now_rfc3339()}
+        self.store.put(calendar_id, tombstone, None)
+
+    def _get(self, calendar_id: str, event_id: str) -> Dict[str, Any]:
+        event = self.store.get(calendar_id, event_id)
+        if event is None:
+            raise CalendarAPIError(404, "Not Found", "notFound")
+        return event
+
+    async def insert_event(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        await self._call("events.insert")
+        return self._insert(calendar_id, body)
+
+    async def delete_event(self, calendar_id: str, event_id: str) -> None:
+        await self._call("events.delete")
+        self._delete(calendar_id, event_id)
+
+    async def freebusy(
+        self,
+        time_min: str,
+        time_max: str,
+        calendar_ids: List[str],
+        time_zone: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        await self._call("freebusy.query")
+        start, end = parse_api_time(time_min, time_zone), parse_api_time(time_max, time_zone)
+        calendars = {}
+        for calendar_id in calendar_ids:
+            blocks = []
+            for event in self.store.overlapping(calendar_id, start.timestamp(), end.timestamp()):
+                if event.get("transparency") == "transparent":
+                    continue
+                block_start, block_end = event_range(event, self.time_zone)
+                blocks.append((max(block_start, start), min(block_end, end)))
+            calendars[calendar_id] = {
+                "busy": [{"start": _format_utc(s), "end": _format_utc(e)} for s, e in merge_intervals(blocks)]
+            }
+        return {"kind": "calendar#freeBusy", "timeMin": time_min, "timeMax": time_max, "calendars": calendars}
+
+    async def get_calendar(self, calendar_id: str) -> Dict[str, Any]:
+        await self._call("calendars.get")
+        return {"kind": "calendar#calendar", "id": calendar_id, "summary": f"{calendar_id} (fake)", "timeZone": self.time_zone}
+
+    async def watch_events(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        await self._call("events.watch")
+        ttl = int(body.get("params", {}).get("ttl", 604800))
+        return {"kind": "api#channel", "id": body["id"], "resourceId": f"fake-{calendar_id}",
+                "expiration": str(int((time.time() + ttl) * 1000))}
+
+    async def stop_channel(self, channel_id: str, resource_id: str) -> None:
+        await self._call("channels.stop")
+
+    async def batch(self, operations: List[BatchOperation]) -> List[BatchResult]:
+        await self._call("batch")
+        results = []
+        for operation in operations:
+            try:
+                if operation.method == "insert":
+                    response = self._insert(operation.calendar_id, operation.body)
+                elif operation.method == "delete":
+                    self._delete(operation.calendar_id, operation.event_id)
+                    response = {}
+                else:
+                    response = self._get(operation.calendar_id, operation.event_id)
+                results.append(BatchResult(operation, response=response))
+            except CalendarAPIError as e:
+                results.append(BatchResult(operation, error=e))
+        return results
+
+    def notify_changed(self, calendar_id: str) -> None:
+        """외부 변경 알림 (저장소가 곧 원본이므로 할 일 없음)"""
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "fake" if isinstance(self.store, MemoryEventStore) else "sqlite",
+            "events": self.store.count(),
+            "requests": self._requests,
+            "calls": dict(self._calls),
+            "injected_errors": self._injected_errors,
+            "latency_ms": self.latency * 1000,
+            "error_rate": self.error_rate,
+        }
@@ -0,0 +1,186 @@
+"""
+빈 시간 계산
+------------
+freebusy 한 번으로 여러 날짜, 여러 캘린더의 빈 시간을 계산합니다.
+
+1. 모든 캘린더의 바쁜 구간을 (앞뒤 buffer 만큼 늘려서) 시작 시간 순으로 합칩니다.
+2. 날짜별 근무 시간 창(예: 09:00~19:00, 캘린더 시간대 기준)을 차례로 훑으며
+   합친 구간 사이의 빈틈 중 min_duration 이상인 것만 남깁니다.
+
+날짜와 바쁜 구간이 모두 정렬돼 있어서 전체 계산은 O(B log B + D) 입니다. (B = 바쁜 구간 수, D = 날짜 수)
+시간 경계는 zoneinfo 로 만들기 때문에 서머타임이 있는 시간대에서도 정확합니다.
+
+여러 사람의 공통 빈 시간(find_common_slots)도 같은 계산입니다.
+"누군가 한 명이라도 바쁜 구간" 을 합친 뒤 남는 빈틈이 곧 모두가 비어 있는 시간입니다.
+freebusy 의 캘린더별 busy 목록은 이미 정렬돼 있어서 정렬은 사실상 C 개 목록 병합(O(B log C))으로 끝납니다.
+
+환경 변수: WORKING_HOURS_START=09:00, WORKING_HOURS_END=19:00,
+          CALENDAR_MIN_SLOT_MINUTES=0, CALENDAR_SLOT_BUFFER_MINUTES=0,
+          CALENDAR_COMMON_SLOT_LIMIT=5
+"""
+
+import os
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from calendar_core.event_cache import parse_api_time
+
+Interval = Tuple[datetime, datetime]
+
+DEFAULT_WORK_START = time.fromisoformat(os.getenv("WORKING_HOURS_START", "09:00"))
+DEFAULT_WORK_END = time.fromisoformat(os.getenv("WORKING_HOURS_END", "19:00"))
+DEFAULT_MIN_DURATION = timedelta(minutes=int(os.getenv("CALENDAR_MIN_SLOT_MINUTES", "0")))
+DEFAULT_BUFFER = timedelta(minutes=int(os.getenv("CALENDAR_SLOT_BUFFER_MINUTES", "0")))
+DEFAULT_COMMON_SLOT_LIMIT = int(os.getenv("CALENDAR_COMMON_SLOT_LIMIT", "5"))
+MAX_FREEBUSY_ITEMS = 50  # freebusy 한 번에 조회할 수 있는 캘린더 수
+MAX_COMMON_SLOT_DAYS = 62  # 공통 빈 시간을 찾는 최대 기간(일), freebusy 한 번으로 조회
+KOREAN_WEEKDAYS = "월화수목금토일"
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """겹치거나 맞닿은 구간을 합쳐 시작 시간 순으로 돌려줍니다."""
+    merged: List[List[datetime]] = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+
+def compute_free_slots(
+    busy: Iterable[Interval],
+    start_date: date,
+    days: int,
+    tz: ZoneInfo,
+    work_start: time = DEFAULT_WORK_START,
+    work_end: time = DEFAULT_WORK_END,
+    min_duration: timedelta = DEFAULT_MIN_DURATION,
+    buffer: timedelta = DEFAULT_BUFFER,
+) -> List[Tuple[date, List[Interval]]]:
+    """날짜별 빈 시간 목록 [(날짜, [(시작, 끝), ...]), ...]"""
+    blocks = merge_intervals((start - buffer, end + buffer) for start, end in busy)
+    result = []
+    first = 0
+    for offset in range(days):
+        day = start_date + timedelta(days=offset)
+        window_start = datetime.combine(day, work_start, tzinfo=tz)
+        window_end = datetime.combine(day, work_end, tzinfo=tz)
+        # 이 날 근무 시간 전에 끝난 구간은 다음 날에도 필요 없습니다.
+        while first < len(blocks) and blocks[first][1] <= window_start:
+            first += 1
+        slots = []
+        cursor = window_start
+        index = first
+        while index < len(blocks) and blocks[index][0] < window_end:
+            block_start, block_end = blocks[index]
+            if block_start > cursor and block_start - cursor >= min_duration:
+                slots.append((cursor, block_start))
+            cursor = max(cursor, block_end)
+            index += 1
+        if window_end > cursor and window_end - cursor >= min_duration:
+            slots.append((cursor, window_end))
+        result.append((day, slots))
+    return result
+
+
+def collect_busy(response: Dict[str, Any], calendar_ids: Iterable[str]) -> Tuple[Dict[str, List[Interval]], Dict[str, str]]:
+    """freebusy 응답에서 캘린더별 바쁜 구간과 조회 실패 사유를 꺼냅니다."""
+    busy: Dict[str, List[Interval]] = {}
+    errors: Dict[str, str] = {}
+    calendars = response.get("calendars", {})
+    for calendar_id in calendar_ids:
+        entry = calendars.get(calendar_id, {})
+        if entry.get("errors"):
+            errors[calendar_id] = entry["errors"][0].get("reason", "unknown")
+            continue
+        busy[calendar_id] = [
+            (parse_api_time(block["start"]), parse_api_time(block["end"])) for block in entry.get("busy", [])
+        ]
+    return busy, errors
+
+
+async def find_free_slots(
+    client: Any,
+    calendar_ids: List[str],
+    start_date: date,
+    days: int = 1,
+    time_zone: str = "Asia/Seoul",
+    work_start: time = DEFAULT_WORK_START,
+    work_end: time = DEFAULT_WORK_END,
+    min_duration: timedelta = DEFAULT_MIN_DURATION,
+    buffer: timedelta = DEFAULT_BUFFER,
+) -> List[Tuple[date, List[Interval]]]:
+    """freebusy 한 번으로 여러 날짜/캘린더의 빈 시간을 계산합니다."""
+    tz = ZoneInfo(time_zone)
+    time_min = datetime.combine(start_date, work_start, tzinfo=tz)
+    time_max = datetime.combine(start_date + timedelta(days=days - 1), work_end, tzinfo=tz)
+    response = await client.freebusy(time_min.isoformat(), time_max.isoformat(), calendar_ids, time_zone=time_zone)
+    busy, errors = collect_busy(response, calendar_ids)
+    if errors:
+        raise ValueError("캘린더를 조회할 수 없습니다: " + ", ".join(f"{cid}({reason})" for cid, reason in errors.items()))
+    all_busy = [block for blocks in busy.values() for block in blocks]
+    return compute_free_slots(all_busy, start_date, days, tz, work_start, work_end, min_duration, buffer)
+
+
+def earliest_slots(
+    free_days: List[Tuple[date, List[Interval]]],
+    limit: int,
+    not_before: Optional[datetime] = None,
+    min_duration: timedelta = DEFAULT_MIN_DURATION,
+) -> List[Interval]:
+    """날짜별 빈 시간에서 가장 이른 limit 개 (not_before 이전 부분은 잘라 냅니다)"""
+    found: List[Interval] = []
+    for _, slots in free_days:
+        for start, end in slots:
+            if not_before is not None and start < not_before:
+                start = not_before
+                if end <= start or end - start < min_duration:
+                    continue
+            found.append((start, end))
+            if len(found) >= limit:
+                return found
+    return found
+
+
+async def find_common_slots(
+    client: Any,
+    calendar_ids: List[str],
+    start_date: date,
+    days: int = 7,
+    time_zone: str = "Asia/Seoul",
+    limit: int = DEFAULT_COMMON_SLOT_LIMIT,
+    min_duration: timedelta = DEFAULT_MIN_DURATION,
+    work_start: time = DEFAULT_WORK_START,
+    work_end: time = DEFAULT_WORK_END,
+    buffer: timedelta = DEFAULT_BUFFER,
+) -> List[Interval]:
+    """모든 캘린더가 비어 있는 시간 중 가장 이른 limit 개 (freebusy 한 번)"""
+    calendar_ids = list(dict.fromkeys(calendar_ids))
+    if not calendar_ids:
+        raise ValueError("조회할 캘린더를 하나 이상 입력해 주세요.")
+    if len(calendar_ids) > MAX_FREEBUSY_ITEMS:
+        raise ValueError(f"한 번에 최대 {MAX_FREEBUSY_ITEMS}개 캘린더까지 조회할 수 있습니다.")
+    if not 1 <= days <= MAX_COMMON_SLOT_DAYS:
+        raise ValueError(f"조회 기간은 1~{MAX_COMMON_SLOT_DAYS}일이어야 합니다.")
+    free_days = await find_free_slots(
+        client, calendar_ids, start_date, days, time_zone, work_start, work_end, min_duration, buffer
+    )
+    # 오늘 이미 지나간 시간은 제외합니다.
+    return earliest_slots(free_days, limit, datetime.now(ZoneInfo(time_zone)), min_duration)
+
+
+def format_slot(start: datetime, end: datetime, tz: Optional[ZoneInfo] = None, sep: str = "~") -> str:
+    """'HH:MM~HH:MM' (tz 를 주면 그 시간대로 변환해서 표시)"""
+    if tz is not None:
+        start, end = start.astimezone(tz), end.astimezone(tz)
+    return "{}{}{}".format(start.strftime("%H:%M"), sep, end.strftime("%H:%M"))
+
+
+def format_day(day: date) -> str:
+    """'10/17 (금)'"""
+    return "{} ({})".format(day.strftime("%m/%d"), KOREAN_WEEKDAYS[day.weekday()])
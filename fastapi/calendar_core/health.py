@@ -0,0 +1,165 @@
+"""
+준비 상태(readiness) / 생존(liveness) 확인
+----------------------------------------
+로드밸런서의 헬스체크가 올 때마다 Google 을 부르지 않도록, 백그라운드 작업이
+주기적으로 캘린더 연결을 확인하고 마지막 결과를 시각과 함께 저장해 둡니다.
+헬스체크 엔드포인트는 저장된 결과만 읽으므로 API 할당량을 쓰지 않고 바로 답합니다.
+
+- warmup  : 인증 정보 / 클라이언트 / 첫 동기화 같은 준비 작업. startup 훅을 막지 않고 백그라운드에서 실행합니다.
+            실패하면 CALENDAR_HEALTH_INTERVAL 초마다 다시 시도합니다. (인증 파일이 나중에 생기는 경우 등)
+- probe   : 캘린더 연결 확인 (calendars.get). warmup 이 끝난 뒤 CALENDAR_HEALTH_INTERVAL 초마다 실행합니다.
+
+  GET {prefix}/live   프로세스(이벤트 루프)가 살아 있으면 항상 200
+  GET {prefix}/ready  warmup 이 성공했고 마지막 연결 확인도 성공했으면 200, 아니면 503
+
+사용 예:
+    health = HealthMonitor(warmup, probe_calendar, report=startup_report)
+    install_health(app, health, prefix="/health")
+
+    @app.on_event("startup")
+    async def startup():
+        health.start()        # 기다리지 않음
+
+환경 변수:
+  CALENDAR_HEALTH_INTERVAL=30    연결 확인 주기(초)
+  CALENDAR_HEALTH_TIMEOUT=5      연결 확인 제한 시간(초)
+  CALENDAR_WARMUP_SYNC_TIMEOUT=10  warmup 에서 첫 동기화를 기다리는 최대 시간(초)
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = float(os.getenv("CALENDAR_HEALTH_INTERVAL", "30"))
+DEFAULT_TIMEOUT = float(os.getenv("CALENDAR_HEALTH_TIMEOUT", "5"))
+DEFAULT_SYNC_TIMEOUT = float(os.getenv("CALENDAR_WARMUP_SYNC_TIMEOUT", "10"))
+
+
+async def wait_synced(client: Any, timeout: float = DEFAULT_SYNC_TIMEOUT) -> bool:
+    """동기화 복제본을 쓰는 클라이언트면 첫 동기화(또는 디스크 복원)를 기다립니다."""
+    wait = getattr(client, "wait_synced", None)
+    return await wait(timeout) if wait is not None else True
+
+
+class HealthMonitor:
+    def __init__(
+        self,
+        warmup: Callable[[], Awaitable[None]],
+        probe: Callable[[], Awaitable[Dict[str, Any]]],
+        interval: float = DEFAULT_INTERVAL,
+        timeout: float = DEFAULT_TIMEOUT,
+        report: Optional[Any] = None,
+    ):
+        self.warmup = warmup
+        self.probe = probe
+        self.interval = interval
+        self.timeout = timeout
+        self.report = report
+        self.started_at = time.time()
+        self.warmed_up = False
+        self.warmup_error: Optional[str] = None
+        self.warmup_seconds: Optional[float] = None
+        self.last_check: Optional[Dict[str, Any]] = None
+        self._was_ready = False
+        self._checks = 0
+        self._failures = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.warmed_up and self.last_check is not None and self.last_check["ok"]
+
+    async def _warmup(self) -> None:
+        started = time.perf_counter()
+        try:
+            await self.warmup()
+        except Exception as e:
+            # 준비에 실패하면 ready 는 계속 false 이고, 다음 주기에 다시 시도합니다.
+            self.warmup_error = str(e)
+            logger.error("warmup 실패 (%.0f초 뒤 다시 시도): %s", self.interval, e)
+        else:
+            self.warmup_error = None
+            self.warmed_up = True
+        self.warmup_seconds = round(time.perf_counter() - started, 3)
+
+    async def check(self) -> Dict[str, Any]:
+        """연결을 한 번 확인하고 결과를 저장합니다."""
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"ok": False}
+        try:
+            calendar = await asyncio.wait_for(self.probe(), self.timeout)
+            result = {"ok": True, "calendar_name": calendar.get("summary")}
+        except asyncio.TimeoutError:
+            result["error"] = f"{self.timeout:.0f}초 안에 응답 없음"
+        except Exception as e:
+            result["error"] = str(e)
+        result["checked_at"] = datetime.now(timezone.utc).isoformat()
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self._checks += 1
+        previous_ok = self.last_check is not None and self.last_check["ok"]
+        if not result["ok"]:
+            self._failures += 1
+            if previous_ok or self.last_check is None:
+                logger.warning("캘린더 연결 확인 실패: %s", result["error"])
+        elif not previous_ok:
+            logger.info("캘린더 연결 확인 성공: %s (%.1fms)", result["calendar_name"], result["latency_ms"])
+        self.last_check = result
+        if self.ready and not self._was_ready:
+            self._was_ready = True
+            if self.report is not None:
+                self.report.mark("ready")
+        return result
+
+    async def _run(self) -> None:
+        while True:
+            if not self.warmed_up:
+                await self._warmup()
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """warmup 과 주기적 확인을 백그라운드에서 시작합니다. (바로 돌아옴)"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def liveness(self) -> Dict[str, Any]:
+        return {"status": "alive", "uptime_seconds": round(time.time() - self.started_at, 1)}
+
+    def readiness(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "not_ready",
+            "warmed_up": self.warmed_up,
+            "warmup_seconds": self.warmup_seconds,
+            "warmup_error": self.warmup_error,
+            "calendar": self.last_check,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.readiness(), "checks": self._checks, "failures": self._failures, "interval_seconds": self.interval}
+
+
+def install_health(app: Any, monitor: HealthMonitor, prefix: str = "/health") -> None:
+    """GET {prefix}/live, {prefix}/ready 를 붙입니다."""
+    from fastapi.responses import JSONResponse
+
+    @app.get(f"{prefix}/live", include_in_schema=False)
+    async def liveness():
+        return monitor.liveness()
+
+    @app.get(f"{prefix}/ready", include_in_schema=False)
+    async def readiness():
+        return JSONResponse(monitor.readiness(), status_code=200 if monitor.ready else 503)
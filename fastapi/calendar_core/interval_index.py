@@ -0,0 +1,155 @@
+"""
+구간 인덱스 (interval tree)
+---------------------------
+"[start, end) 와 겹치는 일정은?" 을 전체 일정을 훑지 않고 O(log n + k) 에 답합니다.
+(k = 겹치는 일정 수)
+
+시작 시간 순으로 정렬된 treap 에 "서브트리 안에서 가장 늦게 끝나는 시간(max_end)" 을 함께 저장해서,
+조회 구간보다 먼저 끝나는 서브트리와 조회 구간 뒤에 시작하는 서브트리는 아예 내려가지 않습니다.
+결과는 시작 시간 순이므로 orderBy=startTime 과 같습니다.
+
+사용 예:
+    index = IntervalIndex()
+    index.add("event-id", start_dt, end_dt, event)
+    index.overlapping(range_start, range_end)  # -> [event, ...]
+"""
+
+import random
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class _Node:
+    __slots__ = ("start", "end", "key", "value", "priority", "left", "right", "max_end")
+
+    def __init__(self, start: Any, end: Any, key: Hashable, value: Any):
+        self.start = start
+        self.end = end
+        self.key = key
+        self.value = value
+        self.priority = random.random()
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+        self.max_end = end
+
+
+def _update(node: _Node) -> None:
+    max_end = node.end
+    if node.left is not None and node.left.max_end > max_end:
+        max_end = node.left.max_end
+    if node.right is not None and node.right.max_end > max_end:
+        max_end = node.right.max_end
+    node.max_end = max_end
+
+
+def _rotate_right(node: _Node) -> _Node:
+    top = node.left
+    node.left = top.right
+    top.right = node
+    _update(node)
+    _update(top)
+    return top
+
+
+def _rotate_left(node: _Node) -> _Node:
+    top = node.right
+    node.right = top.left
+    top.left = node
+    _update(node)
+    _update(top)
+    return top
+
+
+def _insert(node: Optional[_Node], new: _Node) -> _Node:
+    if node is None:
+        return new
+    if (new.start, new.key) < (node.start, node.key):
+        node.left = _insert(node.left, new)
+        if node.left.priority > node.priority:
+            return _rotate_right(node)
+    else:
+        node.right = _insert(node.right, new)
+        if node.right.priority > node.priority:
+            return _rotate_left(node)
+    _update(node)
+    return node
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _delete(node: Optional[_Node], sort_key: Tuple[Any, Hashable]) -> Optional[_Node]:
+    if node is None:
+        return None
+    node_key = (node.start, node.key)
+    if sort_key < node_key:
+        node.left = _delete(node.left, sort_key)
+    elif node_key < sort_key:
+        node.right = _delete(node.right, sort_key)
+    else:
+        return _merge(node.left, node.right)
+    _update(node)
+    return node
+
+
+def _collect(node: Optional[_Node], start: Any, end: Any, found: List[Any]) -> None:
+    while node is not None:
+        # 이 서브트리에서 가장 늦게 끝나는 일정도 start 전에 끝나면 볼 필요가 없습니다.
+        if start is not None and node.max_end <= start:
+            return
+        _collect(node.left, start, end, found)
+        # 이 노드와 오른쪽 서브트리는 모두 end 이후에 시작합니다.
+        if end is not None and node.start >= end:
+            return
+        if start is None or node.end > start:
+            found.append(node.value)
+        node = node.right
+
+
+class IntervalIndex:
+    """추가/삭제 O(log n), 겹침 조회 O(log n + k) 인 구간 인덱스"""
+
+    def __init__(self):
+        self._root: Optional[_Node] = None
+        self._spans: Dict[Hashable, Tuple[Any, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._spans)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._spans
+
+    def add(self, key: Hashable, start: Any, end: Any, value: Any = None) -> None:
+        """같은 key 가 이미 있으면 교체합니다."""
+        if key in self._spans:
+            self.remove(key)
+        self._spans[key] = (start, end)
+        self._root = _insert(self._root, _Node(start, end, key, key if value is None else value))
+
+    def remove(self, key: Hashable) -> None:
+        span = self._spans.pop(key, None)
+        if span is not None:
+            self._root = _delete(self._root, (span[0], key))
+
+    def span(self, key: Hashable) -> Optional[Tuple[Any, Any]]:
+        return self._spans.get(key)
+
+    def clear(self) -> None:
+        self._root = None
+        self._spans.clear()
+
+    def overlapping(self, start: Any = None, end: Any = None) -> List[Any]:
+        """[start, end) 와 겹치는 항목 (시작 시간 순). None 이면 그쪽 끝은 제한 없음."""
+        found: List[Any] = []
+        _collect(self._root, start, end, found)
+        return found
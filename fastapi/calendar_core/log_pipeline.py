@@ -0,0 +1,218 @@
+"""
+비동기 로그 파이프라인
+---------------------
+요청 처리 중에는 로그 레코드를 큐에 넣기만 하고, 포맷과 파일/콘솔 쓰기는 백그라운드 스레드
+(logging.handlers.QueueListener) 가 합니다. 디스크가 느려도 답장이 늦어지지 않습니다.
+
+- 파일은 한 줄에 JSON 하나 (ts, level, logger, msg + extra 로 넘긴 필드)
+- 파일 크기(size) 또는 시간(time) 기준 회전, 백업 개수 제한으로 로그 용량이 일정하게 유지됩니다.
+- 큐가 가득 차면 기다리지 않고 버리고 개수만 셉니다.
+- "명령어 수신" 처럼 양이 많은 줄은 extra={"sampled": True} 로 표시해 두면
+  CALENDAR_LOG_SAMPLE 의 레벨별 비율만큼만 남깁니다. (표시하지 않은 줄은 항상 남김)
+
+사용 예:
+    log_pipeline = setup_logging("calendar_server.log")
+    logger.info("명령어 수신 - 방: %s", room, extra={"sampled": True, "room": room})
+
+환경 변수:
+  CALENDAR_LOG_LEVEL=INFO
+  CALENDAR_LOG_ROTATE=size          size | time
+  CALENDAR_LOG_MAX_BYTES=10485760   size 회전 기준 (10MB)
+  CALENDAR_LOG_WHEN=midnight        time 회전 기준 (TimedRotatingFileHandler 의 when)
+  CALENDAR_LOG_BACKUPS=5
+  CALENDAR_LOG_SAMPLE=INFO=0.1      sampled 표시된 줄을 남길 비율 (예: DEBUG=0.01,INFO=0.1)
+  CALENDAR_LOG_QUEUE_SIZE=10000
+  CALENDAR_LOG_CONSOLE=1            콘솔(stderr)에도 텍스트로 출력
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from calendar_core.tracing import current_trace_id
+
+DEFAULT_LEVEL = os.getenv("CALENDAR_LOG_LEVEL", "INFO")
+DEFAULT_ROTATE = os.getenv("CALENDAR_LOG_ROTATE", "size")
+DEFAULT_MAX_BYTES = int(os.getenv("CALENDAR_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+DEFAULT_WHEN = os.getenv("CALENDAR_LOG_WHEN", "midnight")
+DEFAULT_BACKUPS = int(os.getenv("CALENDAR_LOG_BACKUPS", "5"))
+DEFAULT_SAMPLE = os.getenv("CALENDAR_LOG_SAMPLE", "INFO=0.1")
+DEFAULT_QUEUE_SIZE = int(os.getenv("CALENDAR_LOG_QUEUE_SIZE", "10000"))
+DEFAULT_CONSOLE = os.getenv("CALENDAR_LOG_CONSOLE", "1") == "1"
+CONSOLE_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# LogRecord 가 원래 갖고 있는 속성 (이 밖의 속성은 extra 로 넘긴 필드)
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "sampled"}
+
+
+def parse_sample_rates(spec: str) -> Dict[int, float]:
+    """"DEBUG=0.01,INFO=0.1" → {10: 0.01, 20: 0.1}"""
+    rates: Dict[int, float] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rate = item.partition("=")
+        level = logging.getLevelName(name.strip().upper())
+        if not isinstance(level, int):
+            raise ValueError(f"알 수 없는 로그 레벨입니다: {name}")
+        rates[level] = float(rate)
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                data[key] = value
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """sampled 표시가 있는 레코드만 레벨별 비율로 남깁니다."""
+
+    def __init__(self, rates: Dict[int, float]):
+        super().__init__()
+        self.rates = rates
+        self.dropped = 0
+        self._random = random.Random()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False):
+            return True
+        rate = self.rates.get(record.levelno)
+        if rate is None or self._random.random() < rate:
+            record.sample_rate = rate if rate is not None else 1.0
+            return True
+        self.dropped += 1
+        return False
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버리는 QueueHandler"""
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지 조립(% 치환)만 여기서 하고, JSON 포맷은 백그라운드 스레드에서 합니다.
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        # 추적 중인 요청이면 traces.jsonl 과 맞춰 볼 수 있게 trace_id 를 붙입니다.
+        trace_id = current_trace_id()
+        if trace_id is not None:
+            record.trace_id = trace_id
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _file_handler(path: str, rotate: str, max_bytes: int, when: str, backups: int) -> logging.Handler:
+    if rotate == "time":
+        return logging.handlers.TimedRotatingFileHandler(path, when=when, backupCount=backups, encoding="utf-8")
+    if rotate == "size":
+        return logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+    raise ValueError(f"지원하지 않는 CALENDAR_LOG_ROTATE 입니다: {rotate}")
+
+
+class LogPipeline:
+    def __init__(
+        self,
+        log_file: Optional[str],
+        level: str = DEFAULT_LEVEL,
+        rotate: str = DEFAULT_ROTATE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        when: str = DEFAULT_WHEN,
+        backups: int = DEFAULT_BACKUPS,
+        sample: str = DEFAULT_SAMPLE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        console: bool = DEFAULT_CONSOLE,
+    ):
+        self.log_file = log_file
+        self.level = level.upper()
+        handlers = []
+        if log_file:
+            file_handler = _file_handler(log_file, rotate, max_bytes, when, backups)
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            handlers.append(console_handler)
+        self.queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=queue_size)
+        self.handler = _QueueHandler(self.queue)
+        self.sampler = SamplingFilter(parse_sample_rates(sample))
+        self.handler.addFilter(self.sampler)
+        self.listener = logging.handlers.QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self._started = False
+
+    def start(self) -> "LogPipeline":
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(self.level)
+        self.listener.start()
+        self._started = True
+        atexit.register(self.stop)
+        return self
+
+    def stop(self) -> None:
+        """남은 레코드를 모두 쓰고 파일을 닫습니다."""
+        if not self._started:
+            return
+        self._started = False
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "file": self.log_file,
+            "level": self.level,
+            "queued": self.queue.qsize(),
+            "dropped_queue_full": self.handler.dropped,
+            "dropped_sampling": self.sampler.dropped,
+            "sample_rates": {logging.getLevelName(level): rate for level, rate in self.sampler.rates.items()},
+        }
+
+
+_pipeline: Optional[LogPipeline] = None
+
+
+def setup_logging(log_file: Optional[str] = None, **options: Any) -> LogPipeline:
+    """루트 로거를 큐 기반 파이프라인으로 바꿉니다.
+
+    프로세스에서 처음 한 번만 설정하고, 두 번째부터는 인자를 무시하고 기존 파이프라인을 돌려줍니다.
+    (다른 파일 이름을 넘겼으면 기존 파일을 계속 쓴다고 로그를 한 줄 남김)
+    """
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = LogPipeline(log_file, **options).start()
+    elif log_file != _pipeline.log_file:
+        logging.getLogger(__name__).info(
+            "로그 파이프라인이 이미 설정되어 있어 %s 대신 기존 파일(%s)에 씁니다.", log_file, _pipeline.log_file
+        )
+    return _pipeline
@@ -0,0 +1,312 @@
+"""
+Prometheus 지표
+---------------
+GET /metrics 로 Prometheus 텍스트 형식(0.0.4) 지표를 내보냅니다. 외부 라이브러리는 쓰지 않습니다.
+
+지표:
+  calendar_command_requests_total{router,command,outcome}  명령어별 요청 수 (명령어가 아닌 잡담은 command="none")
+  calendar_command_duration_seconds{router,command}        명령어 처리 시간 히스토그램
+      router 는 CommandRouter 이름 (webhook / service / oauth) - 여러 서버가 한 프로세스에 있어도 섞이지 않음
+  calendar_api_calls_total{method,status}                  Google API 호출 수 (상태 코드/오류별)
+  calendar_api_call_duration_seconds{method}               Google API 호출 시간 히스토그램
+  calendar_http_requests_in_flight                         처리 중인 HTTP 요청 수
+  calendar_cache_*, calendar_executor_*, calendar_client_in_flight
+                                                           클라이언트 stats() 에서 읽어 오는 값 (수집할 때만 계산)
+
+카운터/히스토그램은 스레드마다 따로 쌓고(threading.local) /metrics 요청 때만 합칩니다.
+그래서 기록하는 쪽은 잠금 없이 딕셔너리 갱신 한 번이면 끝나고,
+threads 모드의 작업 스레드에서 기록해도 서로 기다리지 않습니다.
+
+환경 변수:
+  CALENDAR_METRICS_ENABLED=1   0 이면 /metrics 와 Google 호출 계측을 붙이지 않습니다.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from calendar_core.async_client import CalendarAPIError
+from calendar_core.batch import BatchOperation, BatchResult
+
+METRICS_ENABLED = os.getenv("CALENDAR_METRICS_ENABLED", "1") == "1"
+METRICS_PATH = "/metrics"
+CONTENT_TYPE = "text/plain; version=0.0.4"  # charset 은 PlainTextResponse 가 붙입니다.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[Any, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class _Sharded:
+    """스레드별 {레이블 값: 값} 저장소"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Dict[Tuple[Any, ...], Any]] = []
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict[Tuple[Any, ...], Any]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard: Dict[Tuple[Any, ...], Any] = {}
+            self._local.shard = shard
+            with self._lock:  # 스레드마다 처음 한 번만
+                self._shards.append(shard)
+            return shard
+
+    def _snapshots(self) -> List[Dict[Tuple[Any, ...], Any]]:
+        with self._lock:
+            shards = list(self._shards)
+        return [dict(shard) for shard in shards]
+
+
+class Counter(_Sharded):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = ()):
+        super().__init__()
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+
+    def inc(self, *label_values: Any, amount: float = 1) -> None:
+        shard = self._shard()
+        shard[label_values] = shard.get(label_values, 0) + amount
+
+    def values(self) -> Dict[Tuple[Any, ...], float]:
+        totals: Dict[Tuple[Any, ...], float] = {}
+        for shard in self._snapshots():
+            for key, value in shard.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_labels(self.label_names, key)} {_number(value)}"
+            for key, value in sorted(self.values().items())
+        ]
+
+
+class Gauge(Counter):
+    """올리고 내릴 수 있는 값 (스레드별 증감을 합산)"""
+
+    kind = "gauge"
+
+    def dec(self, *label_values: Any, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(_Sharded):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str] = (), buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__()
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *label_values: Any) -> None:
+        shard = self._shard()
+        slots = shard.get(label_values)
+        if slots is None:
+            # [버킷별 개수..., +Inf 개수, 합계, 전체 개수]
+            slots = shard[label_values] = [0] * (len(self.buckets) + 3)
+        slots[bisect_left(self.buckets, value)] += 1
+        slots[-2] += value
+        slots[-1] += 1
+
+    def render(self) -> List[str]:
+        merged: Dict[Tuple[Any, ...], List[float]] = {}
+        for shard in self._snapshots():
+            for key, slots in shard.items():
+                total = merged.setdefault(key, [0] * len(slots))
+                for index, value in enumerate(slots):
+                    total[index] += value
+        lines = []
+        for key, slots in sorted(merged.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), slots):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                bucket_labels = _labels(self.label_names, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {_number(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {_number(slots[-2])}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, key)} {_number(slots[-1])}")
+        return lines
+
+
+COMMAND_REQUESTS = Counter(
+    "calendar_command_requests_total", "메신저 명령어 요청 수", ("router", "command", "outcome")
+)
+COMMAND_DURATION = Histogram(
+    "calendar_command_duration_seconds", "메신저 명령어 처리 시간", ("router", "command")
+)
+API_CALLS = Counter(
+    "calendar_api_calls_total", "Google Calendar API 호출 수", ("method", "status")
+)
+API_DURATION = Histogram(
+    "calendar_api_call_duration_seconds", "Google Calendar API 호출 시간", ("method",)
+)
+HTTP_IN_FLIGHT = Gauge("calendar_http_requests_in_flight", "처리 중인 HTTP 요청 수")
+
+METRICS = (COMMAND_REQUESTS, COMMAND_DURATION, API_CALLS, API_DURATION, HTTP_IN_FLIGHT)
+
+
+def _find(stats: Dict[str, Any], key: str) -> Optional[Dict[str, Any]]:
+    """중첩된 stats() 결과에서 key 항목을 찾습니다. (래퍼마다 감싸는 위치가 달라서)"""
+    if isinstance(stats.get(key), dict):
+        return stats[key]
+    for value in stats.values():
+        if isinstance(value, dict):
+            found = _find(value, key)
+            if found is not None:
+                return found
+    return None
+
+
+def _client_lines(client: Any) -> List[str]:
+    """캐시 적중률, 실행기 대기열 길이 등 클라이언트 상태 (수집 시점 값)"""
+    stats = client.stats()
+    samples: List[Tuple[str, str, str, Any]] = []
+    cache = _find(stats, "cache")
+    if cache:
+        samples += [
+            ("calendar_cache_hits_total", "counter", "일정 조회 캐시 적중 수", cache["hits"]),
+            ("calendar_cache_misses_total", "counter", "일정 조회 캐시 미스 수", cache["misses"]),
+            ("calendar_cache_hit_ratio", "gauge", "일정 조회 캐시 적중률", cache["hit_ratio"]),
+            ("calendar_cache_entries", "gauge", "캐시 항목 수", cache["entries"]),
+        ]
+    executor = _find(stats, "executor")
+    if executor:
+        samples += [
+            ("calendar_executor_queue_depth", "gauge", "실행기 대기열 길이", executor["queue_depth"]),
+            ("calendar_executor_active", "gauge", "실행 중인 작업 수", executor["active"]),
+            ("calendar_executor_rejected_total", "counter", "대기열이 가득 차서 거절한 작업 수", executor["rejected"]),
+        ]
+    if "in_flight" in stats:
+        samples.append(("calendar_client_in_flight", "gauge", "Google 로 보낸 뒤 응답을 기다리는 요청 수", stats["in_flight"]))
+    lines = []
+    for name, kind, help_text, value in samples:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {_number(value)}"]
+    return lines
+
+
+def render_metrics(client: Optional[Any] = None) -> str:
+    lines: List[str] = []
+    for metric in METRICS:
+        lines += [f"# HELP {metric.name} {metric.help}", f"# TYPE {metric.name} {metric.kind}"]
+        lines += metric.render()
+    if client is not None:
+        lines += _client_lines(client)
+    return "\n".join(lines) + "\n"
+
+
+class MeteredCalendarClient:
+    """Google 으로 나가는 호출마다 횟수/시간/상태 코드를 기록하는 래퍼 (캐시보다 안쪽에 둡니다)"""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def _metered(self, method: str, call: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        status = "200"
+        try:
+            return await call()
+        except CalendarAPIError as e:
+            status = str(e.status)
+            raise
+        except Exception as e:
+            status = type(e).__name__
+            raise
+        finally:
+            API_DURATION.observe(time.perf_counter() - started, method)
+            API_CALLS.inc(method, status)
+
+    async def start(self) -> None:
+        await self.client.start()
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    async def list_events(self, calendar_id: str, **kwargs: Any) -> Dict[str, Any]:
+        return await self._metered("events.list", lambda: self.client.list_events(calendar_id, **kwargs))
+
+    async def insert_event(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._metered("events.insert", lambda: self.client.insert_event(calendar_id, body))
+
+    async def delete_event(self, calendar_id: str, event_id: str) -> None:
+        await self._metered("events.delete", lambda: self.client.delete_event(calendar_id, event_id))
+
+    async def freebusy(self, time_min: str, time_max: str, calendar_ids: List[str], time_zone: Optional[str] = None) -> Dict[str, Any]:
+        return await self._metered(
+            "freebusy.query", lambda: self.client.freebusy(time_min, time_max, calendar_ids, time_zone)
+        )
+
+    async def get_calendar(self, calendar_id: str) -> Dict[str, Any]:
+        return await self._metered("calendars.get", lambda: self.client.get_calendar(calendar_id))
+
+    async def watch_events(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._metered("events.watch", lambda: self.client.watch_events(calendar_id, body))
+
+    async def stop_channel(self, channel_id: str, resource_id: str) -> None:
+        await self._metered("channels.stop", lambda: self.client.stop_channel(channel_id, resource_id))
+
+    async def batch(self, operations: List[BatchOperation]) -> List[BatchResult]:
+        results = await self._metered("batch", lambda: self.client.batch(operations))
+        # 배치 안의 개별 작업도 메서드별로 셉니다. (시간은 배치 전체에만 기록)
+        for result in results:
+            status = "200" if result.ok else str(getattr(result.error, "status", type(result.error).__name__))
+            API_CALLS.inc(f"batch.{result.operation.method}", status)
+        return results
+
+    def notify_changed(self, calendar_id: str) -> None:
+        self.client.notify_changed(calendar_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.client.stats()
+
+
+class InFlightMiddleware:
+    """처리 중인 HTTP 요청 수를 세는 ASGI 미들웨어"""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"] == METRICS_PATH:
+            await self.app(scope, receive, send)
+            return
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+
+
+def install_metrics(app: Any, client: Any, enabled: bool = METRICS_ENABLED) -> None:
+    """GET /metrics 와 처리 중 요청 수 미들웨어를 붙입니다."""
+    if not enabled:
+        return
+    from fastapi.responses import PlainTextResponse
+
+    async def metrics_endpoint() -> PlainTextResponse:
+        return PlainTextResponse(render_metrics(client), media_type=CONTENT_TYPE)
+
+    app.add_middleware(InFlightMiddleware)
+    app.add_api_route(METRICS_PATH, metrics_endpoint, methods=["GET"], include_in_schema=False)
@@ -0,0 +1,138 @@
+"""
+캘린더 복제본 디스크 저장소
+--------------------------
+CalendarMirror(sync.py) 의 일정과 마지막 syncToken 을 SQLite 파일에 남겨 두는 저장소입니다.
+uvicorn 을 다시 띄우거나 reload 로 재시작해도 시작하자마자 파일에서 복제본을 되살려
+조회/빈시간 요청을 로컬에서 답하고, 전체 목록을 다시 받는 대신 저장된 syncToken 으로
+변경분만 이어서 동기화합니다. (토큰이 만료됐으면 410 → 평소처럼 전체 동기화)
+
+- mirror_events : (calendar_id, id) 기본 키 + (calendar_id, start_ts) / (calendar_id, end_ts) 인덱스
+                  시간 구간 조회와 동기화 창 밖의 오래된 일정 정리에 씁니다.
+- mirror_state  : 캘린더별 syncToken, 시간대, 동기화 창 시작, 마지막 동기화 시각
+
+쓰기는 동기화 주기마다 바뀐 일정만 모아서 한 트랜잭션으로, 이벤트 루프 밖(스레드)에서 합니다.
+
+환경 변수:
+  CALENDAR_MIRROR_DB=calendar_mirror.db   비워 두면 디스크에 남기지 않음 (fake 모드에서는 항상 끔)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_MIRROR_DB = os.getenv("CALENDAR_MIRROR_DB", "calendar_mirror.db")
+
+# 일정 하나의 변경: (id, 일정 본문과 [start_ts, end_ts) 또는 삭제면 None)
+EventRow = Tuple[str, Optional[Tuple[Dict[str, Any], float, float]]]
+
+
+class MirrorStore:
+    """여러 캘린더 복제본이 함께 쓰는 SQLite 파일"""
+
+    def __init__(self, path: str = DEFAULT_MIRROR_DB):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS mirror_events ("
+            " calendar_id TEXT NOT NULL, id TEXT NOT NULL,"
+            " start_ts REAL NOT NULL, end_ts REAL NOT NULL, body TEXT NOT NULL,"
+            " PRIMARY KEY (calendar_id, id))"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS mirror_events_start ON mirror_events (calendar_id, start_ts)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS mirror_events_end ON mirror_events (calendar_id, end_ts)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS mirror_state ("
+            " calendar_id TEXT PRIMARY KEY, sync_token TEXT, time_zone TEXT,"
+            " window_start REAL, synced_at REAL)"
+        )
+        self._writes = 0
+        self._rows_written = 0
+
+    def load_state(self, calendar_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT sync_token, time_zone, window_start, synced_at FROM mirror_state WHERE calendar_id = ?",
+                (calendar_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"sync_token": row[0], "time_zone": row[1], "window_start": row[2], "synced_at": row[3]}
+
+    def overlapping(self, calendar_id: str, start: Optional[float] = None, end: Optional[float] = None) -> List[Dict[str, Any]]:
+        """[start, end) 와 겹치는 일정, 시작 시간 순 (인덱스 사용)"""
+        query = "SELECT body FROM mirror_events WHERE calendar_id = ?"
+        params: List[Any] = [calendar_id]
+        if end is not None:
+            query += " AND start_ts < ?"
+            params.append(end)
+        if start is not None:
+            query += " AND end_ts > ?"
+            params.append(start)
+        with self._lock:
+            rows = self._db.execute(query + " ORDER BY start_ts, id", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def save(
+        self,
+        calendar_id: str,
+        rows: Iterable[EventRow],
+        state: Dict[str, Any],
+        replace: bool = False,
+    ) -> None:
+        """바뀐 일정과 동기화 상태를 한 트랜잭션으로 저장합니다. replace=True 면 (전체 동기화) 기존 일정을 먼저 지웁니다."""
+        upserts = []
+        deletes = []
+        for event_id, row in rows:
+            if row is None:
+                deletes.append((calendar_id, event_id))
+            else:
+                event, start, end = row
+                upserts.append((calendar_id, event_id, start, end, json.dumps(event, ensure_ascii=False)))
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                if replace:
+                    self._db.execute("DELETE FROM mirror_events WHERE calendar_id = ?", (calendar_id,))
+                elif state.get("window_start") is not None:
+                    # 동기화 창보다 먼저 끝난 일정은 다시 읽을 일이 없으므로 정리합니다.
+                    self._db.execute(
+                        "DELETE FROM mirror_events WHERE calendar_id = ? AND end_ts <= ?",
+                        (calendar_id, state["window_start"]),
+                    )
+                self._db.executemany("DELETE FROM mirror_events WHERE calendar_id = ? AND id = ?", deletes)
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO mirror_events (calendar_id, id, start_ts, end_ts, body) VALUES (?, ?, ?, ?, ?)",
+                    upserts,
+                )
+                self._db.execute(
+                    "INSERT OR REPLACE INTO mirror_state (calendar_id, sync_token, time_zone, window_start, synced_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (calendar_id, state.get("sync_token"), state.get("time_zone"),
+                     state.get("window_start"), state.get("synced_at")),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._writes += 1
+            self._rows_written += len(upserts) + len(deletes)
+
+    def forget(self, calendar_id: str) -> None:
+        """저장된 복제본을 지웁니다. (다음 시작 때 전체 동기화)"""
+        with self._lock:
+            self._db.execute("DELETE FROM mirror_events WHERE calendar_id = ?", (calendar_id,))
+            self._db.execute("DELETE FROM mirror_state WHERE calendar_id = ?", (calendar_id,))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            events = self._db.execute("SELECT COUNT(*) FROM mirror_events").fetchone()[0]
+        return {"path": self.path, "events": events, "writes": self._writes, "rows_written": self._rows_written}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
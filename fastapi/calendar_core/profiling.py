@@ -0,0 +1,256 @@
+"""
+요청 하나만 프로파일링
+---------------------
+주 단위 조회나 빈시간 계산처럼 실제 캘린더에서만 느려지는 요청을, uvicorn 을 다시 띄우지 않고
+운영 중인 서버에서 그대로 프로파일링하는 기능입니다.
+
+관리자 토큰을 X-Profile 헤더에 넣어 웹훅을 보내면 그 요청 하나만 통계적 샘플러로 실행하고,
+결과를 파일로 저장한 뒤 응답 헤더 X-Profile-Id 로 ID 를 돌려줍니다.
+
+  curl -X POST http://localhost:9000/calendar/webhook -H "X-Profile: $CALENDAR_ADMIN_TOKEN" \\
+       -H "Content-Type: application/json" -d '{"room":"r","sender":"s","message":"캘린더 조회 이번주"}' -i
+
+  GET /admin/profiles                (X-Admin-Token 필요) 저장된 프로파일 목록
+  GET /admin/profiles/{id}           요약 (자기 시간/누적 시간 상위 함수)
+  GET /admin/profiles/{id}/folded    flamegraph 입력 (folded stacks - speedscope, flamegraph.pl, inferno 에서 열기)
+
+샘플러는 별도 스레드에서 CALENDAR_PROFILE_INTERVAL_MS 마다 이벤트 루프 스레드의 스택을 읽습니다.
+요청 코드에는 손대지 않으므로 오버헤드가 작고, 프로파일링하지 않는 요청에는 비용이 없습니다.
+같은 이벤트 루프에서 동시에 처리된 다른 요청의 스택도 섞일 수 있습니다.
+한 번에 하나만 실행하며, 이미 실행 중이면 그 요청은 프로파일링 없이 처리됩니다.
+
+환경 변수:
+  CALENDAR_ADMIN_TOKEN=임의의-비밀-문자열   없으면 이 기능 전체가 꺼집니다.
+  CALENDAR_PROFILE_DIR=profiles
+  CALENDAR_PROFILE_INTERVAL_MS=2
+"""
+
+import hmac
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ADMIN_TOKEN = os.getenv("CALENDAR_ADMIN_TOKEN")
+DEFAULT_PROFILE_DIR = os.getenv("CALENDAR_PROFILE_DIR", "profiles")
+DEFAULT_INTERVAL = float(os.getenv("CALENDAR_PROFILE_INTERVAL_MS", "2")) / 1000
+PROFILED_PATHS = ("/calendar/webhook", "/webhook", "/api/calendar/events")
+PROFILE_HEADER = b"x-profile"
+MAX_DEPTH = 128
+TOP_FUNCTIONS = 30
+
+
+def check_admin_token(given: Optional[str], expected: Optional[str] = DEFAULT_ADMIN_TOKEN) -> bool:
+    """관리자 토큰 비교 (설정이 없으면 항상 거부)"""
+    return bool(expected) and given is not None and hmac.compare_digest(given.encode(), expected.encode())
+
+
+def _frame_label(code: Any) -> str:
+    filename = "/".join(Path(code.co_filename).parts[-2:])
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """다른 스레드에서 대상 스레드의 스택을 주기적으로 읽어 folded stack 으로 셉니다."""
+
+    def __init__(self, thread_id: int, interval: float = DEFAULT_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self) -> None:
+        labels: Dict[Any, str] = {}  # 코드 객체 → 이름 (같은 함수는 한 번만 문자열로)
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: List[str] = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                code = frame.f_code
+                label = labels.get(code)
+                if label is None:
+                    label = labels[code] = _frame_label(code)
+                stack.append(label)
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+                self.samples += 1
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def summary(self) -> Dict[str, List[Dict[str, Any]]]:
+        """자기 시간(스택 맨 위)과 누적 시간(스택 어딘가) 기준 상위 함수"""
+        own: Counter = Counter()
+        total: Counter = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += count
+            for label in set(frames):
+                total[label] += count
+
+        def top(counter: Counter) -> List[Dict[str, Any]]:
+            return [
+                {"function": label, "samples": count, "percent": round(count / self.samples * 100, 1)}
+                for label, count in counter.most_common(TOP_FUNCTIONS)
+            ]
+        return {"self": top(own), "cumulative": top(total)}
+
+
+class ProfileStore:
+    """프로파일 결과 파일 (<id>.json 요약, <id>.folded 스택)"""
+
+    def __init__(self, directory: str = DEFAULT_PROFILE_DIR):
+        self.directory = Path(directory)
+
+    def save(self, meta: Dict[str, Any], sampler: StackSampler) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = meta["id"]
+        folded = "".join(f"{stack} {count}\n" for stack, count in sampler.stacks.most_common())
+        (self.directory / f"{profile_id}.folded").write_text(folded, encoding="utf-8")
+        (self.directory / f"{profile_id}.json").write_text(
+            json.dumps({**meta, **sampler.summary()}, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        return profile_id
+
+    def _path(self, profile_id: str, suffix: str) -> Optional[Path]:
+        # ID 는 우리가 만든 16진수 문자열만 허용 (경로 조작 방지)
+        if not profile_id.isalnum():
+            return None
+        path = self.directory / f"{profile_id}{suffix}"
+        return path if path.exists() else None
+
+    def summary(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        path = self._path(profile_id, ".json")
+        return json.loads(path.read_text(encoding="utf-8")) if path else None
+
+    def folded(self, profile_id: str) -> Optional[str]:
+        path = self._path(profile_id, ".folded")
+        return path.read_text(encoding="utf-8") if path else None
+
+    def list(self) -> List[Dict[str, Any]]:
+        if not self.directory.exists():
+            return []
+        items = []
+        for path in sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True):
+            data = json.loads(path.read_text(encoding="utf-8"))
+            items.append({key: data.get(key) for key in ("id", "path", "started_at", "duration_ms", "samples", "status")})
+        return items
+
+
+class ProfilingMiddleware:
+    """X-Profile 헤더에 관리자 토큰이 있는 요청을 샘플러로 감싸는 ASGI 미들웨어"""
+
+    def __init__(self, app: Any, store: ProfileStore, token: str, interval: float = DEFAULT_INTERVAL,
+                 paths: Iterable[str] = PROFILED_PATHS):
+        self.app = app
+        self.store = store
+        self.token = token
+        self.interval = interval
+        self.paths = frozenset(paths)
+        self._busy = threading.Lock()
+
+    def _requested(self, scope: Dict[str, Any]) -> bool:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            return False
+        for name, value in scope.get("headers", ()):
+            if name == PROFILE_HEADER:
+                return check_admin_token(value.decode("latin-1"), self.token)
+        return False
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if not self._requested(scope) or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:16]
+        status: Dict[str, int] = {}
+
+        async def send_with_profile_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        started_at = time.time()
+        started = time.perf_counter()
+        sampler = StackSampler(threading.get_ident(), self.interval).start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            duration = time.perf_counter() - started
+            try:
+                self.store.save({
+                    "id": profile_id,
+                    "path": scope["path"],
+                    "started_at": round(started_at, 3),
+                    "duration_ms": round(duration * 1000, 3),
+                    "interval_ms": self.interval * 1000,
+                    "samples": sampler.samples,
+                    "status": status.get("code"),
+                }, sampler)
+                logger.info("프로파일 저장: %s (%s, %.1fms, 샘플 %d개)", profile_id, scope["path"], duration * 1000, sampler.samples)
+            except OSError as e:
+                logger.warning("프로파일 저장 실패: %s", e)
+            finally:
+                self._busy.release()
+
+
+def install_profiling(
+    app: Any,
+    token: Optional[str] = DEFAULT_ADMIN_TOKEN,
+    directory: str = DEFAULT_PROFILE_DIR,
+    interval: float = DEFAULT_INTERVAL,
+) -> Optional[ProfileStore]:
+    """관리자 토큰이 설정된 경우에만 프로파일링 미들웨어와 /admin/profiles 엔드포인트를 붙입니다."""
+    if not token:
+        return None
+    from fastapi import APIRouter, Header, HTTPException
+    from fastapi.responses import PlainTextResponse
+
+    store = ProfileStore(directory)
+    app.add_middleware(ProfilingMiddleware, store=store, token=token, interval=interval)
+    router = APIRouter(prefix="/admin/profiles", include_in_schema=False)
+
+    def require_admin(x_admin_token: Optional[str]) -> None:
+        if not check_admin_token(x_admin_token, token):
+            raise HTTPException(status_code=403, detail="관리자 토큰이 필요합니다.")
+
+    @router.get("")
+    async def list_profiles(x_admin_token: Optional[str] = Header(None)):
+        require_admin(x_admin_token)
+        return {"profiles": store.list()}
+
+    @router.get("/{profile_id}")
+    async def get_profile(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+        require_admin(x_admin_token)
+        summary = store.summary(profile_id)
+        if summary is None:
+            raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다.")
+        return summary
+
+    @router.get("/{profile_id}/folded")
+    async def get_folded(profile_id: str, x_admin_token: Optional[str] = Header(None)):
+        require_admin(x_admin_token)
+        folded = store.folded(profile_id)
+        if folded is None:
+            raise HTTPException(status_code=404, detail="프로파일을 찾을 수 없습니다.")
+        return PlainTextResponse(folded)
+
+    app.include_router(router)
+    return store
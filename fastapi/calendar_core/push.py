@@ -0,0 +1,250 @@
+"""
+Google Calendar 푸시 알림 (events.watch)
+----------------------------------------
+봇 밖(휴대폰 앱, 웹 등)에서 일정이 바뀌면 Google 이 우리 서버로 알림을 보내 줍니다.
+알림을 받으면 캐시를 비우고 복제본(mirror) 동기화를 바로 실행하므로
+TTL 을 짧게 잡거나 자주 폴링하지 않아도 됩니다.
+
+- PushChannelManager : 채널 등록(events.watch), 만료 전 자동 갱신, 알림 처리
+- create_push_router : POST /calendar/notifications 라우터
+- send_test_notification : Google 대신 알림 헤더를 보내는 로컬 테스트용 함수
+
+환경 변수:
+  CALENDAR_PUSH_ADDRESS=https://내-서버/calendar/notifications  (없으면 채널 등록 안 함)
+  CALENDAR_PUSH_TOKEN=임의의-비밀-문자열                       (알림 검증용)
+
+로컬 테스트 (서버 실행 중, CALENDAR_PUSH_TOKEN=test):
+  python -m calendar_core.push --url http://localhost:9000/calendar/notifications --calendar primary --token test
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, Iterable, Mapping, Optional
+from urllib.parse import unquote, urlparse
+
+import httpx
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATION_PATH = "/calendar/notifications"
+DEFAULT_PUSH_ADDRESS = os.getenv("CALENDAR_PUSH_ADDRESS")
+DEFAULT_PUSH_TOKEN = os.getenv("CALENDAR_PUSH_TOKEN")
+DEFAULT_CHANNEL_TTL = int(os.getenv("CALENDAR_PUSH_TTL", "604800"))
+DEFAULT_RENEW_BEFORE = float(os.getenv("CALENDAR_PUSH_RENEW_BEFORE", "3600"))
+
+
+def calendar_id_from_resource_uri(resource_uri: Optional[str]) -> Optional[str]:
+    """.../calendar/v3/calendars/{calendarId}/events?... 에서 calendarId 추출"""
+    if not resource_uri:
+        return None
+    parts = urlparse(resource_uri).path.split("/")
+    if "calendars" not in parts:
+        return None
+    index = parts.index("calendars") + 1
+    return unquote(parts[index]) if index < len(parts) else None
+
+
+class PushChannel:
+    __slots__ = ("channel_id", "calendar_id", "resource_id", "expires_at")
+
+    def __init__(self, channel_id: str, calendar_id: str, resource_id: str, expires_at: float):
+        self.channel_id = channel_id
+        self.calendar_id = calendar_id
+        self.resource_id = resource_id
+        self.expires_at = expires_at
+
+
+class PushChannelManager:
+    """events.watch 채널 등록/갱신과 알림 처리"""
+
+    def __init__(
+        self,
+        client: Any,
+        calendar_ids: Iterable[str],
+        address: Optional[str] = DEFAULT_PUSH_ADDRESS,
+        token: Optional[str] = DEFAULT_PUSH_TOKEN,
+        ttl: int = DEFAULT_CHANNEL_TTL,
+        renew_before: float = DEFAULT_RENEW_BEFORE,
+    ):
+        self.client = client
+        self.calendar_ids = list(calendar_ids)
+        self.address = address
+        self.token = token
+        self.ttl = ttl
+        self.renew_before = renew_before
+        self.channels: Dict[str, PushChannel] = {}
+        self._by_calendar: Dict[str, str] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._received = 0
+        self._changes = 0
+        self._rejected = 0
+        self._ignored = 0
+        self._renewals = 0
+        self._errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.address)
+
+    # ---------- 채널 등록 / 갱신 ----------
+
+    async def watch(self, calendar_id: str) -> PushChannel:
+        """새 채널을 등록하고, 같은 캘린더의 이전 채널은 정리합니다."""
+        body: Dict[str, Any] = {
+            "id": uuid.uuid4().hex,
+            "type": "web_hook",
+            "address": self.address,
+            "params": {"ttl": str(self.ttl)},
+        }
+        if self.token:
+            body["token"] = self.token
+        response = await self.client.watch_events(calendar_id, body)
+        expiration_ms = int(response.get("expiration") or 0)
+        channel = PushChannel(
+            body["id"],
+            calendar_id,
+            response.get("resourceId", ""),
+            expiration_ms / 1000 if expiration_ms else time.time() + self.ttl,
+        )
+        old_channel_id = self._by_calendar.get(calendar_id)
+        self.channels[channel.channel_id] = channel
+        self._by_calendar[calendar_id] = channel.channel_id
+        self._renewals += 1
+        logger.info(f"푸시 채널 등록: {calendar_id} (만료 {time.ctime(channel.expires_at)})")
+        if old_channel_id:
+            await self._stop_channel(self.channels.pop(old_channel_id))
+        return channel
+
+    async def _stop_channel(self, channel: PushChannel) -> None:
+        try:
+            await self.client.stop_channel(channel.channel_id, channel.resource_id)
+        except Exception as e:
+            logger.warning(f"푸시 채널 정리 실패 (무시): {e}")
+
+    async def _run(self) -> None:
+        while True:
+            now = time.time()
+            next_check = now + self.renew_before
+            for calendar_id in self.calendar_ids:
+                channel_id = self._by_calendar.get(calendar_id)
+                channel = self.channels.get(channel_id) if channel_id else None
+                try:
+                    if channel is None or channel.expires_at - self.renew_before <= now:
+                        channel = await self.watch(calendar_id)
+                    next_check = min(next_check, channel.expires_at - self.renew_before)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self._errors += 1
+                    next_check = min(next_check, now + 60)
+                    logger.error(f"푸시 채널 등록 실패 ({calendar_id}): {e}")
+            await asyncio.sleep(max(next_check - time.time(), 1.0))
+
+    def start(self) -> None:
+        """CALENDAR_PUSH_ADDRESS 가 있을 때만 채널 등록/갱신 작업을 시작합니다."""
+        if self.enabled and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for channel in list(self.channels.values()):
+            await self._stop_channel(channel)
+        self.channels.clear()
+        self._by_calendar.clear()
+
+    # ---------- 알림 처리 ----------
+
+    def handle(self, headers: Mapping[str, str]) -> str:
+        """알림 헤더를 처리하고 결과(changed / sync / ignored / forbidden)를 돌려줍니다."""
+        self._received += 1
+        if self.token and headers.get("x-goog-channel-token") != self.token:
+            self._rejected += 1
+            return "forbidden"
+
+        channel = self.channels.get(headers.get("x-goog-channel-id", ""))
+        if channel is not None:
+            calendar_id = channel.calendar_id
+        elif self.token:
+            # 토큰이 맞으면 재시작 전에 등록한 채널의 알림도 받아 줍니다.
+            calendar_id = calendar_id_from_resource_uri(headers.get("x-goog-resource-uri"))
+        else:
+            calendar_id = None
+        if calendar_id not in self.calendar_ids:
+            self._ignored += 1
+            return "ignored"
+
+        if headers.get("x-goog-resource-state") == "sync":
+            return "sync"
+        self._changes += 1
+        self.client.notify_changed(calendar_id)
+        return "changed"
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "channels": {
+                channel.calendar_id: {"channel_id": channel.channel_id, "expires_at": channel.expires_at}
+                for channel in self.channels.values()
+            },
+            "received": self._received,
+            "changes": self._changes,
+            "rejected": self._rejected,
+            "ignored": self._ignored,
+            "renewals": self._renewals,
+            "errors": self._errors,
+        }
+
+
+def create_push_router(manager: PushChannelManager) -> APIRouter:
+    """Google 푸시 알림을 받는 라우터 (app.include_router 로 붙입니다)"""
+    router = APIRouter()
+
+    @router.post(NOTIFICATION_PATH)
+    async def calendar_notifications(request: Request):
+        result = manager.handle(request.headers)
+        return JSONResponse(status_code=403 if result == "forbidden" else 200, content={"status": result})
+
+    return router
+
+
+def send_test_notification(
+    url: str,
+    calendar_id: str,
+    token: Optional[str] = None,
+    resource_state: str = "exists",
+    channel_id: str = "local-standin",
+) -> httpx.Response:
+    """Google 대신 푸시 알림 헤더를 보냅니다. (오프라인 테스트용)"""
+    headers = {
+        "X-Goog-Channel-ID": channel_id,
+        "X-Goog-Message-Number": str(int(time.time())),
+        "X-Goog-Resource-ID": "local-standin-resource",
+        "X-Goog-Resource-State": resource_state,
+        "X-Goog-Resource-URI": f"https://www.googleapis.com/calendar/v3/calendars/{calendar_id}/events?alt=json",
+    }
+    if token:
+        headers["X-Goog-Channel-Token"] = token
+    return httpx.post(url, headers=headers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 서버로 Calendar 푸시 알림 보내기")
+    parser.add_argument("--url", default=f"http://localhost:9000{NOTIFICATION_PATH}")
+    parser.add_argument("--calendar", default="primary")
+    parser.add_argument("--token", default=DEFAULT_PUSH_TOKEN)
+    parser.add_argument("--state", default="exists", choices=["sync", "exists", "not_exists"])
+    args = parser.parse_args()
+    response = send_test_notification(args.url, args.calendar, args.token, args.state)
+    print(response.status_code, response.text)
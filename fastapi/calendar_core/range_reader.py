@@ -0,0 +1,89 @@
+"""
+기간 일정 스트리밍 조회
+----------------------
+events.list 는 한 번에 한 페이지(기본 250개)만 돌려줍니다.
+iter_events 는 nextPageToken 을 따라가며 필요한 만큼만 다음 페이지를 읽는 async generator 라서,
+한 달/분기처럼 일정이 많은 기간도 메모리에 한 페이지 분량만 들고 처리할 수 있습니다.
+
+- fields 로 필요한 필드만 받아 응답 크기를 줄입니다.
+- stream_lines 로 FastAPI StreamingResponse 에 바로 넘길 수 있습니다. (첫 페이지가 오면 바로 전송 시작)
+
+사용 예:
+    async for event in iter_events(calendar_client, "primary", time_min, time_max):
+        ...
+    return StreamingResponse(stream_lines(iter_events(...), format_line), media_type="text/plain")
+"""
+
+import json
+import os
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+DEFAULT_PAGE_SIZE = int(os.getenv("CALENDAR_PAGE_SIZE", "250"))
+# 요청 하나로 스트리밍할 수 있는 최대 기간(일, 한 분기)
+MAX_RANGE_DAYS = 92
+# 목록 표시에 필요한 필드만 요청합니다.
+EVENT_LIST_FIELDS = "nextPageToken,timeZone,items(id,summary,description,location,start,end)"
+
+
+async def iter_pages(
+    client: Any,
+    calendar_id: str,
+    time_min: Optional[str],
+    time_max: Optional[str],
+    fields: Optional[str] = EVENT_LIST_FIELDS,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    order_by: Optional[str] = "startTime",
+) -> AsyncIterator[Dict[str, Any]]:
+    """events.list 응답을 한 페이지씩 (다음 페이지는 소비하는 쪽이 요청할 때 읽습니다)"""
+    page_token = None
+    while True:
+        page = await client.list_events(
+            calendar_id,
+            time_min=time_min,
+            time_max=time_max,
+            order_by=order_by,
+            page_token=page_token,
+            max_results=page_size,
+            fields=fields,
+        )
+        yield page
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            return
+
+
+async def iter_events(
+    client: Any,
+    calendar_id: str,
+    time_min: Optional[str],
+    time_max: Optional[str],
+    fields: Optional[str] = EVENT_LIST_FIELDS,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    order_by: Optional[str] = "startTime",
+) -> AsyncIterator[Dict[str, Any]]:
+    """기간 안의 일정을 시작 시간 순으로 하나씩"""
+    async for page in iter_pages(client, calendar_id, time_min, time_max, fields, page_size, order_by):
+        for event in page.get("items", []):
+            yield event
+
+
+async def stream_lines(
+    events: AsyncIterator[Dict[str, Any]],
+    format_line: Callable[[Dict[str, Any]], str],
+    header: Optional[str] = None,
+    empty: Optional[str] = None,
+) -> AsyncIterator[bytes]:
+    """일정마다 한 줄씩 UTF-8 로 내보냅니다. (StreamingResponse 용)"""
+    if header:
+        yield (header + "\n").encode("utf-8")
+    count = 0
+    async for event in events:
+        count += 1
+        yield (format_line(event) + "\n").encode("utf-8")
+    if count == 0 and empty:
+        yield (empty + "\n").encode("utf-8")
+
+
+def ndjson_line(item: Any) -> str:
+    """JSON Lines 한 줄 (application/x-ndjson)"""
+    return json.dumps(item, ensure_ascii=False, default=str)
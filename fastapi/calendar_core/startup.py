@@ -0,0 +1,141 @@
+"""
+시작 시간 보고
+-------------
+오토스케일로 새로 뜬 서버나 --reload 재시작이 요청을 받을 수 있게 되기까지 걸린 시간을 단계별로 남깁니다.
+
+  startup_report = StartupReport()          # 서버 모듈 앞부분 (여기까지 = 인터프리터 + import)
+  ...
+  startup_report.mark("module")             # 앱/라우터 구성 끝
+  startup_report.mark("serving")            # startup 훅 끝 (요청을 받기 시작)
+  startup_report.mark("ready")              # warmup + 첫 연결 확인 끝 (HealthMonitor 가 표시, 로그에 요약 출력)
+  install_startup_report(app, startup_report)   # GET /startup
+
+시각은 모두 프로세스 시작 기준 초입니다. (/proc 를 읽을 수 없는 OS 에서는 StartupReport 생성 기준)
+Google 관련 무거운 모듈은 처음 쓸 때 import 하므로, 보고서의 lazy_modules 에서 아직 로드되지 않은 것을 확인할 수 있습니다.
+
+import 단계에서 어떤 모듈이 오래 걸리는지는 python -X importtime 으로 봅니다:
+  python -m calendar_core.startup ../examples/GoogleCalendarBot_Improved/google_calendar_service.py --top 15
+"""
+
+import argparse
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 필요할 때만 import 하도록 바꾼 모듈 (시작할 때 로드되지 않아야 정상)
+LAZY_MODULES = (
+    "googleapiclient.discovery",
+    "google_auth_httplib2",
+    "google_auth_oauthlib.flow",
+    "google.oauth2.service_account",
+    "google.auth.transport.requests",
+)
+
+
+def process_start_time() -> Optional[float]:
+    """프로세스가 시작된 시각 (epoch 초, Linux 전용)"""
+    try:
+        with open("/proc/self/stat") as f:
+            # comm 에 공백이 있을 수 있으므로 마지막 ')' 뒤부터 셉니다. starttime 은 22번째 필드
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/stat") as f:
+            boot_time = next(int(line.split()[1]) for line in f if line.startswith("btime"))
+        return boot_time + int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, StopIteration):
+        return None
+
+
+class StartupReport:
+    def __init__(self):
+        self.created_at = time.time()
+        self.process_started_at = process_start_time()
+        self.marks: Dict[str, float] = {}
+
+    @property
+    def origin(self) -> float:
+        return self.process_started_at or self.created_at
+
+    def mark(self, name: str) -> None:
+        self.marks[name] = time.time()
+        if name == "ready":
+            logger.info("서버 준비 완료: 프로세스 시작 후 %.2f초 (%s)", self.marks[name] - self.origin, self._summary())
+
+    def _summary(self) -> str:
+        return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.timeline().items())
+
+    def timeline(self) -> Dict[str, float]:
+        points = {"imports": self.created_at, **self.marks}
+        return {name: round(moment - self.origin, 3) for name, moment in points.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "origin": "process" if self.process_started_at else "report",
+            "seconds": self.timeline(),
+            "lazy_modules": {name: name in sys.modules for name in LAZY_MODULES},
+            "modules_loaded": len(sys.modules),
+        }
+
+
+def install_startup_report(app: Any, report: StartupReport) -> None:
+    """GET /startup 으로 시작 시간 보고서를 보여 줍니다."""
+
+    @app.get("/startup", include_in_schema=False)
+    async def startup_report():
+        return report.stats()
+
+
+# ---------- python -X importtime 분석 ----------
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def slowest_imports(script: str, top: int = 20) -> Tuple[float, List[Tuple[str, float, float]], Set[str]]:
+    """서버 파일을 import 해 보고 (전체 초, [(모듈, 누적 ms, 자기 ms)], 로드된 모듈) 을 돌려줍니다."""
+    path = Path(script).resolve()
+    code = f"import sys; sys.path.insert(0, {str(path.parent)!r}); import {path.stem}"
+    env = {**os.environ, "CALENDAR_CLIENT_MODE": os.getenv("CALENDAR_CLIENT_MODE", "fake")}
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=path.parent, env=env, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import 실패")
+    rows = []
+    loaded = set()
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        loaded.add(match.group(4))
+        if len(match.group(3)) <= 3:  # 최상위 import 와 그 바로 아래만
+            rows.append((match.group(4), int(match.group(2)) / 1000, int(match.group(1)) / 1000))
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return elapsed, rows[:top], loaded
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="서버 모듈 import 시간 분석")
+    parser.add_argument("script", help="서버 파일 경로 (예: google_calendar_webhook.py)")
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    elapsed, rows, loaded = slowest_imports(args.script, args.top)
+    print(f"{'module':<50} {'cumulative ms':>14} {'self ms':>10}")
+    for name, cumulative, own in rows:
+        print(f"{name:<50} {cumulative:>14.1f} {own:>10.1f}")
+    print(f"\n프로세스 시작 → import 완료: {elapsed:.2f}초")
+    for name in LAZY_MODULES:
+        print(f"  {name:<40} {'시작할 때 로드됨' if name in loaded else '처음 쓸 때 로드'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,487 @@
+"""
+syncToken 기반 증분 동기화
+--------------------------
+요청마다 events.list 를 다시 부르는 대신, 캘린더 전체를 한 번 읽어 메모리에 복제(mirror)해 두고
+이후에는 syncToken 으로 바뀐 일정만 받아서 반영합니다.
+
+- 처음: 최근 CALENDAR_SYNC_DAYS_BACK 일 이후 일정 전체 (페이지 끝까지) → nextSyncToken 저장
+- 이후: interval 초마다 syncToken 으로 변경분만 조회 → 추가/수정/삭제 반영
+- 410 Gone (토큰 만료): 조용히 전체 동기화를 다시 합니다.
+
+MirroredCalendarClient 는 동기화가 끝난 캘린더의 조회/빈시간 요청을 mirror 에서 바로 답하고,
+나머지는 감싼 클라이언트로 넘깁니다.
+
+MirrorStore(mirror_store.py) 를 넘기면 복제본과 syncToken 을 디스크에 남겨 두었다가
+재시작할 때 되살리고, 전체 동기화 대신 저장된 syncToken 으로 이어서 동기화합니다.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from calendar_core.async_client import CalendarAPIError
+from calendar_core.batch import BatchOperation, BatchResult
+from calendar_core.event_cache import parse_api_time
+from calendar_core.interval_index import IntervalIndex
+from calendar_core.mirror_store import EventRow, MirrorStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SYNC_INTERVAL = float(os.getenv("CALENDAR_SYNC_INTERVAL", "30"))
+DEFAULT_DAYS_BACK = int(os.getenv("CALENDAR_SYNC_DAYS_BACK", "30"))
+SYNC_PAGE_SIZE = 2500
+LOCAL_PAGE_PREFIX = "mirror:"  # 복제본이 만든 페이지 토큰
+
+
+def event_range(event: Dict[str, Any], tz_name: str = "UTC") -> Tuple[datetime, datetime]:
+    """일정의 [시작, 끝) 범위. 종일 일정(date)은 캘린더 시간대의 자정 기준입니다."""
+    bounds = []
+    for field in ("start", "end"):
+        moment = event.get(field, {})
+        if moment.get("dateTime"):
+            bounds.append(parse_api_time(moment["dateTime"], moment.get("timeZone") or tz_name))
+        else:
+            day = datetime.fromisoformat(moment["date"])
+            bounds.append(day.replace(tzinfo=ZoneInfo(moment.get("timeZone") or tz_name)))
+    return bounds[0], bounds[1]
+
+
+def _format_utc(moment: datetime) -> str:
+    return moment.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class CalendarMirror:
+    """캘린더 하나의 메모리 복제본"""
+
+    def __init__(
+        self,
+        client: Any,
+        calendar_id: str,
+        interval: float = DEFAULT_SYNC_INTERVAL,
+        days_back: int = DEFAULT_DAYS_BACK,
+        store: Optional[MirrorStore] = None,
+    ):
+        self.client = client
+        self.calendar_id = calendar_id
+        self.interval = interval
+        self.days_back = days_back
+        self.store = store
+        self.window_start: Optional[datetime] = None
+        self.time_zone = "UTC"
+        self.sync_token: Optional[str] = None
+        self.ready = False
+        self._events: Dict[str, Dict[str, Any]] = {}
+        self._index = IntervalIndex()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._full_syncs = 0
+        self._incremental_syncs = 0
+        self._changes_applied = 0
+        self._token_expired = 0
+        self._errors = 0
+        self._last_synced_at: Optional[datetime] = None
+        # 디스크에 아직 쓰지 않은 변경 (id → 일정, 삭제면 None)
+        self._dirty: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._replace = False
+        self._state_dirty = False
+        self._restored_events = 0
+        self._persist_errors = 0
+
+    # ---------- 변경 반영 ----------
+
+    def apply(self, event: Dict[str, Any]) -> None:
+        """일정 하나를 반영합니다. (status=cancelled 면 삭제)"""
+        event_id = event.get("id")
+        if not event_id:
+            return
+        self._changes_applied += 1
+        if event.get("status") == "cancelled" or "start" not in event:
+            self.remove(event_id)
+            return
+        self._events[event_id] = event
+        start, end = event_range(event, self.time_zone)
+        self._index.add(event_id, start, end, event)
+        if self.store is not None:
+            self._dirty[event_id] = event
+
+    def remove(self, event_id: str) -> None:
+        self._events.pop(event_id, None)
+        self._index.remove(event_id)
+        if self.store is not None:
+            self._dirty[event_id] = None
+
+    def load(self, events: Iterable[Dict[str, Any]], sync_token: Optional[str], time_zone: Optional[str] = None) -> None:
+        """전체 목록으로 복제본을 교체합니다."""
+        if time_zone:
+            self.time_zone = time_zone
+        self._events = {}
+        self._index = IntervalIndex()
+        self._dirty = {}
+        self._replace = True
+        for event in events:
+            self.apply(event)
+        self.sync_token = sync_token
+        self.ready = True
+
+    # ---------- 디스크 저장 ----------
+
+    async def restore(self) -> bool:
+        """저장소에 남아 있는 복제본을 되살립니다. (파일 읽기는 스레드에서)"""
+        if self.store is None or self.ready:
+            return False
+        state = await asyncio.to_thread(self.store.load_state, self.calendar_id)
+        if state is None or not state.get("sync_token"):
+            return False
+        window_start = (
+            datetime.fromtimestamp(state["window_start"], timezone.utc) if state.get("window_start") is not None else None
+        )
+        events = await asyncio.to_thread(
+            self.store.overlapping, self.calendar_id, window_start.timestamp() if window_start else None
+        )
+        if self.ready:  # 읽는 사이에 동기화가 먼저 끝났으면 그쪽을 씁니다.
+            return False
+        self.time_zone = state.get("time_zone") or self.time_zone
+        for event in events:
+            start, end = event_range(event, self.time_zone)
+            self._events[event["id"]] = event
+            self._index.add(event["id"], start, end, event)
+        self.sync_token = state["sync_token"]
+        self.window_start = window_start
+        if state.get("synced_at") is not None:
+            self._last_synced_at = datetime.fromtimestamp(state["synced_at"], timezone.utc)
+        self._restored_events = len(events)
+        self.ready = True
+        logger.info("캘린더 복제본 복원: %s (%d개, 마지막 동기화 %s)", self.calendar_id, len(events), self._last_synced_at)
+        return True
+
+    def _rows(self, changes: Dict[str, Optional[Dict[str, Any]]], time_zone: str) -> List[EventRow]:
+        rows: List[EventRow] = []
+        for event_id, event in changes.items():
+            if event is None:
+                rows.append((event_id, None))
+            else:
+                start, end = event_range(event, time_zone)
+                rows.append((event_id, (event, start.timestamp(), end.timestamp())))
+        return rows
+
+    def _write(self, changes: Dict[str, Optional[Dict[str, Any]]], state: Dict[str, Any], replace: bool) -> None:
+        self.store.save(self.calendar_id, self._rows(changes, state["time_zone"]), state, replace)
+
+    async def persist(self) -> None:
+        """쌓인 변경과 syncToken 을 저장소에 씁니다. (이벤트 루프 밖에서)"""
+        if self.store is None or not self.ready or not (self._dirty or self._replace or self._state_dirty):
+            return
+        changes, replace = self._dirty, self._replace
+        self._dirty, self._replace, self._state_dirty = {}, False, False
+        state = {
+            "sync_token": self.sync_token,
+            "time_zone": self.time_zone,
+            "window_start": self.window_start.timestamp() if self.window_start else None,
+            "synced_at": self._last_synced_at.timestamp() if self._last_synced_at else None,
+        }
+        try:
+            await asyncio.to_thread(self._write, changes, state, replace)
+        except Exception as e:
+            # 다음 주기에 다시 쓰도록 되돌립니다. (그 사이 새 변경이 우선)
+            self._dirty = {**changes, **self._dirty}
+            self._replace = self._replace or replace
+            self._state_dirty = True
+            self._persist_errors += 1
+            logger.error("캘린더 복제본 저장 실패 (%s): %s", self.calendar_id, e)
+
+    # ---------- Google 과 동기화 ----------
+
+    async def _list_all(self, **kwargs: Any) -> Tuple[List[Dict[str, Any]], Optional[str], Optional[str]]:
+        items: List[Dict[str, Any]] = []
+        page_token = None
+        while True:
+            page = await self.client.list_events(
+                self.calendar_id, page_token=page_token, max_results=SYNC_PAGE_SIZE, **kwargs
+            )
+            items.extend(page.get("items", []))
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return items, page.get("nextSyncToken"), page.get("timeZone")
+
+    async def full_sync(self) -> None:
+        window_start = datetime.now(timezone.utc) - timedelta(days=self.days_back)
+        items, sync_token, time_zone = await self._list_all(time_min=_format_utc(window_start))
+        self.load(items, sync_token, time_zone)
+        self.window_start = window_start
+        self._full_syncs += 1
+        self._last_synced_at = datetime.now(timezone.utc)
+        logger.info(f"캘린더 전체 동기화 완료: {self.calendar_id} ({len(self._events)}개)")
+
+    async def sync_once(self) -> None:
+        """syncToken 이 있으면 변경분만, 없으면 전체 동기화"""
+        if not self.sync_token:
+            await self.full_sync()
+            return
+        try:
+            items, sync_token, _ = await self._list_all(sync_token=self.sync_token)
+        except CalendarAPIError as e:
+            if e.status != 410:
+                raise
+            self._token_expired += 1
+            logger.info(f"syncToken 만료, 전체 동기화 다시 실행: {self.calendar_id}")
+            await self.full_sync()
+            return
+        for event in items:
+            self.apply(event)
+        self._state_dirty = self._state_dirty or bool(sync_token and sync_token != self.sync_token)
+        self.sync_token = sync_token or self.sync_token
+        self._incremental_syncs += 1
+        self._last_synced_at = datetime.now(timezone.utc)
+
+    async def _run(self) -> None:
+        delay = self.interval
+        try:
+            await self.restore()
+        except Exception as e:
+            logger.error("캘린더 복제본 복원 실패 (%s): %s", self.calendar_id, e)
+        while True:
+            try:
+                await self.sync_once()
+                await self.persist()
+                delay = self.interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._errors += 1
+                delay = min(max(delay * 2, 1.0), 300.0)
+                logger.error(f"캘린더 동기화 실패 ({self.calendar_id}): {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def request_sync(self) -> None:
+        """다음 주기를 기다리지 않고 바로 변경분을 가져오게 합니다."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.persist()
+
+    # ---------- 조회 ----------
+
+    def covers(self, start: Optional[datetime]) -> bool:
+        """복제본이 start 이후 구간을 빠짐없이 갖고 있는지"""
+        if not self.ready:
+            return False
+        if self.window_start is None:
+            return True
+        return start is not None and start >= self.window_start
+
+    def events_between(self, start: Optional[datetime], end: Optional[datetime]) -> List[Dict[str, Any]]:
+        """[start, end) 와 겹치는 일정 (시작 시간 순, 구간 인덱스 사용)"""
+        return self._index.overlapping(start, end)
+
+    def busy_between(self, start: datetime, end: datetime) -> List[Tuple[datetime, datetime]]:
+        """freebusy 와 같은 규칙으로 바쁜 구간을 합쳐서 돌려줍니다."""
+        blocks = []
+        for event in self.events_between(start, end):
+            if event.get("transparency") == "transparent":
+                continue
+            event_start, event_end = self._index.span(event["id"])
+            blocks.append((max(event_start, start), min(event_end, end)))
+        merged: List[Tuple[datetime, datetime]] = []
+        for block_start, block_end in sorted(blocks):
+            if merged and block_start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], block_end))
+            else:
+                merged.append((block_start, block_end))
+        return merged
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "window_start": self.window_start.isoformat() if self.window_start else None,
+            "events": len(self._events),
+            "full_syncs": self._full_syncs,
+            "incremental_syncs": self._incremental_syncs,
+            "changes_applied": self._changes_applied,
+            "token_expired": self._token_expired,
+            "errors": self._errors,
+            "last_synced_at": self._last_synced_at.isoformat() if self._last_synced_at else None,
+            "restored_events": self._restored_events,
+            "pending_writes": len(self._dirty),
+            "persist_errors": self._persist_errors,
+        }
+
+
+class MirroredCalendarClient:
+    """동기화된 캘린더는 mirror 에서 답하고, 나머지는 감싼 클라이언트로 넘기는 래퍼"""
+
+    def __init__(self, client: Any, mirrors: Dict[str, CalendarMirror], store: Optional[MirrorStore] = None):
+        self.client = client
+        self.mirrors = mirrors
+        self.store = store
+
+    def _ready_mirror(self, calendar_id: str) -> Optional[CalendarMirror]:
+        mirror = self.mirrors.get(calendar_id)
+        return mirror if mirror is not None and mirror.ready else None
+
+    def _covering_mirror(self, calendar_id: str, start: Optional[datetime]) -> Optional[CalendarMirror]:
+        mirror = self.mirrors.get(calendar_id)
+        if mirror is None:
+            return None
+        # start() 를 건너뛴 경우(인증이 늦게 된 경우 등)에도 첫 조회 때 동기화를 시작합니다.
+        mirror.start()
+        return mirror if mirror.covers(start) else None
+
+    async def start(self) -> None:
+        await self.client.start()
+        for mirror in self.mirrors.values():
+            mirror.start()
+
+    async def wait_synced(self, timeout: float) -> bool:
+        """모든 복제본이 준비될 때까지(첫 동기화 또는 디스크 복원) 기다립니다. 시간 안에 끝나면 True"""
+        deadline = time.monotonic() + timeout
+        while not all(mirror.ready for mirror in self.mirrors.values()):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    async def close(self) -> None:
+        for mirror in self.mirrors.values():
+            await mirror.stop()
+        if self.store is not None:
+            self.store.close()
+        await self.client.close()
+
+    async def list_events(
+        self,
+        calendar_id: str,
+        time_min: Optional[str] = None,
+        time_max: Optional[str] = None,
+        single_events: bool = True,
+        order_by: Optional[str] = None,
+        page_token: Optional[str] = None,
+        sync_token: Optional[str] = None,
+        max_results: Optional[int] = None,
+        show_deleted: Optional[bool] = None,
+        fields: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        start = parse_api_time(time_min)
+        mirror = self._covering_mirror(calendar_id, start)
+        local_page = page_token is None or page_token.startswith(LOCAL_PAGE_PREFIX)
+        if mirror is not None and single_events and local_page and not (sync_token or show_deleted):
+            items = mirror.events_between(start, parse_api_time(time_max))
+            page: Dict[str, Any] = {"timeZone": mirror.time_zone}
+            if max_results:
+                # Google 과 같이 max_results 개씩 잘라 주고, 다음 페이지는 로컬 토큰으로 이어 줍니다.
+                offset = int(page_token[len(LOCAL_PAGE_PREFIX):]) if page_token else 0
+                if offset + max_results < len(items):
+                    page["nextPageToken"] = f"{LOCAL_PAGE_PREFIX}{offset + max_results}"
+                items = items[offset:offset + max_results]
+            page["items"] = items
+            return page
+        return await self.client.list_events(
+            calendar_id,
+            time_min=time_min,
+            time_max=time_max,
+            single_events=single_events,
+            order_by=order_by,
+            page_token=page_token,
+            sync_token=sync_token,
+            max_results=max_results,
+            show_deleted=show_deleted,
+            fields=fields,
+        )
+
+    async def insert_event(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        created = await self.client.insert_event(calendar_id, body)
+        mirror = self._ready_mirror(calendar_id)
+        if mirror is not None:
+            mirror.apply(created)
+        return created
+
+    async def delete_event(self, calendar_id: str, event_id: str) -> None:
+        await self.client.delete_event(calendar_id, event_id)
+        mirror = self._ready_mirror(calendar_id)
+        if mirror is not None:
+            mirror.remove(event_id)
+
+    async def freebusy(
+        self,
+        time_min: str,
+        time_max: str,
+        calendar_ids: List[str],
+        time_zone: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        start, end = parse_api_time(time_min, time_zone), parse_api_time(time_max, time_zone)
+        calendars: Dict[str, Any] = {}
+        remote_ids = []
+        for calendar_id in calendar_ids:
+            mirror = self._covering_mirror(calendar_id, start)
+            if mirror is None:
+                remote_ids.append(calendar_id)
+                continue
+            calendars[calendar_id] = {
+                "busy": [
+                    {"start": _format_utc(block_start), "end": _format_utc(block_end)}
+                    for block_start, block_end in mirror.busy_between(start, end)
+                ]
+            }
+        if not calendars:
+            return await self.client.freebusy(time_min, time_max, calendar_ids, time_zone=time_zone)
+        if remote_ids:
+            # 복제본이 없는 캘린더만 Google 에 묻습니다.
+            response = await self.client.freebusy(time_min, time_max, remote_ids, time_zone=time_zone)
+            calendars.update(response.get("calendars", {}))
+        return {"kind": "calendar#freeBusy", "timeMin": time_min, "timeMax": time_max, "calendars": calendars}
+
+    async def batch(self, operations: List[BatchOperation]) -> List[BatchResult]:
+        results = await self.client.batch(operations)
+        for result in results:
+            operation = result.operation
+            mirror = self._ready_mirror(operation.calendar_id) if result.ok else None
+            if mirror is None:
+                continue
+            if operation.method == "insert":
+                mirror.apply(result.response)
+            elif operation.method == "delete":
+                mirror.remove(operation.event_id)
+        return results
+
+    async def get_calendar(self, calendar_id: str) -> Dict[str, Any]:
+        return await self.client.get_calendar(calendar_id)
+
+    async def watch_events(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.client.watch_events(calendar_id, body)
+
+    async def stop_channel(self, channel_id: str, resource_id: str) -> None:
+        await self.client.stop_channel(channel_id, resource_id)
+
+    def notify_changed(self, calendar_id: str) -> None:
+        """봇 밖에서 캘린더가 바뀌었으면 복제본을 바로 다시 동기화합니다."""
+        mirror = self.mirrors.get(calendar_id)
+        if mirror is not None:
+            mirror.request_sync()
+        self.client.notify_changed(calendar_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.client.stats(),
+            "sync": {calendar_id: mirror.stats() for calendar_id, mirror in self.mirrors.items()},
+            "mirror_store": self.store.stats() if self.store is not None else None,
+        }
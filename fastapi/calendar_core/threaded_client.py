@@ -0,0 +1,154 @@
+"""
+스레드 풀 기반 Google Calendar 클라이언트
+----------------------------------------
+AsyncCalendarClient 와 같은 async 메서드를 제공하지만,
+실제 호출은 기존 googleapiclient(.execute()) 를 BoundedExecutor 의 스레드에서 실행합니다.
+
+완전한 비동기 HTTP 대신 검증된 googleapiclient 를 그대로 쓰고 싶을 때
+CALENDAR_CLIENT_MODE=threads 로 선택합니다.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from googleapiclient.errors import HttpError
+
+from calendar_core.async_client import CalendarAPIError
+from calendar_core.batch import BatchOperation, BatchResult, chunked
+from calendar_core.client import CalendarClientPool
+from calendar_core.executor import BoundedExecutor
+from calendar_core.tracing import span
+
+
+def _drop_none(params: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in params.items() if value is not None}
+
+
+class ThreadedCalendarClient:
+    """CalendarClientPool + BoundedExecutor 조합"""
+
+    def __init__(self, pool: CalendarClientPool, executor: Optional[BoundedExecutor] = None):
+        self.pool = pool
+        self.executor = executor or BoundedExecutor(max_workers=pool.size)
+
+    def _execute(self, make_request: Callable[[Any], Any]) -> Any:
+        # 작업 스레드 안에서 실행됩니다.
+        with self.pool.service() as service:
+            try:
+                with span("google.execute"):
+                    return make_request(service).execute()
+            except HttpError as e:
+                raise CalendarAPIError(e.resp.status, getattr(e, "reason", str(e)))
+
+    async def _call(self, make_request: Callable[[Any], Any]) -> Any:
+        return await self.executor.run(self._execute, make_request)
+
+    async def start(self) -> None:
+        await self.executor.run(self.pool.start)
+
+    async def close(self) -> None:
+        self.executor.shutdown()
+        self.pool.close()
+
+    async def list_events(
+        self,
+        calendar_id: str,
+        time_min: Optional[str] = None,
+        time_max: Optional[str] = None,
+        single_events: bool = True,
+        order_by: Optional[str] = None,
+        page_token: Optional[str] = None,
+        sync_token: Optional[str] = None,
+        max_results: Optional[int] = None,
+        show_deleted: Optional[bool] = None,
+        fields: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        params = _drop_none({
+            "calendarId": calendar_id,
+            "timeMin": time_min,
+            "timeMax": time_max,
+            "singleEvents": single_events,
+            "orderBy": order_by,
+            "pageToken": page_token,
+            "syncToken": sync_token,
+            "maxResults": max_results,
+            "showDeleted": show_deleted,
+            "fields": fields,
+        })
+        return await self._call(lambda service: service.events().list(**params))
+
+    async def insert_event(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._call(lambda service: service.events().insert(calendarId=calendar_id, body=body))
+
+    async def delete_event(self, calendar_id: str, event_id: str) -> None:
+        await self._call(lambda service: service.events().delete(calendarId=calendar_id, eventId=event_id))
+
+    async def freebusy(
+        self,
+        time_min: str,
+        time_max: str,
+        calendar_ids: List[str],
+        time_zone: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        body: Dict[str, Any] = {
+            "timeMin": time_min,
+            "timeMax": time_max,
+            "items": [{"id": calendar_id} for calendar_id in calendar_ids],
+        }
+        if time_zone:
+            body["timeZone"] = time_zone
+        return await self._call(lambda service: service.freebusy().query(body=body))
+
+    async def get_calendar(self, calendar_id: str) -> Dict[str, Any]:
+        return await self._call(lambda service: service.calendars().get(calendarId=calendar_id))
+
+    async def watch_events(self, calendar_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        return await self._call(lambda service: service.events().watch(calendarId=calendar_id, body=body))
+
+    async def stop_channel(self, channel_id: str, resource_id: str) -> None:
+        body = {"id": channel_id, "resourceId": resource_id}
+        await self._call(lambda service: service.channels().stop(body=body))
+
+    def _execute_batch(self, operations: List[BatchOperation]) -> List[BatchResult]:
+        # 작업 스레드 안에서 실행됩니다. (googleapiclient 의 BatchHttpRequest 사용)
+        results: List[BatchResult] = [BatchResult(operation) for operation in operations]
+
+        def callback(request_id: str, response: Any, exception: Optional[Exception]) -> None:
+            result = results[int(request_id)]
+            if isinstance(exception, HttpError):
+                result.error = CalendarAPIError(exception.resp.status, getattr(exception, "reason", str(exception)))
+            elif exception is not None:
+                result.error = exception
+            else:
+                result.response = response or {}
+
+        with self.pool.service() as service:
+            batch = service.new_batch_http_request(callback=callback)
+            for index, operation in enumerate(operations):
+                events = service.events()
+                if operation.method == "insert":
+                    request = events.insert(calendarId=operation.calendar_id, body=operation.body)
+                elif operation.method == "delete":
+                    request = events.delete(calendarId=operation.calendar_id, eventId=operation.event_id)
+                elif operation.method == "get":
+                    request = events.get(calendarId=operation.calendar_id, eventId=operation.event_id)
+                else:
+                    raise ValueError(f"지원하지 않는 배치 작업입니다: {operation.method}")
+                batch.add(request, request_id=str(index))
+            try:
+                with span("google.batch", size=len(operations)):
+                    batch.execute()
+            except HttpError as e:
+                raise CalendarAPIError(e.resp.status, getattr(e, "reason", str(e)))
+        return results
+
+    async def batch(self, operations: List[BatchOperation]) -> List[BatchResult]:
+        results: List[BatchResult] = []
+        for chunk in chunked(operations):
+            results += await self.executor.run(self._execute_batch, chunk)
+        return results
+
+    def notify_changed(self, calendar_id: str) -> None:
+        """외부 변경 알림 (저장해 둔 데이터가 없으므로 할 일 없음)"""
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": "threads", "client_pool": self.pool.stats(), "executor": self.executor.stats()}
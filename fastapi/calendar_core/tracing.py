@@ -0,0 +1,258 @@
+"""
+요청 단위 구간(span) 추적
+------------------------
+느린 답장이 어디서 시간을 쓰는지 보기 위한 가벼운 추적 기능입니다.
+웹훅 요청 하나를 명령어 분기 → 날짜 파싱 → 인증/서비스 준비 → Google 호출 → 응답 문자열 만들기
+구간으로 나눠서, 요청이 끝나면 한 줄짜리 JSON 으로 파일에 남깁니다.
+
+- TracingMiddleware : 요청마다 샘플링 여부를 정하고 루트 구간을 엽니다. 샘플된 요청은 X-Trace-Id 헤더를 붙입니다.
+- span(name, **attrs) : with 블록 하나를 구간으로 기록합니다. (샘플되지 않은 요청에서는 거의 비용 없음)
+- traced(name) : 함수(동기/async) 전체를 구간으로 기록하는 데코레이터
+
+현재 추적은 contextvars 로 전달되므로 await 를 건너도 이어지고,
+BoundedExecutor 의 작업 스레드로 넘어간 호출도 같은 추적에 붙습니다.
+파일 쓰기는 백그라운드 스레드가 하므로 요청 처리 중에는 디스크를 기다리지 않습니다.
+
+환경 변수:
+  CALENDAR_TRACE_FILE=traces.jsonl     기록 파일 (없으면 추적 안 함)
+  CALENDAR_TRACE_SAMPLE_RATE=0.1       추적할 요청 비율 (0~1)
+
+기록 형식 (한 줄에 요청 하나, 시간 단위 ms, start 는 요청 시작 기준):
+  {"trace_id":"…","name":"POST /calendar/webhook","start":1729130000.123,"duration_ms":84.2,
+   "spans":[{"id":1,"parent":0,"name":"command.dispatch","start":0.4,"duration_ms":83.1,"attrs":{"command":"조회"}}, …]}
+"""
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRACE_FILE = os.getenv("CALENDAR_TRACE_FILE")
+DEFAULT_SAMPLE_RATE = float(os.getenv("CALENDAR_TRACE_SAMPLE_RATE", "0.1"))
+TRACED_PATHS = ("/calendar/webhook", "/webhook", "/api/calendar/events")
+TRACE_HEADER = b"x-trace-id"
+
+
+class Trace:
+    __slots__ = ("trace_id", "name", "started_at", "origin", "spans", "_next_id")
+
+    def __init__(self, name: str):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.name = name
+        self.started_at = time.time()
+        self.origin = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._next_id = 0
+
+    def next_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def to_dict(self, duration: float) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "start": round(self.started_at, 3),
+            "duration_ms": round(duration * 1000, 3),
+            "spans": self.spans,
+        }
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("calendar_trace", default=None)
+_current_span: contextvars.ContextVar[int] = contextvars.ContextVar("calendar_span", default=0)
+
+
+class _Span:
+    __slots__ = ("trace", "name", "attrs", "span_id", "parent", "started", "token")
+
+    def __init__(self, trace: Trace, name: str, attrs: Dict[str, Any]):
+        self.trace = trace
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs: Any) -> None:
+        """구간이 끝나기 전에 속성을 추가합니다. (예: 응답 상태 코드)"""
+        self.attrs.update(attrs)
+
+    def __enter__(self) -> "_Span":
+        self.span_id = self.trace.next_id()
+        self.parent = _current_span.get()
+        self.token = _current_span.set(self.span_id)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        ended = time.perf_counter()
+        _current_span.reset(self.token)
+        record = {
+            "id": self.span_id,
+            "parent": self.parent,
+            "name": self.name,
+            "start": round((self.started - self.trace.origin) * 1000, 3),
+            "duration_ms": round((ended - self.started) * 1000, 3),
+        }
+        if self.attrs:
+            record["attrs"] = self.attrs
+        if exc_type is not None:
+            record["error"] = exc_type.__name__
+        self.trace.spans.append(record)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, **attrs: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attrs: Any) -> Any:
+    """with span("google.http", method="GET"): ... (추적 중이 아니면 아무것도 하지 않음)"""
+    trace = _current_trace.get()
+    if trace is None:
+        return _NOOP
+    return _Span(trace, name, attrs)
+
+
+def traced(name: Optional[str] = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """함수 전체를 구간으로 기록하는 데코레이터 (async 함수도 지원)"""
+    def decorate(fn: Callable[..., Any]) -> Callable[..., Any]:
+        span_name = name or fn.__qualname__
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with span(span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with span(span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+class JsonLinesExporter:
+    """추적 결과를 백그라운드 스레드에서 파일에 한 줄씩 씁니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+        self.exported = 0
+
+    def export(self, record: Dict[str, Any]) -> None:
+        self._queue.put(record)
+
+    def _run(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            while True:
+                record = self._queue.get()
+                if record is None:
+                    return
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str) + "\n")
+                self.exported += 1
+                if self._queue.empty():
+                    f.flush()
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+class Tracer:
+    def __init__(self, exporter: JsonLinesExporter, sample_rate: float = DEFAULT_SAMPLE_RATE):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+        self._random = random.Random()
+        self.seen = 0
+        self.sampled = 0
+
+    def should_sample(self) -> bool:
+        self.seen += 1
+        if self._random.random() >= self.sample_rate:
+            return False
+        self.sampled += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "path": self.exporter.path,
+            "sample_rate": self.sample_rate,
+            "seen": self.seen,
+            "sampled": self.sampled,
+            "exported": self.exporter.exported,
+        }
+
+
+class TracingMiddleware:
+    """샘플된 요청에 추적을 시작하고, 끝나면 내보내는 ASGI 미들웨어"""
+
+    def __init__(self, app: Any, tracer: Tracer, paths: Iterable[str] = TRACED_PATHS):
+        self.app = app
+        self.tracer = tracer
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths or not self.tracer.should_sample():
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(f"{scope['method']} {scope['path']}")
+        token = _current_trace.set(trace)
+        status: Dict[str, int] = {}
+
+        async def send_with_trace_id(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (TRACE_HEADER, trace.trace_id.encode())]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace_id)
+        finally:
+            _current_trace.reset(token)
+            record = trace.to_dict(time.perf_counter() - trace.origin)
+            record["status"] = status.get("code")
+            self.tracer.exporter.export(record)
+
+
+def install_tracing(
+    app: Any,
+    path: Optional[str] = DEFAULT_TRACE_FILE,
+    sample_rate: float = DEFAULT_SAMPLE_RATE,
+) -> Optional[Tracer]:
+    """path 가 있으면 추적 미들웨어를 붙이고 Tracer 를 돌려줍니다."""
+    if not path or sample_rate <= 0:
+        return None
+    tracer = Tracer(JsonLinesExporter(path), sample_rate)
+    app.add_middleware(TracingMiddleware, tracer=tracer)
+    app.add_event_handler("shutdown", tracer.exporter.close)
+    logger.info("요청 추적 중: %s (샘플링 %.0f%%)", path, sample_rate * 100)
+    return tracer
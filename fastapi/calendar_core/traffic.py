@@ -0,0 +1,295 @@
+"""
+웹훅 트래픽 기록/재생
+--------------------
+실제 단톡방에서 들어온 웹훅 요청을 그대로 기록해 두었다가,
+가짜 백엔드에 연결한 서버로 N배 빠르게 다시 보내는 도구입니다.
+월요일 아침처럼 요청이 몰리는 순간을 그대로 재현해서 캐시/실행기/동시성 제한이
+그 부하에서 어떻게 동작하는지 볼 수 있습니다.
+
+- TrafficRecorderMiddleware : 웹훅 본문(room, sender, message/msg/command, author, timestamp)과
+                              받은 시각을 한 줄짜리 JSON 으로 기록하는 ASGI 미들웨어
+- install_traffic_recorder   : CALENDAR_TRAFFIC_LOG 가 설정된 경우에만 미들웨어를 붙입니다. (기본 꺼짐)
+
+환경 변수:
+  CALENDAR_TRAFFIC_LOG=traffic.jsonl     기록 파일 (없으면 기록 안 함)
+  CALENDAR_TRAFFIC_ANONYMIZE=1           room/sender/author 를 해시로 바꿔 기록 (기본 켜짐)
+
+기록 형식 (한 줄에 요청 하나):
+  {"t":1729130000.123,"p":"/calendar/webhook","b":{"room":"…","sender":"…","message":"캘린더 조회"}}
+
+재생 (fastapi/ 에서):
+  # 가짜 백엔드로 앱을 프로세스 안에서 띄워 10배속 재생
+  python -m calendar_core.traffic traffic.jsonl --speed 10 --app fastapi/google_calendar_webhook.py
+  # 이미 떠 있는 서버(CALENDAR_CLIENT_MODE=fake 로 실행)에 재생
+  python -m calendar_core.traffic traffic.jsonl --speed 10 --url http://localhost:9000
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TRAFFIC_LOG = os.getenv("CALENDAR_TRAFFIC_LOG")
+DEFAULT_ANONYMIZE = os.getenv("CALENDAR_TRAFFIC_ANONYMIZE", "1") == "1"
+WEBHOOK_PATHS = ("/calendar/webhook", "/webhook")
+RECORDED_FIELDS = ("room", "sender", "author", "message", "msg", "command", "timestamp")
+ANONYMIZED_FIELDS = ("room", "sender", "author")
+FLUSH_INTERVAL = 1.0
+MAX_BODY_BYTES = 64 * 1024
+
+
+def _anonymize(value: Any) -> Any:
+    if not isinstance(value, str):
+        return value
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()[:10]
+
+
+class TrafficLog:
+    """기록 파일. 요청마다 디스크에 쓰지 않고 FLUSH_INTERVAL 마다 모아서 내보냅니다."""
+
+    def __init__(self, path: str, anonymize: bool = DEFAULT_ANONYMIZE):
+        self.path = path
+        self.anonymize = anonymize
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.recorded = 0
+        self.skipped = 0
+
+    def write(self, path: str, payload: Dict[str, Any], received_at: float) -> None:
+        body = {key: payload[key] for key in RECORDED_FIELDS if key in payload}
+        if self.anonymize:
+            for key in ANONYMIZED_FIELDS:
+                if key in body:
+                    body[key] = _anonymize(body[key])
+        line = json.dumps({"t": round(received_at, 3), "p": path, "b": body}, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+            self.recorded += 1
+            now = time.monotonic()
+            if now - self._last_flush >= FLUSH_INTERVAL:
+                self._file.flush()
+                self._last_flush = now
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": True,
+            "path": self.path,
+            "recorded": self.recorded,
+            "skipped": self.skipped,
+            "anonymize": self.anonymize,
+        }
+
+
+class TrafficRecorderMiddleware:
+    """웹훅 POST 본문을 기록하는 ASGI 미들웨어 (응답에는 손대지 않음)"""
+
+    def __init__(self, app: Any, log: TrafficLog, paths: Iterable[str] = WEBHOOK_PATHS):
+        self.app = app
+        self.log = log
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        received_at = time.time()
+        chunks: List[bytes] = []
+        size = 0
+
+        async def recording_receive() -> Dict[str, Any]:
+            nonlocal size
+            message = await receive()
+            if message["type"] == "http.request":
+                size += len(message.get("body", b""))
+                if size <= MAX_BODY_BYTES:
+                    chunks.append(message.get("body", b""))
+                if not message.get("more_body"):
+                    self._record(scope["path"], chunks if size <= MAX_BODY_BYTES else None, received_at)
+            return message
+
+        await self.app(scope, recording_receive, send)
+
+    def _record(self, path: str, chunks: Optional[List[bytes]], received_at: float) -> None:
+        try:
+            payload = json.loads(b"".join(chunks)) if chunks is not None else None
+        except ValueError:
+            payload = None
+        if not isinstance(payload, dict):
+            self.log.skipped += 1
+            return
+        try:
+            self.log.write(path, payload, received_at)
+        except OSError as e:
+            logger.warning("트래픽 기록 실패: %s", e)
+
+
+def install_traffic_recorder(app: Any, path: Optional[str] = DEFAULT_TRAFFIC_LOG) -> Optional[TrafficLog]:
+    """path 가 있으면 기록 미들웨어를 붙이고 TrafficLog 를 돌려줍니다. (종료 시 파일을 닫습니다)"""
+    if not path:
+        return None
+    log = TrafficLog(path)
+    app.add_middleware(TrafficRecorderMiddleware, log=log)
+    app.add_event_handler("shutdown", log.close)
+    logger.info("웹훅 트래픽 기록 중: %s", path)
+    return log
+
+
+# ---------- 재생 ----------
+
+
+def read_traffic(path: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                records.append(json.loads(line))
+                if limit and len(records) >= limit:
+                    break
+    records.sort(key=lambda record: record["t"])
+    return records
+
+
+def describe_traffic(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """기록 구간 길이와 초당 최대 요청 수"""
+    if not records:
+        return {"requests": 0, "duration_seconds": 0, "peak_per_second": 0}
+    per_second: Dict[int, int] = {}
+    for record in records:
+        per_second[int(record["t"])] = per_second.get(int(record["t"]), 0) + 1
+    return {
+        "requests": len(records),
+        "duration_seconds": round(records[-1]["t"] - records[0]["t"], 3),
+        "peak_per_second": max(per_second.values()),
+    }
+
+
+async def replay(
+    records: List[Dict[str, Any]],
+    http: Any,
+    speed: float = 1.0,
+    max_in_flight: int = 1000,
+) -> Dict[str, Any]:
+    """기록된 간격을 speed 배로 줄여서 보냅니다. (응답을 기다리지 않고 시각이 되면 보냄)"""
+    from calendar_core.bench import percentile
+
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    lag: List[float] = []
+    in_flight = 0
+    peak_in_flight = 0
+    limiter = asyncio.Semaphore(max_in_flight)
+
+    async def fire(record: Dict[str, Any], due: float) -> None:
+        nonlocal in_flight, peak_in_flight
+        async with limiter:
+            body = dict(record["b"])
+            if "timestamp" in body:
+                body["timestamp"] = datetime.now().isoformat()
+            started = time.perf_counter()
+            lag.append(started - due)
+            in_flight += 1
+            peak_in_flight = max(peak_in_flight, in_flight)
+            try:
+                response = await http.post(record["p"], json=body)
+                status = str(response.status_code)
+            except Exception as e:  # 연결 실패 등도 결과로 집계
+                status = type(e).__name__
+            in_flight -= 1
+            latencies.append(time.perf_counter() - started)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    tasks = []
+    origin = records[0]["t"] if records else 0.0
+    started = time.perf_counter()
+    for record in records:
+        due = started + (record["t"] - origin) / speed
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(fire(record, due)))
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - started
+
+    ordered = sorted(latencies)
+    return {
+        "speed": speed,
+        "requests": len(records),
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(records) / wall, 1) if wall else 0.0,
+        "latency_ms": {key: round(percentile(ordered, fraction) * 1000, 3)
+                       for key, fraction in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99), ("max", 1.0))},
+        "schedule_lag_ms_max": round(max(lag) * 1000, 3) if lag else 0.0,
+        "peak_in_flight": peak_in_flight,
+        "status_codes": statuses,
+    }
+
+
+async def _replay_in_process(records: List[Dict[str, Any]], args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+    from calendar_core.bench import prepare_app
+
+    # 벤치마크와 같은 방식으로 일정을 미리 채워 둡니다.
+    module, _ = await prepare_app(args.app, args, {})
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=module.app), base_url="http://replay") as http:
+            result = await replay(records, http, args.speed, args.max_in_flight)
+        result["client"] = module.calendar_client.stats()
+        return result
+    finally:
+        await module.calendar_client.close()
+
+
+async def _replay_remote(records: List[Dict[str, Any]], args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+
+    limits = httpx.Limits(max_connections=args.max_in_flight)
+    async with httpx.AsyncClient(base_url=args.url, timeout=30, limits=limits) as http:
+        return await replay(records, http, args.speed, args.max_in_flight)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기록한 웹훅 트래픽을 N배속으로 재생")
+    parser.add_argument("log", help="CALENDAR_TRAFFIC_LOG 로 기록한 파일")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (10 이면 10배 빠르게)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="이미 실행 중인 서버 주소 (CALENDAR_CLIENT_MODE=fake 권장)")
+    target.add_argument("--app", help="프로세스 안에서 가짜 백엔드로 띄울 서버 파일 (저장소 루트 기준 경로)")
+    parser.add_argument("--limit", type=int, help="앞에서부터 이만큼만 재생")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="동시에 보낼 수 있는 최대 요청 수")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="--app 모드 가짜 백엔드 지연")
+    parser.add_argument("--seed-days", type=int, default=30, help="--app 모드 미리 넣어 둘 일정의 기간(일)")
+    parser.add_argument("--events-per-day", type=int, default=8, help="--app 모드 하루에 미리 넣어 둘 일정 수")
+    parser.add_argument("--seed", type=int, default=42, help="--app 모드 일정 생성 난수 시드")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    records = read_traffic(args.log, args.limit)
+    print(f"기록: {describe_traffic(records)}")
+    if args.app:
+        os.environ["CALENDAR_CLIENT_MODE"] = "fake"
+        os.environ["CALENDAR_FAKE_LATENCY_MS"] = str(args.latency_ms)
+        os.environ.setdefault("GOOGLE_SERVICE_ACCOUNT_JSON", "{}")
+        logging.disable(logging.INFO)
+        result = asyncio.run(_replay_in_process(records, args))
+    else:
+        result = asyncio.run(_replay_remote(records, args))
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
@@ -10,18 +10,43 @@ FastAPI + Google Calendar MCP 예제 서버
 
 실행:
   uvicorn google_calendar_webhook:app --host 0.0.0.0 --port 9000 --reload
+
+app 은 처음 찾을 때 create_app 이 만듭니다. 통합 서버(fastapi/main.py)는 app 대신
+router 와 setup() 으로 공유 클라이언트를 넘겨 이 엔드포인트들을 붙입니다.
 """
 
+import asyncio
+import logging
 import os
 from datetime import datetime, date, time, timedelta
-from zoneinfo import ZoneInfo
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from google.oauth2.service_account import Credentials
-from googleapiclient.discovery import build
+from fastapi import APIRouter, FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from calendar_core.batch import BatchOperation, BatchResult, chunked
+from calendar_core.commands import CommandRouter
+from calendar_core.credentials import CredentialManager
+from calendar_core.dates import current_date, get_zone, parse_date, parse_date_range, parse_time
+from calendar_core.factory import create_calendar_client, uses_google_credentials
+from calendar_core.free_slots import (
+    DEFAULT_COMMON_SLOT_LIMIT,
+    MAX_COMMON_SLOT_DAYS,
+    find_common_slots,
+    find_free_slots,
+    format_day,
+    format_slot,
+)
+from calendar_core.health import HealthMonitor, install_health, wait_synced
+from calendar_core.metrics import install_metrics
+from calendar_core.profiling import install_profiling
+from calendar_core.push import PushChannelManager, create_push_router
+from calendar_core.range_reader import MAX_RANGE_DAYS, iter_events, stream_lines
+from calendar_core.startup import StartupReport, install_startup_report
+from calendar_core.tracing import install_tracing, span, traced
+from calendar_core.traffic import install_traffic_recorder
 
 load_dotenv()
 
@@ -29,11 +54,25 @@ SCOPES = ["https://www.googleapis.com/auth/calendar"]
 SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON", "service-account.json")
 CALENDAR_ID = os.getenv("GOOGLE_CALENDAR_ID", "primary")
 TIMEZONE = os.getenv("CALENDAR_TIMEZONE", "Asia/Seoul")
+DAY_DELETE_CONFIRM = "확인"  # 날짜 단위 삭제는 이 단어를 붙여 다시 보내야 실행
+
+logger = logging.getLogger(__name__)
+
+# 라우터가 쓰는 공유 자원 (setup 이 연결: 단독 실행은 create_app, 통합 서버는 fastapi/main.py)
+credentials = None
+calendar_client = None
+health = None
+push_manager = None
+tracer = None
+traffic_log = None
+
+router = APIRouter()
+
 
+def load_credentials():
+    from google.oauth2.service_account import Credentials
 
-def get_calendar_service():
-    creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-    return build("calendar", "v3", credentials=creds, cache_discovery=False)
+    return Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
 
 
 class CalendarRequest(BaseModel):
@@ -42,134 +81,142 @@ class CalendarRequest(BaseModel):
     message: str
 
 
-app = FastAPI(title="Google Calendar MCP Webhook")
+class CommonSlotsRequest(BaseModel):
+    calendar_ids: List[str]
+    start_date: Optional[date] = None
+    days: int = Field(7, ge=1, le=MAX_COMMON_SLOT_DAYS)
+    limit: int = Field(DEFAULT_COMMON_SLOT_LIMIT, ge=1)
+    min_minutes: int = Field(0, ge=0)
+
+
+def setup(client, credential_manager, health_monitor, push, trace=None, traffic=None) -> APIRouter:
+    """라우터가 쓸 캘린더 클라이언트와 공유 자원을 연결하고 router 를 돌려줍니다."""
+    global calendar_client, credentials, health, push_manager, tracer, traffic_log
+    calendar_client = client
+    credentials = credential_manager
+    health = health_monitor
+    push_manager = push
+    tracer = trace
+    traffic_log = traffic
+    return router
+
+
+async def warmup():
+    """인증 정보 → 클라이언트 → 첫 동기화 (startup 훅을 막지 않고 백그라운드에서)"""
+    # 실패해도 서버는 뜨고, 첫 요청에서 다시 시도합니다.
+    if uses_google_credentials():
+        await credentials.start()
+    await calendar_client.start()
+    await wait_synced(calendar_client)
 
 
-def parse_relative_date(token: str) -> date:
-    base = datetime.now().date()
-    if token == "오늘":
-        return base
-    if token == "내일":
-        return base + timedelta(days=1)
-    if token == "모레":
-        return base + timedelta(days=2)
-    return datetime.strptime(token, "%Y-%m-%d").date()
+async def probe_calendar():
+    return await calendar_client.get_calendar(CALENDAR_ID)
 
 
-def parse_show_command(msg: str) -> date:
+def parse_range_command(msg: str) -> Tuple[date, int]:
     parts = msg.split()
-    if len(parts) >= 3:
-        try:
-            return parse_relative_date(parts[2])
-        except ValueError:
-            pass
-    return datetime.now().date()
+    return parse_date_range(parts[2] if len(parts) >= 3 else "오늘", tz_name=TIMEZONE)
+
+
+def parse_common_command(msg: str) -> Tuple[List[str], date, int]:
+    parts = msg.split()
+    if len(parts) < 3:
+        raise ValueError("사용법: 캘린더 공통시간 A,B,C [오늘|내일|이번주|다음주|YYYY-MM-DD]")
+    calendar_ids = [cid.strip() for cid in parts[2].split(",") if cid.strip()]
+    start_date, days = parse_date_range(parts[3] if len(parts) >= 4 else "이번주", tz_name=TIMEZONE)
+    return calendar_ids, start_date, days
 
 
 def parse_add_command(msg: str) -> Tuple[date, time, str]:
     parts = msg.split()
     if len(parts) < 5:
         raise ValueError("사용법: 캘린더 추가 YYYY-MM-DD HH:MM 제목")
-    try:
-        target_date = parse_relative_date(parts[2])
-    except ValueError:
-        target_date = datetime.strptime(parts[2], "%Y-%m-%d").date()
-    target_time = datetime.strptime(parts[3], "%H:%M").time()
+    target_date = parse_date(parts[2], tz_name=TIMEZONE)
+    target_time = parse_time(parts[3])
     title = " ".join(parts[4:])
     return target_date, target_time, title
 
 
-def parse_delete_command(msg: str) -> str:
+def parse_delete_command(msg: str) -> List[str]:
     parts = msg.split()
     if len(parts) < 3:
-        raise ValueError("사용법: 캘린더 삭제 <EVENT_ID>")
-    return parts[2]
+        raise ValueError("사용법: 캘린더 삭제 <EVENT_ID> [EVENT_ID ...]")
+    return parts[2:]
+
+
+def parse_day_delete_command(msg: str) -> Tuple[date, bool]:
+    """'캘린더 날짜삭제 <날짜> [확인]' → (날짜, 확인 여부). 확인이 없으면 삭제할 일정만 보여 줍니다."""
+    parts = msg.split()
+    if len(parts) not in (3, 4) or (len(parts) == 4 and parts[3] != DAY_DELETE_CONFIRM):
+        raise ValueError("사용법: 캘린더 날짜삭제 <날짜> [{}]  예) 캘린더 날짜삭제 내일".format(DAY_DELETE_CONFIRM))
+    return parse_date(parts[2], tz_name=TIMEZONE), len(parts) == 4
 
 
+@traced("format_events")
 def format_events(events: List[dict]) -> str:
     if not events:
         return "📭 해당 날짜에는 일정이 없습니다."
 
-    lines = ["🗓 일정 목록"]
-    for ev in events:
-        start = ev["start"].get("dateTime") or ev["start"].get("date")
-        summary = ev.get("summary", "제목 없음")
-        event_id = ev.get("id", "")
-        lines.append("- {} ({}) [{}]".format(summary, start, event_id))
-    return "\n".join(lines)
+    return "\n".join(["🗓 일정 목록"] + [format_event_line(ev) for ev in events])
 
 
-def list_day_events(target_date: date) -> str:
-    tz = ZoneInfo(TIMEZONE)
-    start_dt = datetime.combine(target_date, time.min).replace(tzinfo=tz)
-    end_dt = start_dt + timedelta(days=1)
-    service = get_calendar_service()
-    events = (
-        service.events()
-        .list(
-            calendarId=CALENDAR_ID,
-            timeMin=start_dt.isoformat(),
-            timeMax=end_dt.isoformat(),
-            singleEvents=True,
-            orderBy="startTime",
-        )
-        .execute()
-        .get("items", [])
-    )
-    return format_events(events)
-
-
-def list_free_slots(target_date: date) -> str:
-    tz = ZoneInfo(TIMEZONE)
-    start_dt = datetime.combine(target_date, time(hour=9), tzinfo=tz)
-    end_dt = datetime.combine(target_date, time(hour=19), tzinfo=tz)
-    service = get_calendar_service()
-    busy = (
-        service.freebusy()
-        .query(
-            body={
-                "timeMin": start_dt.isoformat(),
-                "timeMax": end_dt.isoformat(),
-                "items": [{"id": CALENDAR_ID}],
-            }
-        )
-        .execute()
-        .get("calendars", {})
-        .get(CALENDAR_ID, {})
-        .get("busy", [])
-    )
-    cursor = start_dt
-    slots = []
-    for block in busy:
-        busy_start = datetime.fromisoformat(block["start"])
-        busy_end = datetime.fromisoformat(block["end"])
-        if cursor < busy_start:
-            slots.append("{}~{}".format(cursor.time().strftime("%H:%M"), busy_start.time().strftime("%H:%M")))
-        cursor = max(cursor, busy_end)
-    if cursor < end_dt:
-        slots.append("{}~{}".format(cursor.time().strftime("%H:%M"), end_dt.time().strftime("%H:%M")))
+def iter_range_events(start_date: date, days: int = 1):
+    """start_date 부터 days 일 동안의 일정 (페이지를 따라가며 하나씩)"""
+    tz = get_zone(TIMEZONE)
+    start_dt = datetime.combine(start_date, time.min).replace(tzinfo=tz)
+    end_dt = start_dt + timedelta(days=days)
+    return iter_events(calendar_client, CALENDAR_ID, start_dt.isoformat(), end_dt.isoformat())
+
+
+def format_event_line(ev: dict) -> str:
+    start = ev["start"].get("dateTime") or ev["start"].get("date")
+    return "- {} ({}) [{}]".format(ev.get("summary", "제목 없음"), start, ev.get("id", ""))
+
+
+async def list_day_events(target_date: date, days: int = 1) -> str:
+    return format_events([ev async for ev in iter_range_events(target_date, days)])
+
+
+async def list_free_slots(start_date: date, days: int = 1) -> str:
+    tz = get_zone(TIMEZONE)
+    free_days = await find_free_slots(calendar_client, [CALENDAR_ID], start_date, days, TIMEZONE)
+    with span("format_free_slots", days=days):
+        if days == 1:
+            slots = free_days[0][1]
+            if not slots:
+                return "📅 해당 날짜에 빈 시간이 없습니다."
+            return "🕒 빈 시간대:\n" + "\n".join(["- " + format_slot(s, e, tz) for s, e in slots])
+
+        lines = ["🕒 빈 시간대:"]
+        for day, slots in free_days:
+            lines.append(format_day(day))
+            lines.extend(["- " + format_slot(s, e, tz) for s, e in slots] or ["- 없음"])
+        return "\n".join(lines)
+
+
+async def list_common_slots(calendar_ids: List[str], start_date: date, days: int) -> str:
+    tz = get_zone(TIMEZONE)
+    slots = await find_common_slots(calendar_client, calendar_ids, start_date, days, TIMEZONE)
     if not slots:
-        return "📅 해당 날짜에 빈 시간이 없습니다."
-    return "🕒 빈 시간대:\n" + "\n".join(["- " + s for s in slots])
+        return "📅 해당 기간에 모두가 비어 있는 시간이 없습니다."
+    lines = ["🤝 공통 빈 시간 ({})".format(", ".join(calendar_ids))]
+    for start, end in slots:
+        lines.append("- {} {}".format(format_day(start.astimezone(tz).date()), format_slot(start, end, tz)))
+    return "\n".join(lines)
 
 
-def create_event(target_date: date, target_time: time, title: str) -> str:
-    tz = ZoneInfo(TIMEZONE)
+async def create_event(target_date: date, target_time: time, title: str) -> str:
+    tz = get_zone(TIMEZONE)
     start_dt = datetime.combine(target_date, target_time, tzinfo=tz)
     end_dt = start_dt + timedelta(hours=1)
-    service = get_calendar_service()
-
-    conflicts = (
-        service.events()
-        .list(
-            calendarId=CALENDAR_ID,
-            timeMin=start_dt.isoformat(),
-            timeMax=end_dt.isoformat(),
-            singleEvents=True,
-        )
-        .execute()
-        .get("items", [])
+
+    result = await calendar_client.list_events(
+        CALENDAR_ID,
+        time_min=start_dt.isoformat(),
+        time_max=end_dt.isoformat(),
     )
+    conflicts = result.get("items", [])
     if conflicts:
         return "⚠️ 해당 시간에 이미 다른 일정이 있습니다:\n{}".format(
             "\n".join(["- " + c.get("summary", "제목 없음") for c in conflicts])
@@ -180,34 +227,237 @@ def create_event(target_date: date, target_time: time, title: str) -> str:
         "start": {"dateTime": start_dt.isoformat(), "timeZone": TIMEZONE},
         "end": {"dateTime": end_dt.isoformat(), "timeZone": TIMEZONE},
     }
-    event = service.events().insert(calendarId=CALENDAR_ID, body=body).execute()
+    event = await calendar_client.insert_event(CALENDAR_ID, body)
     return "✅ 일정이 등록되었습니다!\n제목: {}\nID: {}".format(event.get("summary"), event.get("id"))
 
 
-def delete_event(event_id: str) -> str:
-    service = get_calendar_service()
-    service.events().delete(calendarId=CALENDAR_ID, eventId=event_id).execute()
+async def delete_event(event_id: str) -> str:
+    await calendar_client.delete_event(CALENDAR_ID, event_id)
     return "🗑 일정이 삭제되었습니다. (ID: {})".format(event_id)
 
 
-@app.post("/calendar/webhook")
+async def create_events(lines: List[str]) -> str:
+    """여러 줄 '캘린더 추가' - 충돌 검사 후 배치 요청 한 번으로 등록합니다."""
+    tz = get_zone(TIMEZONE)
+    replies: List[str] = [""] * len(lines)
+    pending: List[Tuple[int, datetime, datetime, str]] = []
+    for index, line in enumerate(lines):
+        try:
+            target_date, target_time, title = parse_add_command(line)
+        except ValueError as ve:
+            replies[index] = "❌ {}: {}".format(line, ve)
+            continue
+        start_dt = datetime.combine(target_date, target_time, tzinfo=tz)
+        pending.append((index, start_dt, start_dt + timedelta(hours=1), title))
+
+    conflicts = await asyncio.gather(*[
+        calendar_client.list_events(CALENDAR_ID, time_min=start_dt.isoformat(), time_max=end_dt.isoformat())
+        for _, start_dt, end_dt, _ in pending
+    ])
+    operations: List[BatchOperation] = []
+    accepted: List[Tuple[int, datetime, datetime, str]] = []
+    for (index, start_dt, end_dt, title), result in zip(pending, conflicts):
+        existing = [c.get("summary", "제목 없음") for c in result.get("items", [])]
+        # 같은 메시지 안에서 겹치는 줄도 충돌로 봅니다.
+        existing += [other for _, s, e, other in accepted if s < end_dt and start_dt < e]
+        if existing:
+            replies[index] = "⚠️ {}: 해당 시간에 이미 다른 일정이 있습니다 ({})".format(title, ", ".join(existing))
+            continue
+        accepted.append((index, start_dt, end_dt, title))
+        operations.append(BatchOperation.insert(CALENDAR_ID, {
+            "summary": title,
+            "start": {"dateTime": start_dt.isoformat(), "timeZone": TIMEZONE},
+            "end": {"dateTime": end_dt.isoformat(), "timeZone": TIMEZONE},
+        }))
+
+    results = await calendar_client.batch(operations) if operations else []
+    for (index, _, _, title), result in zip(accepted, results):
+        if result.ok:
+            replies[index] = "✅ {} (ID: {})".format(title, result.response.get("id"))
+        else:
+            replies[index] = "❌ {}: {}".format(title, result.error)
+    return "📝 일정 {}건 처리 결과\n{}".format(len(lines), "\n".join(replies))
+
+
+async def delete_events(event_ids: List[str]) -> str:
+    """여러 일정을 배치 요청으로 삭제합니다. (배치 하나에 최대 50건)"""
+    results: List[BatchResult] = []
+    for operations in chunked([BatchOperation.delete(CALENDAR_ID, event_id) for event_id in event_ids]):
+        results += await calendar_client.batch(operations)
+    lines = ["🗑 일정 {}건 삭제 결과".format(len(event_ids))]
+    for result in results:
+        if result.ok:
+            lines.append("- 삭제됨: {}".format(result.operation.event_id))
+        else:
+            lines.append("- 실패: {} ({})".format(result.operation.event_id, result.error))
+    return "\n".join(lines)
+
+
+async def delete_day_events(target_date: date, confirmed: bool) -> str:
+    """해당 날짜의 일정을 모두 삭제합니다. 확인 없이 호출하면 삭제할 일정만 보여 줍니다."""
+    events = [ev async for ev in iter_range_events(target_date)]
+    if not events:
+        return "📭 해당 날짜에는 삭제할 일정이 없습니다."
+    if not confirmed:
+        return "{}\n\n⚠️ {} 일정 {}건을 모두 삭제하려면 '캘린더 날짜삭제 {} {}' 를 보내 주세요.".format(
+            format_events(events), target_date.isoformat(), len(events), target_date.isoformat(), DAY_DELETE_CONFIRM
+        )
+    return await delete_events([ev["id"] for ev in events])
+
+
+# ---------- 메신저 명령어 ----------
+
+commands = CommandRouter("webhook")
+
+
+@commands.command("조회", prefix="캘린더 조회")
+async def handle_show(message: str, match) -> str:
+    start_date, days = parse_range_command(message)
+    return await list_day_events(start_date, days)
+
+
+@commands.command("빈시간", prefix="캘린더 빈시간")
+async def handle_free(message: str, match) -> str:
+    start_date, days = parse_range_command(message)
+    return await list_free_slots(start_date, days)
+
+
+@commands.command("공통시간", prefix="캘린더 공통시간")
+async def handle_common(message: str, match) -> str:
+    calendar_ids, start_date, days = parse_common_command(message)
+    return await list_common_slots(calendar_ids, start_date, days)
+
+
+@commands.command("추가", prefix="캘린더 추가")
+async def handle_add(message: str, match) -> str:
+    lines = [line.strip() for line in message.splitlines() if line.strip()]
+    if len(lines) > 1:
+        return await create_events(lines)
+    target_date, target_time, title = parse_add_command(message)
+    return await create_event(target_date, target_time, title)
+
+
+@commands.command("삭제", prefix="캘린더 삭제")
+async def handle_delete(message: str, match) -> str:
+    targets = parse_delete_command(message)
+    if len(targets) == 1:
+        return await delete_event(targets[0])
+    return await delete_events(targets)
+
+
+@commands.command("날짜삭제", prefix="캘린더 날짜삭제")
+async def handle_delete_day(message: str, match) -> str:
+    target_date, confirmed = parse_day_delete_command(message)
+    return await delete_day_events(target_date, confirmed)
+
+
+@router.get("/calendar/stats")
+def calendar_stats():
+    return {
+        "client": calendar_client.stats(),
+        "credentials": credentials.stats(),
+        "health": health.stats(),
+        "push": push_manager.stats(),
+        "commands": commands.stats(),
+        "traffic": traffic_log.stats() if traffic_log else {"enabled": False},
+        "tracing": tracer.stats() if tracer else {"enabled": False},
+    }
+
+
+@router.post("/calendar/common-slots")
+async def common_slots(req: CommonSlotsRequest):
+    try:
+        slots = await find_common_slots(
+            calendar_client,
+            req.calendar_ids,
+            req.start_date or current_date(TIMEZONE),
+            req.days,
+            TIMEZONE,
+            limit=req.limit,
+            min_duration=timedelta(minutes=req.min_minutes),
+        )
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    return {"slots": [{"start": start.isoformat(), "end": end.isoformat()} for start, end in slots]}
+
+
+@router.get("/calendar/events/stream")
+async def stream_events(start: Optional[date] = None, days: int = Query(1, ge=1, le=MAX_RANGE_DAYS)):
+    """기간 일정을 한 줄씩 스트리밍 (한 달/분기 조회용)"""
+    events = iter_range_events(start or current_date(TIMEZONE), days)
+    return StreamingResponse(
+        stream_lines(events, format_event_line, header="🗓 일정 목록", empty="📭 해당 기간에는 일정이 없습니다."),
+        media_type="text/plain; charset=utf-8",
+    )
+
+
+@router.post("/calendar/webhook")
 async def calendar_webhook(req: CalendarRequest):
     message = req.message.strip()
     try:
-        if message.startswith("캘린더 조회"):
-            target_date = parse_show_command(message)
-            return list_day_events(target_date)
-        if message.startswith("캘린더 빈시간"):
-            target_date = parse_show_command(message.replace("빈시간", "조회", 1))
-            return list_free_slots(target_date)
-        if message.startswith("캘린더 추가"):
-            target_date, target_time, title = parse_add_command(message)
-            return create_event(target_date, target_time, title)
-        if message.startswith("캘린더 삭제"):
-            event_id = parse_delete_command(message)
-            return delete_event(event_id)
-        return "지원하지 않는 명령입니다. 예) 캘린더 조회, 캘린더 추가, 캘린더 삭제"
+        reply = await commands.dispatch(message)
+        if reply is None:
+            return "지원하지 않는 명령입니다. 예) 캘린더 조회, 캘린더 빈시간, 캘린더 공통시간, 캘린더 추가, 캘린더 삭제, 캘린더 날짜삭제"
+        return reply
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
+
+
+def create_app() -> FastAPI:
+    """단독 실행용 앱: 공유 자원을 만들어 router 에 연결합니다."""
+    # 여기까지가 import 단계 (google.oauth2 는 인증 정보를 처음 로드할 때 import)
+    startup_report = StartupReport()
+    # 서비스 계정 키는 한 번만 읽고, 토큰은 만료 전에 백그라운드에서 갱신
+    credential_manager = CredentialManager(load_credentials)
+    # 프로세스 전체에서 공유하는 캘린더 클라이언트 (CALENDAR_CLIENT_MODE=async|threads)
+    client = create_calendar_client(credential_manager, sync_calendars=[CALENDAR_ID])
+    # 봇 밖에서 바뀐 일정을 알려 주는 Google 푸시 알림 (CALENDAR_PUSH_ADDRESS 설정 시)
+    push = PushChannelManager(client, [CALENDAR_ID])
+    # 캘린더 연결은 백그라운드에서 주기적으로 확인하고, 헬스체크는 마지막 결과만 읽음
+    monitor = HealthMonitor(warmup, probe_calendar, report=startup_report)
+
+    app = FastAPI(title="Google Calendar MCP Webhook")
+    app.include_router(create_push_router(push))
+    # GET /metrics (Prometheus)
+    install_metrics(app, client)
+    # CALENDAR_TRACE_FILE 가 있으면 샘플된 요청의 구간별 시간을 기록
+    trace = install_tracing(app)
+    # CALENDAR_ADMIN_TOKEN 이 있으면 X-Profile 헤더로 요청 하나를 프로파일링 (/admin/profiles)
+    install_profiling(app)
+    # GET /startup - 프로세스 시작부터 준비 완료까지 단계별 시간
+    install_startup_report(app, startup_report)
+    # CALENDAR_TRAFFIC_LOG 가 있으면 웹훅 요청을 기록 (재생: python -m calendar_core.traffic)
+    traffic = install_traffic_recorder(app)
+    # GET /health/live, /health/ready
+    install_health(app, monitor)
+    app.include_router(setup(client, credential_manager, monitor, push, trace, traffic))
+
+    @app.on_event("startup")
+    async def startup_event():
+        # 준비가 끝나면 /health/ready 가 200 이 됩니다.
+        health.start()
+        push_manager.start()
+        startup_report.mark("serving")
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        await health.stop()
+        await push_manager.stop()
+        await credentials.stop()
+        await calendar_client.close()
+
+    # 앱/라우터 구성 끝 (여기부터 startup 훅)
+    startup_report.mark("module")
+    return app
+
+
+def __getattr__(name: str):
+    # uvicorn google_calendar_webhook:app 이 app 을 찾을 때 처음 한 번만 만듭니다.
+    # (fastapi/main.py 는 router 와 setup 만 쓰므로 단독 실행용 자원을 만들지 않음)
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
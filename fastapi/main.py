@@ -1,5 +1,213 @@
-# Placeholder FastAPI app for MessengerBot integration.
-# Replace this stub with actual endpoints when backend features are needed.
-from fastapi import FastAPI
+"""
+통합 캘린더 서버
+---------------
+세 캘린더 서버의 라우터를 uvicorn 프로세스 하나에 붙이는 진입점입니다.
 
-app = FastAPI()
+  /calendar/*        google_calendar_webhook.router          (캘린더 웹훅, 공통시간, 통계)
+  /health            GoogleCalendarBot_Improved/google_calendar_service.router
+  /api/*             GoogleCalendarBot/fastapi_server.router
+  /webhook, /        이 파일 (두 예제 서버가 같은 경로를 쓰므로)
+
+각 서버 모듈은 import 할 때 자원을 만들지 않고, router 와 setup(client, credentials, health, push, tracer, traffic)
+만 내놓습니다. (단독 실행용 앱은 모듈의 create_app 이 app 을 처음 찾을 때 만듦)
+여기서 캘린더 클라이언트(연결 풀/캐시/실행기/동기화 복제본), 인증 정보, 로그 파이프라인, 헬스체크,
+푸시 채널, 지표를 하나씩만 만들어 세 라우터에 setup 으로 넘깁니다.
+
+/webhook 은 본문으로 나눕니다.
+  {"command", "room", "author", "timestamp"}  → 서비스 계정 서버
+  {"msg", "sender", "room"}                   → OAuth 서버 (레거시)
+
+필수 환경 변수 (.env): google_calendar_webhook.py 와 같음
+  GOOGLE_SERVICE_ACCOUNT_JSON=/path/to/service-account.json   (파일 경로 또는 JSON 문자열)
+  GOOGLE_CALENDAR_ID=primary
+  CALENDAR_APP_CREDENTIALS=service_account   oauth 로 바꾸면 token.pickle / credentials.json 사용
+
+실행 (fastapi/ 에서):
+  uvicorn main:app --host 0.0.0.0 --port 9000
+"""
+
+import importlib.util
+import logging
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.cors import CORSMiddleware
+from pydantic import ValidationError
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from calendar_core.credentials import CredentialManager
+from calendar_core.factory import create_calendar_client, uses_google_credentials
+from calendar_core.health import HealthMonitor, install_health, wait_synced
+from calendar_core.log_pipeline import setup_logging
+from calendar_core.metrics import install_metrics
+from calendar_core.profiling import install_profiling
+from calendar_core.push import PushChannelManager, create_push_router
+from calendar_core.startup import StartupReport, install_startup_report
+from calendar_core.tracing import install_tracing
+from calendar_core.traffic import install_traffic_recorder
+
+load_dotenv()
+
+ROOT = Path(__file__).resolve().parents[1]
+CALENDAR_ID = os.getenv("GOOGLE_CALENDAR_ID", "primary")
+TIMEZONE = os.getenv("CALENDAR_TIMEZONE", "Asia/Seoul")
+APP_CREDENTIALS = os.getenv("CALENDAR_APP_CREDENTIALS", "service_account")
+# OAuth 서버는 항상 primary 를 쓰므로 두 캘린더를 모두 동기화해 둡니다.
+SYNC_CALENDARS = sorted({CALENDAR_ID, "primary"})
+
+# 여기까지가 import 단계 (서버 모듈 import 는 아래 "module" 단계에 포함)
+startup_report = StartupReport()
+# 서버 모듈보다 먼저 설정해야 모든 모듈이 이 파이프라인 하나를 씁니다. (setup_logging 은 처음 한 번만 설정)
+log_pipeline = setup_logging("calendar_app.log")
+logger = logging.getLogger(__name__)
+
+
+def load_server_module(relative_path: str):
+    """서버 파일을 원래 모듈 이름으로 불러옵니다. (같은 파일은 한 번만)"""
+    path = ROOT / relative_path
+    if path.stem in sys.modules:
+        return sys.modules[path.stem]
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+webhook_server = load_server_module("fastapi/google_calendar_webhook.py")
+service = load_server_module("examples/GoogleCalendarBot_Improved/google_calendar_service.py")
+oauth_server = load_server_module("examples/GoogleCalendarBot/fastapi_server.py")
+SERVER_MODULES = (webhook_server, service, oauth_server)
+
+
+def load_credentials():
+    """CALENDAR_APP_CREDENTIALS 에 맞는 서버의 로더를 씁니다."""
+    if APP_CREDENTIALS == "oauth":
+        return oauth_server.load_credentials()
+    return service.load_credentials()
+
+
+def save_token(creds):
+    if APP_CREDENTIALS == "oauth":
+        oauth_server.save_token(creds)
+
+
+# 프로세스에 하나뿐인 인증 정보와 캘린더 클라이언트 (CALENDAR_CLIENT_MODE=async|threads)
+credentials = CredentialManager(load_credentials, persist=save_token)
+calendar_client = create_calendar_client(credentials, sync_calendars=SYNC_CALENDARS)
+# 봇 밖에서 바뀐 일정을 알려 주는 Google 푸시 알림 (CALENDAR_PUSH_ADDRESS 설정 시)
+push_manager = PushChannelManager(calendar_client, SYNC_CALENDARS)
+
+
+async def warmup():
+    """인증 정보 → 클라이언트 → 첫 동기화 (startup 훅을 막지 않고 백그라운드에서)"""
+    if uses_google_credentials():
+        await credentials.start()
+    await calendar_client.start()
+    await wait_synced(calendar_client)
+
+
+async def probe_calendar():
+    return await calendar_client.get_calendar(CALENDAR_ID)
+
+
+# 캘린더 연결은 백그라운드에서 주기적으로 확인하고, 헬스체크는 마지막 결과만 읽음
+health = HealthMonitor(warmup, probe_calendar, report=startup_report)
+
+app = FastAPI(
+    title="Google Calendar 통합 서버",
+    description="캘린더 웹훅 / 서비스 계정 / OAuth 서버를 한 프로세스에서",
+    version="1.0.0",
+)
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+# CALENDAR_TRAFFIC_LOG 가 있으면 웹훅 요청을 기록 (재생: python -m calendar_core.traffic)
+traffic_log = install_traffic_recorder(app)
+app.include_router(create_push_router(push_manager))
+# GET /metrics (Prometheus)
+install_metrics(app, calendar_client)
+# CALENDAR_TRACE_FILE 가 있으면 샘플된 요청의 구간별 시간을 기록
+tracer = install_tracing(app)
+# CALENDAR_ADMIN_TOKEN 이 있으면 X-Profile 헤더로 요청 하나를 프로파일링 (/admin/profiles)
+install_profiling(app)
+# GET /startup - 프로세스 시작부터 준비 완료까지 단계별 시간
+install_startup_report(app, startup_report)
+# GET /health/live, /health/ready 와 OAuth 서버의 /api/health/live, /api/health/ready
+install_health(app, health)
+install_health(app, health, prefix="/api/health")
+
+for module in SERVER_MODULES:
+    app.include_router(module.setup(calendar_client, credentials, health, push_manager, tracer, traffic_log))
+
+
+@app.get("/")
+async def root():
+    """서버 상태 확인 (두 예제 서버의 / 응답 필드를 모두 포함)"""
+    return {
+        "message": "Google Calendar 통합 서버가 정상 작동 중입니다.",
+        "version": app.version,
+        "timestamp": datetime.now().isoformat(),
+        "calendar_id": CALENDAR_ID,
+        "timezone": TIMEZONE,
+    }
+
+
+@app.post("/webhook")
+async def webhook(request: Request):
+    """두 메신저봇 웹훅 형식을 본문으로 구분합니다."""
+    try:
+        data = await request.json()
+    except ValueError:
+        data = None
+    if isinstance(data, dict) and "command" in data:
+        try:
+            body = service.WebhookRequest(**data)
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
+        return await service.webhook_handler(body)
+    return await oauth_server.webhook_handler(request)
+
+
+def check_unique_routes(app: FastAPI) -> None:
+    """같은 메서드+경로가 두 번 붙으면 뒤의 것이 조용히 가려지므로 시작할 때 막습니다."""
+    seen = set()
+    for route in app.routes:
+        for method in getattr(route, "methods", None) or ():
+            if (method, route.path) in seen:
+                raise RuntimeError(f"경로가 겹칩니다: {method} {route.path}")
+            seen.add((method, route.path))
+
+
+check_unique_routes(app)
+
+
+@app.on_event("startup")
+async def startup_event():
+    logger.info("통합 캘린더 서버 시작됨 (%s)", ", ".join(module.__name__ for module in SERVER_MODULES))
+    # 준비가 끝나면 /health/ready, /api/health/ready 가 200 이 됩니다.
+    health.start()
+    push_manager.start()
+    startup_report.mark("serving")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await health.stop()
+    await push_manager.stop()
+    await credentials.stop()
+    await calendar_client.close()
+    logger.info("통합 캘린더 서버 종료됨")
+
+
+# 앱/라우터 구성 끝 (여기부터 startup 훅)
+startup_report.mark("module")
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 서버와 같은 방식으로 calendar_core 를 import 합니다. (fastapi/ 를 경로에 등록)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,160 @@
+import asyncio
+import email
+import json
+import re
+
+import httpx
+
+from calendar_core.async_client import AsyncCalendarClient, CalendarAPIError
+from calendar_core.batch import MAX_BATCH_SIZE, BatchOperation, chunked, decode_batch, encode_batch
+
+# Google 배치 응답 형식 그대로 (응답 순서는 요청 순서와 다를 수 있고, Content-ID 앞에 response- 가 붙음)
+CAPTURED_CONTENT_TYPE = "multipart/mixed; boundary=batch_Qm9L1tEvKx8_AAVwGT6FfYc"
+CAPTURED_RESPONSE = (
+    b"--batch_Qm9L1tEvKx8_AAVwGT6FfYc\r\n"
+    b"Content-Type: application/http\r\n"
+    b"Content-ID: <response-item2>\r\n"
+    b"\r\n"
+    b"HTTP/1.1 404 Not Found\r\n"
+    b"Content-Type: application/json; charset=UTF-8\r\n"
+    b"Vary: Origin\r\n"
+    b"\r\n"
+    b'{\n "error": {\n  "errors": [\n   {\n    "domain": "global",\n    "reason": "notFound",\n'
+    b'    "message": "Not Found"\n   }\n  ],\n  "code": 404,\n  "message": "Not Found"\n }\n}\r\n'
+    b"--batch_Qm9L1tEvKx8_AAVwGT6FfYc\r\n"
+    b"Content-Type: application/http\r\n"
+    b"Content-ID: <response-item0>\r\n"
+    b"\r\n"
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/json; charset=UTF-8\r\n"
+    b'ETag: "3408761523690000"\r\n'
+    b"\r\n"
+    b'{\n "kind": "calendar#event",\n "id": "a1b2c3",\n "status": "confirmed",\n'
+    b' "summary": "\xed\x9a\x8c\xec\x9d\x98"\n}\r\n'
+    b"--batch_Qm9L1tEvKx8_AAVwGT6FfYc\r\n"
+    b"Content-Type: application/http\r\n"
+    b"Content-ID: <response-item1>\r\n"
+    b"\r\n"
+    b"HTTP/1.1 204 No Content\r\n"
+    b"Content-Length: 0\r\n"
+    b"\r\n"
+    b"\r\n"
+    b"--batch_Qm9L1tEvKx8_AAVwGT6FfYc--\r\n"
+)
+
+
+class StaticCredentials:
+    valid = True
+
+    def apply(self, headers):
+        headers["Authorization"] = "Bearer test-token"
+
+
+def parse_request(content_type, content):
+    message = email.message_from_bytes(b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + content)
+    requests = []
+    for part in message.get_payload():
+        head, _, body = part.get_payload(decode=True).decode("utf-8").partition("\r\n\r\n")
+        requests.append((part["Content-ID"], head.split("\r\n")[0], body.strip()))
+    return requests
+
+
+def test_chunked_splits_at_max_batch_size():
+    operations = [BatchOperation.delete("primary", f"e{i}") for i in range(2 * MAX_BATCH_SIZE + 1)]
+    assert [len(chunk) for chunk in chunked(operations)] == [MAX_BATCH_SIZE, MAX_BATCH_SIZE, 1]
+
+
+def test_encode_batch_parts():
+    operations = [
+        BatchOperation.insert("team@group.calendar.google.com", {"summary": "회의"}),
+        BatchOperation.delete("primary", "id#1"),
+        BatchOperation.get("primary", "abc"),
+    ]
+    content_type, content = encode_batch(operations)
+    assert content_type.startswith("multipart/mixed; boundary=")
+    requests = parse_request(content_type, content)
+    assert requests == [
+        ("<item0>", "POST /calendar/v3/calendars/team%40group.calendar.google.com/events HTTP/1.1",
+         '{"summary": "회의"}'),
+        ("<item1>", "DELETE /calendar/v3/calendars/primary/events/id%231 HTTP/1.1", ""),
+        ("<item2>", "GET /calendar/v3/calendars/primary/events/abc HTTP/1.1", ""),
+    ]
+
+
+def test_decode_captured_response_by_content_id():
+    parts = decode_batch(CAPTURED_CONTENT_TYPE, CAPTURED_RESPONSE)
+    assert sorted(parts) == [0, 1, 2]
+    assert parts[0][0] == 200
+    assert json.loads(parts[0][1]) == {"kind": "calendar#event", "id": "a1b2c3", "status": "confirmed", "summary": "회의"}
+    assert parts[1] == (204, b"")
+    assert parts[2][0] == 404
+    assert json.loads(parts[2][1])["error"]["errors"][0]["reason"] == "notFound"
+
+
+def test_client_batch_partial_failure_from_captured_response():
+    def handler(request):
+        return httpx.Response(200, headers={"Content-Type": CAPTURED_CONTENT_TYPE}, content=CAPTURED_RESPONSE)
+
+    client = AsyncCalendarClient(StaticCredentials, transport=httpx.MockTransport(handler))
+    operations = [
+        BatchOperation.insert("primary", {"summary": "회의"}),
+        BatchOperation.delete("primary", "old"),
+        BatchOperation.delete("primary", "missing"),
+    ]
+    results = asyncio.run(client.batch(operations))
+    assert [result.operation for result in results] == operations
+    assert [result.ok for result in results] == [True, True, False]
+    assert results[0].response["id"] == "a1b2c3"
+    assert results[1].response == {}
+    assert isinstance(results[2].error, CalendarAPIError)
+    assert (results[2].error.status, results[2].error.reason) == (404, "notFound")
+    assert client.stats()["errors"] == 1
+
+
+def test_client_batch_round_trip_in_chunks():
+    batches = []
+
+    def handler(request):
+        requests = parse_request(request.headers["content-type"], request.content)
+        batches.append(len(requests))
+        boundary = "batch_response"
+        lines = []
+        # 순서를 뒤집어서 돌려주고, 번호가 7로 나눠떨어지는 일정은 실패시킵니다.
+        for content_id, request_line, _ in reversed(requests):
+            event_id = request_line.split()[1].rsplit("/", 1)[1]
+            if int(event_id[1:]) % 7 == 0:
+                status, body = "403 Forbidden", json.dumps({"error": {"code": 403, "message": "denied", "errors": [{"reason": "forbidden"}]}})
+            else:
+                status, body = "200 OK", json.dumps({"id": event_id})
+            lines += [
+                f"--{boundary}", "Content-Type: application/http", f"Content-ID: <response-{content_id.strip('<>')}>", "",
+                f"HTTP/1.1 {status}", "Content-Type: application/json; charset=UTF-8", "", body,
+            ]
+        lines.append(f"--{boundary}--")
+        return httpx.Response(
+            200, headers={"Content-Type": f"multipart/mixed; boundary={boundary}"}, content="\r\n".join(lines).encode()
+        )
+
+    client = AsyncCalendarClient(StaticCredentials, transport=httpx.MockTransport(handler))
+    operations = [BatchOperation.get("primary", f"e{i}") for i in range(120)]
+    results = asyncio.run(client.batch(operations))
+    assert batches == [50, 50, 20]
+    assert client.stats()["batches"] == 3
+    for i, result in enumerate(results):
+        if i % 7 == 0:
+            assert result.error.status == 403 and result.error.reason == "forbidden"
+        else:
+            assert result.response == {"id": f"e{i}"}
+
+
+def test_client_batch_missing_part_is_error():
+    def handler(request):
+        # item0 의 응답만 돌려줍니다.
+        content = re.sub(rb"--batch_Qm9L1tEvKx8_AAVwGT6FfYc\r\nContent-Type: application/http\r\nContent-ID: <response-item[12]>.*?(?=--batch)",
+                         b"", CAPTURED_RESPONSE, flags=re.S)
+        return httpx.Response(200, headers={"Content-Type": CAPTURED_CONTENT_TYPE}, content=content)
+
+    client = AsyncCalendarClient(StaticCredentials, transport=httpx.MockTransport(handler))
+    results = asyncio.run(client.batch([BatchOperation.get("primary", "a1b2c3"), BatchOperation.get("primary", "gone")]))
+    assert results[0].ok
+    assert results[1].error.status == 500
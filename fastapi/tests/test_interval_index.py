@@ -0,0 +1,102 @@
+import random
+
+from calendar_core.interval_index import IntervalIndex
+
+
+def linear_overlapping(spans, start, end):
+    found = [
+        (span_start, key)
+        for key, (span_start, span_end) in spans.items()
+        if (start is None or span_end > start) and (end is None or span_start < end)
+    ]
+    return [key for _, key in sorted(found)]
+
+
+def test_overlapping_is_half_open():
+    index = IntervalIndex()
+    index.add("a", 9, 10)
+    index.add("b", 10, 11)
+    index.add("c", 11, 12)
+    # [10, 11) 은 10시에 끝나는 a, 11시에 시작하는 c 와 겹치지 않습니다.
+    assert index.overlapping(10, 11) == ["b"]
+    assert index.overlapping(9.5, 11.5) == ["a", "b", "c"]
+    assert index.overlapping(12, 13) == []
+    assert index.overlapping(8, 9) == []
+
+
+def test_open_ended_queries():
+    index = IntervalIndex()
+    index.add("a", 1, 2)
+    index.add("b", 3, 4)
+    assert index.overlapping() == ["a", "b"]
+    assert index.overlapping(start=2) == ["b"]
+    assert index.overlapping(end=3) == ["a"]
+
+
+def test_results_ordered_by_start_then_key():
+    index = IntervalIndex()
+    index.add("b", 5, 6, value="B")
+    index.add("a", 5, 7, value="A")
+    index.add("c", 1, 9, value="C")
+    assert index.overlapping(5, 6) == ["C", "A", "B"]
+
+
+def test_long_event_found_through_max_end():
+    index = IntervalIndex()
+    index.add("long", 0, 100)
+    for i in range(1, 50):
+        index.add(f"short-{i}", i, i + 0.5)
+    assert index.overlapping(60, 61) == ["long"]
+
+
+def test_readd_replaces_span():
+    index = IntervalIndex()
+    index.add("a", 1, 2)
+    index.add("a", 5, 6)
+    assert len(index) == 1
+    assert index.span("a") == (5, 6)
+    assert index.overlapping(1, 2) == []
+    assert index.overlapping(5, 6) == ["a"]
+
+
+def test_remove_and_readd_same_id():
+    index = IntervalIndex()
+    index.add("a", 1, 2)
+    index.add("b", 1, 3)
+    index.remove("a")
+    assert "a" not in index
+    assert index.overlapping(0, 10) == ["b"]
+    index.remove("a")  # 없는 key 는 무시
+    index.add("a", 1, 2)
+    assert index.overlapping(0, 10) == ["a", "b"]
+    index.remove("b")
+    assert index.overlapping(2, 3) == []
+
+
+def test_clear():
+    index = IntervalIndex()
+    index.add("a", 1, 2)
+    index.clear()
+    assert len(index) == 0
+    assert index.overlapping() == []
+
+
+def test_matches_linear_scan():
+    rng = random.Random(7)
+    index = IntervalIndex()
+    spans = {}
+    for step in range(3000):
+        key = f"e{rng.randrange(200)}"
+        if key in spans and rng.random() < 0.3:
+            index.remove(key)
+            del spans[key]
+        else:
+            start = rng.randrange(0, 1000)
+            end = start + rng.choice((1, 5, 30, 300))
+            index.add(key, start, end)
+            spans[key] = (start, end)
+        if step % 10 == 0:
+            start = rng.choice((None, rng.randrange(-10, 1010)))
+            end = rng.choice((None, rng.randrange(-10, 1010)))
+            assert index.overlapping(start, end) == linear_overlapping(spans, start, end)
+    assert len(index) == len(spans)